@@ -20,11 +20,11 @@ func GetNationalAggregate(c *gin.Context) {
 	var aggregate models.NationalAggregate
 	aggregate.Period = "custom"
 
-	// Get total arrests
+	// Get total arrests from the daily continuous aggregate
 	err := database.Pool.QueryRow(ctx, `
-		SELECT COALESCE(SUM(arrest_count), 0)
-		FROM arrests
-		WHERE timestamp >= $1 AND timestamp <= $2
+		SELECT COALESCE(SUM(total_arrests), 0)::BIGINT
+		FROM arrests_state_daily
+		WHERE day >= $1 AND day <= $2
 	`, startDate, endDate).Scan(&aggregate.TotalArrests)
 	if err != nil {
 		aggregate.TotalArrests = 0
@@ -32,9 +32,9 @@ func GetNationalAggregate(c *gin.Context) {
 
 	// Get total detentions (average daily population)
 	err = database.Pool.QueryRow(ctx, `
-		SELECT COALESCE(AVG(detained_count), 0)
-		FROM detentions
-		WHERE timestamp >= $1 AND timestamp <= $2
+		SELECT COALESCE(SUM(detained_sum)::DECIMAL / NULLIF(SUM(detained_rows), 0), 0)
+		FROM detentions_facility_daily
+		WHERE day >= $1 AND day <= $2
 	`, startDate, endDate).Scan(&aggregate.TotalDetentions)
 	if err != nil {
 		aggregate.TotalDetentions = 0
@@ -69,11 +69,11 @@ func GetStateAggregate(c *gin.Context) {
 	var aggregate models.NationalAggregate
 	aggregate.Period = state
 
-	// Get arrests for state
+	// Get arrests for state from the daily continuous aggregate
 	err := database.Pool.QueryRow(ctx, `
-		SELECT COALESCE(SUM(arrest_count), 0)
-		FROM arrests
-		WHERE state = $1 AND timestamp >= $2 AND timestamp <= $3
+		SELECT COALESCE(SUM(total_arrests), 0)::BIGINT
+		FROM arrests_state_daily
+		WHERE state = $1 AND day >= $2 AND day <= $3
 	`, state, startDate, endDate).Scan(&aggregate.TotalArrests)
 	if err != nil {
 		aggregate.TotalArrests = 0
@@ -81,9 +81,9 @@ func GetStateAggregate(c *gin.Context) {
 
 	// Get detentions for state
 	err = database.Pool.QueryRow(ctx, `
-		SELECT COALESCE(AVG(detained_count), 0)
-		FROM detentions
-		WHERE state = $1 AND timestamp >= $2 AND timestamp <= $3
+		SELECT COALESCE(SUM(detained_sum)::DECIMAL / NULLIF(SUM(detained_rows), 0), 0)
+		FROM detentions_facility_daily
+		WHERE state = $1 AND day >= $2 AND day <= $3
 	`, state, startDate, endDate).Scan(&aggregate.TotalDetentions)
 	if err != nil {
 		aggregate.TotalDetentions = 0
@@ -16,6 +16,7 @@ CREATE TABLE arrests (
     non_criminal_arrests INTEGER,
     data_source VARCHAR(50),
     source_url TEXT,
+    dedup_key TEXT, -- natural key: source, date, location
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
@@ -32,6 +33,7 @@ CREATE TABLE detentions (
     avg_daily_population DECIMAL(10,2),
     facility_type VARCHAR(50),
     data_source VARCHAR(50),
+    dedup_key TEXT, -- natural key: source, date, location, facility
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
@@ -44,6 +46,7 @@ CREATE TABLE removals (
     country_of_citizenship VARCHAR(100),
     removal_type VARCHAR(50), -- removals, returns, repatriations
     data_source VARCHAR(50),
+    dedup_key TEXT, -- natural key: source, date, state, country, type
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
@@ -87,6 +90,7 @@ CREATE TABLE data_source_health (
     status VARCHAR(20), -- success, failed, degraded
     error_message TEXT,
     records_fetched INTEGER,
+    stage_breakdown JSONB, -- seconds per import step and pipeline stage metrics for the run
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
@@ -112,41 +116,114 @@ CREATE INDEX idx_news_articles_state_timestamp ON news_articles(state, published
 CREATE INDEX idx_news_articles_source ON news_articles(source);
 CREATE INDEX idx_data_source_health_source ON data_source_health(source_name, created_at DESC);
 
--- Create views for common aggregations
-CREATE VIEW arrests_by_state_month AS
+-- Natural-key indexes backing the collector's idempotent upserts
+CREATE UNIQUE INDEX uq_arrests_dedup_key ON arrests(dedup_key, timestamp);
+CREATE UNIQUE INDEX uq_detentions_dedup_key ON detentions(dedup_key, timestamp);
+CREATE UNIQUE INDEX uq_removals_dedup_key ON removals(dedup_key, timestamp);
+
+-- Collector-maintained rollups (see python-collector/database/rollups.py).
+-- Updated with per-group deltas as each batch is upserted; empty strings stand in for NULL keys.
+CREATE TABLE state_month_rollup (
+    month TIMESTAMPTZ NOT NULL,
+    state VARCHAR(2) NOT NULL DEFAULT '',
+    data_source VARCHAR(50) NOT NULL DEFAULT '',
+    arrests BIGINT NOT NULL DEFAULT 0,
+    criminal_arrests BIGINT NOT NULL DEFAULT 0,
+    non_criminal_arrests BIGINT NOT NULL DEFAULT 0,
+    arrest_rows INTEGER NOT NULL DEFAULT 0,
+    removals BIGINT NOT NULL DEFAULT 0,
+    removal_rows INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (month, state, data_source)
+);
+
+CREATE TABLE facility_day_rollup (
+    day TIMESTAMPTZ NOT NULL,
+    facility_id VARCHAR(50) NOT NULL DEFAULT '',
+    facility_name VARCHAR(255) NOT NULL DEFAULT '',
+    state VARCHAR(2) NOT NULL DEFAULT '',
+    data_source VARCHAR(50) NOT NULL DEFAULT '',
+    detained_sum BIGINT NOT NULL DEFAULT 0,
+    detained_rows INTEGER NOT NULL DEFAULT 0,
+    capacity_sum BIGINT NOT NULL DEFAULT 0,
+    capacity_rows INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (day, facility_id, facility_name, state, data_source)
+);
+
+-- Continuous aggregates for common aggregations.
+-- Materialized only: the collector refreshes the affected time range after each
+-- import, and the policies below catch anything it missed.
+CREATE MATERIALIZED VIEW arrests_state_daily
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+SELECT
+    time_bucket('1 day', timestamp) as day,
+    state,
+    SUM(arrest_count) as total_arrests,
+    SUM(criminal_arrests) as total_criminal,
+    SUM(non_criminal_arrests) as total_non_criminal
+FROM arrests
+GROUP BY day, state;
+
+CREATE MATERIALIZED VIEW arrests_by_state_month
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
 SELECT
-    date_trunc('month', timestamp) as month,
+    time_bucket('1 month', timestamp) as month,
     state,
     SUM(arrest_count) as total_arrests,
     SUM(criminal_arrests) as total_criminal,
     SUM(non_criminal_arrests) as total_non_criminal
 FROM arrests
-GROUP BY month, state
-ORDER BY month DESC, state;
+GROUP BY month, state;
 
+-- Sums and counts rather than averages, so days can be re-aggregated over any range
+CREATE MATERIALIZED VIEW detentions_facility_daily
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+SELECT
+    time_bucket('1 day', timestamp) as day,
+    facility_name,
+    facility_id,
+    state,
+    SUM(detained_count) as detained_sum,
+    COUNT(detained_count) as detained_rows,
+    SUM(CASE WHEN capacity > 0 THEN detained_count END) as utilized_detained_sum,
+    COUNT(CASE WHEN capacity > 0 THEN detained_count END) as utilized_detained_rows,
+    SUM(CASE WHEN capacity > 0 THEN capacity END) as capacity_sum,
+    COUNT(CASE WHEN capacity > 0 THEN capacity END) as capacity_rows
+FROM detentions
+GROUP BY day, facility_name, facility_id, state;
+
+SELECT add_continuous_aggregate_policy('arrests_state_daily',
+    start_offset => INTERVAL '3 months', end_offset => NULL, schedule_interval => INTERVAL '1 day');
+SELECT add_continuous_aggregate_policy('arrests_by_state_month',
+    start_offset => INTERVAL '3 months', end_offset => NULL, schedule_interval => INTERVAL '1 day');
+SELECT add_continuous_aggregate_policy('detentions_facility_daily',
+    start_offset => INTERVAL '3 months', end_offset => NULL, schedule_interval => INTERVAL '1 day');
+
+-- Views keeping the original summary shapes, read from the aggregates
 CREATE VIEW detention_capacity_utilization AS
 SELECT
-    date_trunc('day', timestamp) as day,
+    day,
     facility_name,
     facility_id,
     state,
-    AVG(detained_count) as avg_detained,
-    AVG(capacity) as avg_capacity,
+    utilized_detained_sum::DECIMAL / NULLIF(utilized_detained_rows, 0) as avg_detained,
+    capacity_sum::DECIMAL / capacity_rows as avg_capacity,
     CASE
-        WHEN AVG(capacity) > 0 THEN (AVG(detained_count)::DECIMAL / AVG(capacity)::DECIMAL) * 100
+        WHEN capacity_sum > 0 THEN
+            (utilized_detained_sum::DECIMAL / NULLIF(utilized_detained_rows, 0)) / (capacity_sum::DECIMAL / capacity_rows) * 100
         ELSE 0
     END as utilization_percent
-FROM detentions
-WHERE capacity IS NOT NULL AND capacity > 0
-GROUP BY day, facility_name, facility_id, state
+FROM detentions_facility_daily
+WHERE capacity_rows > 0
 ORDER BY day DESC;
 
 CREATE VIEW national_daily_summary AS
 SELECT
-    date_trunc('day', timestamp) as day,
-    SUM(arrest_count) as total_arrests,
+    day,
+    SUM(total_arrests) as total_arrests,
     COUNT(DISTINCT state) as states_with_activity
-FROM arrests
+FROM arrests_state_daily
 GROUP BY day
 ORDER BY day DESC;
 
@@ -164,3 +241,5 @@ COMMENT ON TABLE removals IS 'Removal and deportation statistics';
 COMMENT ON TABLE community_reports IS 'Community-reported ICE activities and sightings';
 COMMENT ON TABLE news_articles IS 'News articles about ICE enforcement activities';
 COMMENT ON TABLE data_source_health IS 'Monitoring health and status of data collection sources';
+COMMENT ON TABLE state_month_rollup IS 'Arrest and removal totals per state, month and source';
+COMMENT ON TABLE facility_day_rollup IS 'Detention population and capacity totals per facility and day';
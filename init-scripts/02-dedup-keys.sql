@@ -0,0 +1,44 @@
+-- Natural-key deduplication for databases created before dedup_key existed.
+-- Safe to re-run; on a fresh database this is a no-op.
+--
+-- Keys mirror DataNormalizer.deduplicate_key in the Python collector:
+-- lower(source_date_state_city_county[_extra...]) with spaces as underscores.
+
+ALTER TABLE arrests ADD COLUMN IF NOT EXISTS dedup_key TEXT;
+ALTER TABLE detentions ADD COLUMN IF NOT EXISTS dedup_key TEXT;
+ALTER TABLE removals ADD COLUMN IF NOT EXISTS dedup_key TEXT;
+
+-- Backfill keys for rows imported before deduplication
+UPDATE arrests SET dedup_key = lower(replace(concat_ws('_',
+    coalesce(data_source, ''), to_char(timestamp, 'YYYY-MM-DD'),
+    coalesce(state, ''), coalesce(city, ''), coalesce(county, '')
+), ' ', '_'))
+WHERE dedup_key IS NULL;
+
+UPDATE detentions SET dedup_key = lower(replace(concat_ws('_',
+    coalesce(data_source, ''), to_char(timestamp, 'YYYY-MM-DD'),
+    coalesce(state, ''), coalesce(city, ''), '',
+    coalesce(facility_id, ''), coalesce(facility_name, '')
+), ' ', '_'))
+WHERE dedup_key IS NULL;
+
+UPDATE removals SET dedup_key = lower(replace(concat_ws('_',
+    coalesce(data_source, ''), to_char(timestamp, 'YYYY-MM-DD'),
+    coalesce(state, ''), '', '',
+    coalesce(country_of_citizenship, ''), coalesce(removal_type, '')
+), ' ', '_'))
+WHERE dedup_key IS NULL;
+
+-- Drop rows duplicated by repeated scrapes, keeping the most recent import
+DELETE FROM arrests a USING arrests b
+WHERE a.dedup_key = b.dedup_key AND a.timestamp = b.timestamp AND a.id < b.id;
+
+DELETE FROM detentions a USING detentions b
+WHERE a.dedup_key = b.dedup_key AND a.timestamp = b.timestamp AND a.id < b.id;
+
+DELETE FROM removals a USING removals b
+WHERE a.dedup_key = b.dedup_key AND a.timestamp = b.timestamp AND a.id < b.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_arrests_dedup_key ON arrests(dedup_key, timestamp);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_detentions_dedup_key ON detentions(dedup_key, timestamp);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_removals_dedup_key ON removals(dedup_key, timestamp);
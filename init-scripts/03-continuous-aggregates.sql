@@ -0,0 +1,102 @@
+-- Continuous aggregates for databases created with plain summary views.
+-- Safe to re-run, and harmless on a database created from 01-schema.sql.
+--
+-- arrests_by_state_month becomes a continuous aggregate, and
+-- detention_capacity_utilization / national_daily_summary become thin views
+-- over the daily aggregates, keeping their column names. Creating the
+-- aggregates materializes existing data once.
+
+DO $$
+BEGIN
+    -- A continuous aggregate is also listed in pg_views, so only drop the plain view
+    IF EXISTS (SELECT 1 FROM pg_views WHERE schemaname = 'public' AND viewname = 'arrests_by_state_month')
+        AND NOT EXISTS (
+            SELECT 1 FROM timescaledb_information.continuous_aggregates
+            WHERE view_schema = 'public' AND view_name = 'arrests_by_state_month'
+        ) THEN
+        DROP VIEW arrests_by_state_month;
+    END IF;
+END
+$$;
+
+DROP VIEW IF EXISTS detention_capacity_utilization;
+DROP VIEW IF EXISTS national_daily_summary;
+
+-- Continuous aggregates for common aggregations.
+-- Materialized only: the collector refreshes the affected time range after each
+-- import, and the policies below catch anything it missed.
+CREATE MATERIALIZED VIEW IF NOT EXISTS arrests_state_daily
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+SELECT
+    time_bucket('1 day', timestamp) as day,
+    state,
+    SUM(arrest_count) as total_arrests,
+    SUM(criminal_arrests) as total_criminal,
+    SUM(non_criminal_arrests) as total_non_criminal
+FROM arrests
+GROUP BY day, state;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS arrests_by_state_month
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+SELECT
+    time_bucket('1 month', timestamp) as month,
+    state,
+    SUM(arrest_count) as total_arrests,
+    SUM(criminal_arrests) as total_criminal,
+    SUM(non_criminal_arrests) as total_non_criminal
+FROM arrests
+GROUP BY month, state;
+
+-- Sums and counts rather than averages, so days can be re-aggregated over any range
+CREATE MATERIALIZED VIEW IF NOT EXISTS detentions_facility_daily
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+SELECT
+    time_bucket('1 day', timestamp) as day,
+    facility_name,
+    facility_id,
+    state,
+    SUM(detained_count) as detained_sum,
+    COUNT(detained_count) as detained_rows,
+    SUM(CASE WHEN capacity > 0 THEN detained_count END) as utilized_detained_sum,
+    COUNT(CASE WHEN capacity > 0 THEN detained_count END) as utilized_detained_rows,
+    SUM(CASE WHEN capacity > 0 THEN capacity END) as capacity_sum,
+    COUNT(CASE WHEN capacity > 0 THEN capacity END) as capacity_rows
+FROM detentions
+GROUP BY day, facility_name, facility_id, state;
+
+SELECT add_continuous_aggregate_policy('arrests_state_daily',
+    start_offset => INTERVAL '3 months', end_offset => NULL, schedule_interval => INTERVAL '1 day',
+    if_not_exists => true);
+SELECT add_continuous_aggregate_policy('arrests_by_state_month',
+    start_offset => INTERVAL '3 months', end_offset => NULL, schedule_interval => INTERVAL '1 day',
+    if_not_exists => true);
+SELECT add_continuous_aggregate_policy('detentions_facility_daily',
+    start_offset => INTERVAL '3 months', end_offset => NULL, schedule_interval => INTERVAL '1 day',
+    if_not_exists => true);
+
+-- Views keeping the original summary shapes, read from the aggregates
+CREATE OR REPLACE VIEW detention_capacity_utilization AS
+SELECT
+    day,
+    facility_name,
+    facility_id,
+    state,
+    utilized_detained_sum::DECIMAL / NULLIF(utilized_detained_rows, 0) as avg_detained,
+    capacity_sum::DECIMAL / capacity_rows as avg_capacity,
+    CASE
+        WHEN capacity_sum > 0 THEN
+            (utilized_detained_sum::DECIMAL / NULLIF(utilized_detained_rows, 0)) / (capacity_sum::DECIMAL / capacity_rows) * 100
+        ELSE 0
+    END as utilization_percent
+FROM detentions_facility_daily
+WHERE capacity_rows > 0
+ORDER BY day DESC;
+
+CREATE OR REPLACE VIEW national_daily_summary AS
+SELECT
+    day,
+    SUM(total_arrests) as total_arrests,
+    COUNT(DISTINCT state) as states_with_activity
+FROM arrests_state_daily
+GROUP BY day
+ORDER BY day DESC;
@@ -0,0 +1,82 @@
+-- Collector-maintained rollup tables for databases created before they existed.
+-- Safe to re-run: rollups are only seeded from the fact tables while they are empty.
+--
+-- Bucketing matches RollupMaintainer: the naive local timestamp the collector
+-- wrote, truncated to the month or day.
+
+-- Collector-maintained rollups (see python-collector/database/rollups.py).
+-- Updated with per-group deltas as each batch is upserted; empty strings stand in for NULL keys.
+CREATE TABLE IF NOT EXISTS state_month_rollup (
+    month TIMESTAMPTZ NOT NULL,
+    state VARCHAR(2) NOT NULL DEFAULT '',
+    data_source VARCHAR(50) NOT NULL DEFAULT '',
+    arrests BIGINT NOT NULL DEFAULT 0,
+    criminal_arrests BIGINT NOT NULL DEFAULT 0,
+    non_criminal_arrests BIGINT NOT NULL DEFAULT 0,
+    arrest_rows INTEGER NOT NULL DEFAULT 0,
+    removals BIGINT NOT NULL DEFAULT 0,
+    removal_rows INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (month, state, data_source)
+);
+
+CREATE TABLE IF NOT EXISTS facility_day_rollup (
+    day TIMESTAMPTZ NOT NULL,
+    facility_id VARCHAR(50) NOT NULL DEFAULT '',
+    facility_name VARCHAR(255) NOT NULL DEFAULT '',
+    state VARCHAR(2) NOT NULL DEFAULT '',
+    data_source VARCHAR(50) NOT NULL DEFAULT '',
+    detained_sum BIGINT NOT NULL DEFAULT 0,
+    detained_rows INTEGER NOT NULL DEFAULT 0,
+    capacity_sum BIGINT NOT NULL DEFAULT 0,
+    capacity_rows INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (day, facility_id, facility_name, state, data_source)
+);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM state_month_rollup) THEN
+        INSERT INTO state_month_rollup (month, state, data_source, arrests, criminal_arrests, non_criminal_arrests, arrest_rows)
+        SELECT
+            date_trunc('month', timestamp::timestamp),
+            coalesce(state, ''),
+            coalesce(data_source, ''),
+            coalesce(SUM(arrest_count), 0),
+            coalesce(SUM(criminal_arrests), 0),
+            coalesce(SUM(non_criminal_arrests), 0),
+            COUNT(arrest_count)
+        FROM arrests
+        GROUP BY 1, 2, 3;
+
+        INSERT INTO state_month_rollup AS r (month, state, data_source, removals, removal_rows)
+        SELECT
+            date_trunc('month', timestamp::timestamp),
+            coalesce(state, ''),
+            coalesce(data_source, ''),
+            coalesce(SUM(removal_count), 0),
+            COUNT(removal_count)
+        FROM removals
+        GROUP BY 1, 2, 3
+        ON CONFLICT (month, state, data_source) DO UPDATE
+        SET removals = r.removals + EXCLUDED.removals, removal_rows = r.removal_rows + EXCLUDED.removal_rows;
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM facility_day_rollup) THEN
+        INSERT INTO facility_day_rollup
+            (day, facility_id, facility_name, state, data_source, detained_sum, detained_rows, capacity_sum, capacity_rows)
+        SELECT
+            date_trunc('day', timestamp::timestamp),
+            coalesce(facility_id, ''),
+            coalesce(facility_name, ''),
+            coalesce(state, ''),
+            coalesce(data_source, ''),
+            coalesce(SUM(detained_count), 0),
+            COUNT(detained_count),
+            coalesce(SUM(capacity), 0),
+            COUNT(capacity)
+        FROM detentions
+        GROUP BY 1, 2, 3, 4, 5;
+    END IF;
+END
+$$;
@@ -0,0 +1,8 @@
+-- Per-run stage breakdown on health rows, for databases created before it existed.
+-- Safe to re-run; on a fresh database this is a no-op.
+--
+-- Written by the collector's DataSource._record_health_check:
+-- {"steps": {"fetch": s, "parse": s, "normalize": s, "load": s, "pool_wait": s, "bytes_downloaded": n},
+--  "pipeline": {<stage>: {items, rows_per_second, utilization, max_queue_depth, ...}}}
+
+ALTER TABLE data_source_health ADD COLUMN IF NOT EXISTS stage_breakdown JSONB;
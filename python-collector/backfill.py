@@ -0,0 +1,53 @@
+"""Command-line entry point for bulk-loading archived OHSS files.
+
+Usage::
+
+    python backfill.py manifest.txt [--download-workers 4] [--parse-workers 4]
+
+See ``OHSSBackfill.read_manifest`` for the manifest format. Re-running the
+same manifest resumes: files checkpointed as loaded are skipped.
+"""
+import argparse
+import json
+import logging
+import sys
+
+from config import config
+from database.models import init_db
+from scrapers.backfill import OHSSBackfill
+
+logging.basicConfig(
+    level=getattr(logging, config.LOG_LEVEL),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load archived OHSS files from a manifest")
+    parser.add_argument("manifest", nargs="+", help="manifest file(s) listing paths, directories, globs or URLs")
+    parser.add_argument("--download-workers", type=int, default=config.DOWNLOAD_WORKERS)
+    parser.add_argument("--parse-workers", type=int, default=config.PARSE_WORKERS)
+    parser.add_argument("--checkpoints", default=config.BACKFILL_CHECKPOINT_PATH, help="checkpoint file path")
+    args = parser.parse_args()
+    if args.parse_workers > 1 and config.IMPORT_PIPELINE != "staged":
+        parser.error("--parse-workers needs IMPORT_PIPELINE=staged")
+
+    config.DOWNLOAD_WORKERS = args.download_workers
+    config.PARSE_WORKERS = args.parse_workers
+
+    entries = [entry for path in args.manifest for entry in OHSSBackfill.read_manifest(path)]
+    if not entries:
+        logger.error("Manifest lists no files")
+        sys.exit(1)
+
+    init_db()
+    result = OHSSBackfill(args.checkpoints).run(entries)
+    print(json.dumps(result, indent=2))
+    sys.exit(1 if result["files_failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
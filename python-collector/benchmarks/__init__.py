@@ -0,0 +1 @@
+"""Benchmarks for the ICE data collector ingestion pipeline."""
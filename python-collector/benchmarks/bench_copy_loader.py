@@ -0,0 +1,82 @@
+"""Compare COPY loading and upserts against the ORM paths on a local Postgres.
+
+Connection settings come from the usual ``TIMESCALE_*`` environment
+variables and the schema in ``init-scripts`` must already be applied.
+Each run happens inside a transaction that is rolled back, so the
+benchmark leaves the fact tables untouched.
+
+Usage (from ``python-collector``)::
+
+    python -m benchmarks.bench_copy_loader --rows 100000 --table arrests
+"""
+import argparse
+import time
+from sqlalchemy import insert
+from database.models import Arrest, Detention, Removal, DEDUP_CONFLICT_COLUMNS, get_session
+from database.copy_loader import CopyLoader
+from processors.columnar_normalizer import ColumnarNormalizer
+from benchmarks.synthetic import FRAME_BUILDERS
+
+MODELS = {"arrests": Arrest, "detentions": Detention, "removals": Removal}
+
+
+def load_orm(db, model, frame):
+    """The original path: one ORM object per row through ``db.add``."""
+    for record in ColumnarNormalizer.to_records(frame):
+        db.add(model(**record))
+    db.flush()
+
+
+def load_insert(db, model, frame):
+    """A single executemany INSERT of plain dicts."""
+    db.execute(insert(model), ColumnarNormalizer.to_records(frame))
+
+
+def load_copy(db, model, frame, batch_size):
+    """Streaming COPY ... FROM STDIN."""
+    CopyLoader(model.__tablename__, frame.columns, batch_size=batch_size).load(db, frame)
+
+
+def load_copy_upsert(db, model, frame, batch_size):
+    """COPY into a staging table, then ``INSERT ... ON CONFLICT`` on the natural key."""
+    loader = CopyLoader(model.__tablename__, frame.columns, batch_size=batch_size)
+    loader.upsert(db, frame, DEDUP_CONFLICT_COLUMNS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--table", choices=sorted(MODELS), default="arrests")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    raw = FRAME_BUILDERS[args.table](args.rows)
+    frame, _ = ColumnarNormalizer.normalize(raw, args.table, {"url": "benchmark"}, data_source="BENCH")
+    model = MODELS[args.table]
+
+    methods = {
+        "orm": lambda db: load_orm(db, model, frame),
+        "insert": lambda db: load_insert(db, model, frame),
+        "copy": lambda db: load_copy(db, model, frame, args.batch_size),
+        "upsert": lambda db: load_copy_upsert(db, model, frame, args.batch_size),
+    }
+
+    print(f"{args.rows} {args.table} rows, best of {args.repeat}")
+    for name, method in methods.items():
+        timings = []
+        for _ in range(args.repeat):
+            db = get_session()
+            try:
+                started = time.perf_counter()
+                method(db)
+                timings.append(time.perf_counter() - started)
+            finally:
+                db.rollback()
+                db.close()
+        best = min(timings)
+        print(f"  {name:<7} {best:8.3f}s  {args.rows / best:12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
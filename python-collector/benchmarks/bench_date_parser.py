@@ -0,0 +1,107 @@
+"""Time date parsing per million rows, per-row strptime cascade vs ``DateParser``, and check its edge cases.
+
+The column repeats a few hundred monthly period strings, like the OHSS
+tables. Before timing, a fresh parser is checked on columns the format
+detection has to get right: an ambiguous day/month column with values
+only one order can read, the same string in columns of different formats
+through one shared cache, and a column whose format does not show up in
+the detection sample. Any mismatch is printed and the script exits
+non-zero.
+
+Usage (from ``python-collector``)::
+
+    python -m benchmarks.bench_date_parser --rows 1000000
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from typing import List
+import numpy as np
+import pandas as pd
+from processors.date_parser import DATE_FORMATS, DateParser
+
+
+def parse_cascade(value: str):
+    """The original per-row path: try each format with ``strptime`` until one does not raise."""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def check(name: str, got: pd.Series, expected: List[str]) -> bool:
+    """Print a mismatch between parsed dates and the expected ISO dates (``None`` for NaT)."""
+    wanted = pd.Series(pd.to_datetime(expected), dtype="datetime64[ns]")
+    if got.reset_index(drop=True).equals(wanted):
+        return True
+    print(f"  FAIL {name}: got {got.tolist()}, expected {wanted.tolist()}")
+    return False
+
+
+def run_checks() -> bool:
+    """Parse the edge-case columns with a fresh parser; True if all came out as expected."""
+    parser = DateParser()
+    results = [
+        # Month first by majority: 13/02 cannot be month first and is rejected, not read day first
+        check(
+            "ambiguous month-first column",
+            parser.parse_series(pd.Series(["01/02/2024", "03/04/2024", "12/31/2024", "13/02/2024"])),
+            ["2024-01-02", "2024-03-04", "2024-12-31", None],
+        ),
+        # Day first: every value is read day first, including 01/02, already cached from the column above
+        check(
+            "ambiguous day-first column",
+            parser.parse_series(pd.Series(["01/02/2024", "13/02/2024", "25/12/2024"])),
+            ["2024-02-01", "2024-02-13", "2024-12-25"],
+        ),
+        # The same strings, cached by the day-first column above, in a month-first column
+        check(
+            "shared cache across columns",
+            parser.parse_series(pd.Series(["01/02/2024", "12/31/2024"])),
+            ["2024-01-02", "2024-12-31"],
+        ),
+        # Nothing in the sample parses; later values still get every format
+        check(
+            "format missing from the sample",
+            DateParser(sample_size=2).parse_series(pd.Series(["n/a", "unknown", "2024-01-05", "March 2024"])),
+            [None, None, "2024-01-05", "2024-03-01"],
+        ),
+    ]
+    return all(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=240, help="distinct period strings in the column")
+    args = parser.parse_args()
+
+    print("Checks")
+    passed = run_checks()
+    print(f"  {'all passed' if passed else 'FAILED'}")
+
+    periods = pd.period_range("2005-01", periods=args.distinct, freq="M").strftime("%m/%d/%Y")
+    column = pd.Series(np.random.default_rng(0).choice(periods, args.rows), dtype="object")
+
+    print(f"{args.rows} rows, {args.distinct} distinct dates")
+    started = time.perf_counter()
+    [parse_cascade(value) for value in column]
+    cascade = time.perf_counter() - started
+    print(f"  strptime cascade  {cascade:8.3f}s")
+    # The second pass finds every distinct value in the memo cache
+    date_parser = DateParser()
+    for label in ["DateParser cold", "DateParser warm"]:
+        started = time.perf_counter()
+        date_parser.parse_series(column)
+        seconds = time.perf_counter() - started
+        print(f"  {label:<17} {seconds:8.3f}s  {cascade / seconds:6.1f}x")
+
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Compare the sync and async database writers on a local Postgres behind an injected network latency.
+
+Connections to the ``TIMESCALE_*`` database are relayed through a local
+proxy that delays every packet by half of ``--db-latency`` each way, as a
+database in another region would. Each writer imports the same fixture
+site from scratch with the staged pipeline, under the ``BENCH`` data
+source, whose fact and rollup rows are deleted before and after each run.
+For each writer it prints wall-clock time, records written and whether
+the rollups still add up to the fact tables. The schema must already be
+applied; continuous aggregates are not refreshed.
+
+First, the async writer's aggregate refresh bookkeeping is checked with
+two interleaved files: the second is held back by an advisory lock
+until after the first has finished, and each refresh must cover exactly
+the file that committed before it. A failed check exits non-zero.
+
+Usage (from ``python-collector``)::
+
+    python -m benchmarks.bench_db_writer --db-latency 0.02 --files-per-type 4 --rows 50000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from typing import Dict, List
+from sqlalchemy import text
+from config import config
+from database.async_writer import close_async_writer
+from database.models import init_db
+from database.rollups import ROLLUP_SPECS
+from processors.columnar_normalizer import ColumnarNormalizer
+from scrapers.ohss_scraper import OHSSScraper
+from benchmarks.fixtures import latency_proxy, sample_ohss_site
+from benchmarks.synthetic import FRAME_BUILDERS
+
+SOURCE_NAME = "BENCH"
+TABLES = ["arrests", "detentions", "removals", "state_month_rollup", "facility_day_rollup"]
+
+
+class BenchScraper(OHSSScraper):
+    """OHSS scraper that writes under its own data source and skips health checks."""
+
+    SOURCE_NAME = SOURCE_NAME
+
+    def _record_health_check(self, result):
+        pass
+
+
+class RefreshRecorder(BenchScraper):
+    """Records the ranges each aggregate refresh would cover instead of refreshing."""
+
+    def __init__(self):
+        super().__init__()
+        self.refreshes: List[Dict] = []
+
+    def _refresh_aggregates(self):
+        self.refreshes.append(self.loaded_ranges.pop_all())
+
+
+def clean(engine):
+    """Delete everything the benchmark wrote."""
+    with engine.begin() as conn:
+        for table in TABLES:
+            conn.execute(text(f"DELETE FROM {table} WHERE data_source = :source"), {"source": SOURCE_NAME})
+
+
+def rollups_consistent(engine) -> bool:
+    """Whether every rollup column sums to the same total as the fact column feeding it."""
+    with engine.connect() as conn:
+        for data_type, spec in ROLLUP_SPECS.items():
+            rollup = spec["model"].__tablename__
+            for source, target in spec["sums"].items():
+                facts = f"SELECT COALESCE(SUM({source}), 0) FROM {data_type} WHERE data_source = :source"
+                totals = f"SELECT COALESCE(SUM({target}), 0) FROM {rollup} WHERE data_source = :source"
+                if conn.execute(text(facts), {"source": SOURCE_NAME}).scalar() != conn.execute(
+                    text(totals), {"source": SOURCE_NAME}
+                ).scalar():
+                    return False
+    return True
+
+
+def check_refresh(engine) -> bool:
+    """Interleave two async files and check that each refresh covers only what had committed before it."""
+    clean(engine)
+    files = {}
+    for data_type in ["arrests", "removals"]:
+        url = f"http://bench.invalid/{data_type}.csv"
+        frame, _ = ColumnarNormalizer.normalize(
+            FRAME_BUILDERS[data_type](1000), data_type, {"url": url}, data_source=SOURCE_NAME
+        )
+        files[data_type] = (
+            {"url": url, "type": data_type},
+            {"digest": data_type, "headers": {}, "content_length": 0, "filepath": None},
+            frame,
+        )
+    expected = {
+        data_type: (frame["timestamp"].min(), frame["timestamp"].max()) for data_type, (_, _, frame) in files.items()
+    }
+
+    with tempfile.TemporaryDirectory(prefix="ohss-bench-") as data_dir, engine.connect() as blocker:
+        config.DATA_DIR = data_dir
+        config.FETCH_CACHE_PATH = f"{data_dir}/fetch_metadata.json"
+        config.DB_WRITER = "async"
+        scraper = RefreshRecorder()
+        scraper.file_stats = {"imported": 0, "failed": 0}
+
+        # The async writer takes this lock before each removals upsert
+        blocker.execute(text("SELECT pg_advisory_lock(hashtext('removals'))"))
+        try:
+            for link_info, download, frame in files.values():
+                scraper._load(link_info, download, frame, {})
+            scraper._finish_import(*files["arrests"][:2], len(files["arrests"][2]), 0)
+        finally:
+            blocker.execute(text("SELECT pg_advisory_unlock(hashtext('removals'))"))
+        scraper._finish_import(*files["removals"][:2], len(files["removals"][2]), 0)
+    close_async_writer()
+    clean(engine)
+
+    wanted = [{"arrests": expected["arrests"]}, {"removals": expected["removals"]}]
+    if scraper.refreshes == wanted:
+        return True
+    print(f"  FAIL refresh ranges: got {scraper.refreshes}, expected {wanted}")
+    return False
+
+
+def run_once(engine, base_url: str, writer: str) -> Dict:
+    """Import the fixture site once with fresh caches through the given writer."""
+    clean(engine)
+    with tempfile.TemporaryDirectory(prefix="ohss-bench-") as data_dir:
+        config.DATA_DIR = data_dir
+        config.FETCH_CACHE_PATH = f"{data_dir}/fetch_metadata.json"
+        config.LAYOUT_CACHE_PATH = f"{data_dir}/layouts.json"
+        config.COLUMNAR_CACHE_ENABLED = False
+        config.DB_WRITER = writer
+        config.OHSS_BASE_URL = base_url
+        config.OHSS_DATA_PATH = "/index.html"
+
+        started = time.perf_counter()
+        try:
+            result = BenchScraper().scrape()
+        finally:
+            close_async_writer()
+        result["seconds"] = time.perf_counter() - started
+    result["consistent"] = rollups_consistent(engine)
+    clean(engine)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-latency", type=float, default=0.02, help="seconds added per database round trip")
+    parser.add_argument("--files-per-type", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--parse-threads", type=int, default=config.PARSE_THREADS)
+    args = parser.parse_args()
+    config.CSV_CHUNK_SIZE = args.chunk_size
+    config.PARSE_THREADS = args.parse_threads
+    config.IMPORT_PIPELINE = "staged"
+    config.CONTINUOUS_AGGREGATES_ENABLED = False
+
+    with latency_proxy(config.TIMESCALE_HOST, config.TIMESCALE_PORT, args.db_latency) as port:
+        config.TIMESCALE_HOST, config.TIMESCALE_PORT = "127.0.0.1", port
+        engine = init_db()
+        passed = check_refresh(engine)
+        print(f"Aggregate refresh check {'passed' if passed else 'FAILED'}")
+        with sample_ohss_site(files_per_type=args.files_per_type, rows=args.rows, xlsx=False) as (base_url, paths):
+            print(
+                f"{len(paths)} files, {args.rows} rows each, {args.chunk_size}-row chunks, "
+                f"{args.db_latency * 1000:.0f}ms per database round trip"
+            )
+            timings = {}
+            for writer in ["sync", "async"]:
+                result = run_once(engine, base_url, writer)
+                timings[writer] = result["seconds"]
+                print(
+                    f"  {writer:<6} {result['seconds']:7.2f}s  records={result['records_fetched']} "
+                    f"failed={result['files_failed']} rollups_consistent={result['consistent']}"
+                )
+            print(f"  speedup {timings['sync'] / timings['async']:.2f}x")
+        engine.dispose()
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Measure OHSS scrape wall-clock time against a slow local server at several pool sizes.
+
+Runs fully offline: files are served from a local fixture with artificial
+per-request latency, and imports are normalized but not written to a
+database.
+
+Usage (from ``python-collector``)::
+
+    python -m benchmarks.bench_download_pool --latency 0.5 --workers 1 2 4 8
+"""
+import argparse
+import tempfile
+import time
+from config import config
+from benchmarks.fixtures import DryRunScraper, sample_ohss_site
+
+
+def run_once(base_url: str, workers: int) -> dict:
+    """Scrape the fixture site once with a fresh fetch cache."""
+    with tempfile.TemporaryDirectory(prefix="ohss-bench-") as data_dir:
+        config.DATA_DIR = data_dir
+        config.FETCH_CACHE_PATH = f"{data_dir}/fetch_metadata.json"
+        config.DOWNLOAD_WORKERS = workers
+        config.DOWNLOAD_PER_HOST_LIMIT = workers
+        config.OHSS_BASE_URL = base_url
+        config.OHSS_DATA_PATH = "/index.html"
+
+        started = time.perf_counter()
+        result = DryRunScraper().scrape()
+        result["seconds"] = time.perf_counter() - started
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds of delay per request")
+    parser.add_argument("--files-per-type", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with sample_ohss_site(args.latency, files_per_type=args.files_per_type, rows=args.rows) as (base_url, paths):
+        print(f"{len(paths)} files, {args.rows} rows each, {args.latency}s latency per request")
+        for workers in args.workers:
+            result = run_once(base_url, workers)
+            print(
+                f"  workers={workers:<3} {result['seconds']:7.2f}s  "
+                f"imported={result['files_imported']} records={result['records_fetched']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compare Excel parse time across WorkbookReader engines and the columnar cache.
+
+Generates an OHSS-style workbook (title rows, header, data sheet plus a
+notes sheet) and times reading it fully through each path.
+
+Usage (from ``python-collector``)::
+
+    python -m benchmarks.bench_excel_reader --rows 200000
+"""
+import argparse
+import os
+import tempfile
+import time
+import pandas as pd
+from processors.columnar_normalizer import ColumnarNormalizer
+from processors.workbook_reader import WorkbookReader
+from benchmarks.synthetic import make_arrests_frame, write_ohss_workbook
+
+
+def time_read(label: str, read) -> float:
+    """Consume every frame from ``read()`` and report rows and elapsed time."""
+    started = time.perf_counter()
+    rows = sum(len(frame) for frame in read())
+    seconds = time.perf_counter() - started
+    print(f"  {label:<34} {seconds:8.2f}s  {rows:>9} rows")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    expected = ColumnarNormalizer.expected_columns("arrests")
+    with tempfile.TemporaryDirectory(prefix="ohss-xlsx-") as directory:
+        path = os.path.join(directory, "arrests.xlsx")
+        started = time.perf_counter()
+        write_ohss_workbook(make_arrests_frame(args.rows), path)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"{args.rows} row workbook ({size_mb:.1f} MiB) generated in {time.perf_counter() - started:.1f}s")
+
+        time_read("pd.read_excel (default openpyxl)", lambda: [pd.read_excel(path, header=2)])
+        for engine in WorkbookReader.ENGINES:
+            reader = WorkbookReader(engine=engine, chunk_size=args.chunk_size, cache_dir="")
+            time_read(f"WorkbookReader[{engine}]", lambda: reader.read(path, expected))
+
+        cache_dir = os.path.join(directory, "columnar")
+        reader = WorkbookReader(chunk_size=args.chunk_size, cache_dir=cache_dir)
+        time_read("first read, writing Parquet cache", lambda: reader.read(path, expected, digest="bench"))
+        time_read("cached read (Parquet)", lambda: reader.read(path, expected, digest="bench"))
+
+
+if __name__ == "__main__":
+    main()
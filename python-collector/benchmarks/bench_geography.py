@@ -0,0 +1,48 @@
+"""Compare the table-driven state normalizer against the old per-element ``Series.apply``.
+
+Usage (from ``python-collector``)::
+
+    python -m benchmarks.bench_geography --rows 1000000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from processors.geography import STATES, normalize_states
+
+
+def legacy_standardize(series: pd.Series) -> pd.Series:
+    """The previous CSVProcessor approach: rebuild a name map and apply a closure per element."""
+    state_map = {name.lower(): code for code, name, _, _ in STATES[:51] if code != "DC"}
+
+    def convert_state(val):
+        if pd.isna(val):
+            return None
+        val_str = str(val).strip().lower()
+        if val_str in state_map:
+            return state_map[val_str]
+        if len(val_str) == 2:
+            return val_str.upper()
+        return val_str.upper()[:2]
+
+    return series.apply(convert_state)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    spellings = [value for code, name, fips, aliases in STATES for value in (code, name, fips, *aliases) if value]
+    rng = np.random.default_rng(0)
+    series = pd.Series(rng.choice(spellings + [None], args.rows), dtype="object")
+
+    for label, func in [("Series.apply (legacy)", legacy_standardize), ("normalize_states", normalize_states)]:
+        started = time.perf_counter()
+        result = func(series)
+        seconds = time.perf_counter() - started
+        print(f"  {label:<24} {seconds:7.3f}s  {args.rows / seconds:14,.0f} rows/s  unmapped={int(result.isna().sum())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""Reproducible per-stage time and peak memory of the ingestion path, written as JSON.
+
+For every data type, format (CSV, XLSX) and size it generates an
+OHSS-shaped file (deterministic for a given seed; ``--fixtures DIR`` keeps
+them between runs) and measures, each in a fresh child process:
+
+* ``parse``: reading the raw file (``FileParser.read_csv`` / ``WorkbookReader``)
+* ``map``: column mapping and type detection for the layout (``LayoutCache.plan_for``)
+* ``normalize``: ``ColumnarNormalizer.normalize``
+* ``load``: upserting the normalized rows (``--load sqlite`` or ``postgres``)
+* ``end_to_end``: the scraper's serial import of the whole file, with the
+  layout now known, loading into the same backend
+
+Each stage reports wall-clock seconds (best of ``--repeat`` runs) and its
+peak RSS above the RSS it started with (highest across runs; peak
+tracking is reset per stage where the kernel allows).
+``--load postgres`` uses the ``TIMESCALE_*`` database and rolls every
+write back. ``--baseline`` compares against an earlier JSON result and
+flags stages that got slower by more than ``--threshold`` (and at least
+``--min-delta`` seconds).
+
+Usage (from ``python-collector``)::
+
+    python -m benchmarks.bench_ingest --rows 10000 100000 1000000 --formats csv xlsx --load sqlite \\
+        --fixtures /tmp/ohss-fixtures --output results.json
+    python -m benchmarks.bench_ingest --rows 100000 --load sqlite --baseline results.json
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import queue as queue_module
+import resource
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+def _status_mib(field: str) -> Optional[float]:
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS (``VmHWM``) for this process; Linux only."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mib() -> float:
+    peak = _status_mib("VmHWM")
+    return peak if peak is not None else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@contextmanager
+def _stage(results: Dict, name: str):
+    """Time a stage and record the peak RSS it reached above its starting RSS."""
+    gc.collect()
+    _reset_peak_rss()
+    rss_before = _status_mib("VmRSS") or _peak_rss_mib()
+    started = time.perf_counter()
+    yield
+    seconds = time.perf_counter() - started
+    results[name] = {
+        "seconds": round(seconds, 4),
+        "peak_mib": round(max(_peak_rss_mib() - rss_before, 0.0), 1),
+    }
+
+
+def fixture_path(directory: str, data_type: str, fmt: str, rows: int, seed: int) -> str:
+    """Generate (or reuse) a synthetic OHSS-shaped file."""
+    from benchmarks.synthetic import FRAME_BUILDERS, write_ohss_workbook
+
+    path = os.path.join(directory, f"{data_type}_{rows}_s{seed}.{fmt}")
+    if not os.path.exists(path):
+        frame = FRAME_BUILDERS[data_type](rows, seed=seed)
+        tmp_path = f"{path}.tmp.{fmt}"
+        if fmt == "csv":
+            frame.to_csv(tmp_path, index=False)
+        else:
+            write_ohss_workbook(frame, tmp_path)
+        os.replace(tmp_path, path)
+    return path
+
+
+class BenchLoader:
+    """Upserts normalized frames into SQLite or a rolled-back Postgres transaction."""
+
+    def __init__(self, backend: str, directory: str):
+        self.backend = backend
+        self.directory = directory
+        self.engine = None
+        self.db = None
+
+    def open(self, model):
+        from sqlalchemy import create_engine
+        from database.models import get_session
+
+        self.model = model
+        if self.backend == "sqlite":
+            path = os.path.join(self.directory, "bench.sqlite")
+            if os.path.exists(path):
+                os.remove(path)
+            self.engine = create_engine(f"sqlite:///{path}")
+            model.__table__.create(self.engine)
+        elif self.backend == "postgres":
+            self.db = get_session()
+
+    def reset(self):
+        """Empty the target so the next load writes every row again."""
+        if self.backend == "sqlite":
+            self.model.__table__.drop(self.engine)
+            self.model.__table__.create(self.engine)
+        elif self.backend == "postgres":
+            self.db.rollback()
+
+    def write(self, frame: pd.DataFrame) -> int:
+        from config import config
+        from processors.columnar_normalizer import ColumnarNormalizer
+        from database.models import DEDUP_CONFLICT_COLUMNS
+
+        if frame.empty:
+            return 0
+        if self.backend == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+            stmt = sqlite_insert(self.model)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=DEDUP_CONFLICT_COLUMNS,
+                set_={col: stmt.excluded[col] for col in frame.columns if col not in DEDUP_CONFLICT_COLUMNS},
+            )
+            with self.engine.begin() as conn:
+                for records in ColumnarNormalizer.record_batches(frame, config.COPY_BATCH_SIZE):
+                    conn.execute(stmt, records)
+            return len(frame)
+
+        from database.copy_loader import CopyLoader
+
+        loader = CopyLoader(self.model.__tablename__, frame.columns)
+        records = loader.upsert(self.db, frame, DEDUP_CONFLICT_COLUMNS)
+        self.db.flush()
+        return records
+
+    def close(self):
+        if self.db is not None:
+            self.db.rollback()
+            self.db.close()
+        if self.engine is not None:
+            self.engine.dispose()
+
+
+def _run_case(case: Dict, queue):
+    """Measure one data type / format / size in this (fresh) process."""
+    from config import config
+
+    work_dir = tempfile.mkdtemp(prefix="ohss-ingest-")
+    config.DATA_DIR = work_dir
+    config.FETCH_CACHE_PATH = os.path.join(work_dir, "fetch_metadata.json")
+    config.LAYOUT_CACHE_PATH = os.path.join(work_dir, "layouts.json")
+    config.COLUMNAR_CACHE_ENABLED = False
+    config.CSV_CHUNK_SIZE = case["chunk_size"]
+
+    from benchmarks.fixtures import DryRunScraper
+    from processors.columnar_normalizer import ColumnarNormalizer
+    from processors.file_parser import FileParser
+    from processors.layout_cache import LayoutCache
+    from processors.workbook_reader import WorkbookReader
+
+    data_type, path = case["data_type"], case["path"]
+    link_info = {"url": path, "type": data_type}
+    loader = BenchLoader(case["load"], work_dir) if case["load"] != "none" else None
+    stages: Dict[str, Dict] = {}
+    records = 0
+
+    try:
+        with _stage(stages, "parse"):
+            if path.endswith(".csv"):
+                frames = list(FileParser.read_csv(path))
+            else:
+                frames = list(WorkbookReader().read(path, ColumnarNormalizer.expected_columns(data_type), None))
+        rows = sum(len(frame) for frame in frames)
+
+        layout_cache = LayoutCache(config.LAYOUT_CACHE_PATH)
+        with _stage(stages, "map"):
+            plans = [layout_cache.plan_for(frame, data_type, frame.attrs.get("sheet_name", "")) for frame in frames]
+
+        with _stage(stages, "normalize"):
+            normalized = [
+                ColumnarNormalizer.normalize(
+                    frame, data_type, link_info, data_source="BENCH", column_map=plan["column_map"]
+                )[0]
+                for frame, plan in zip(frames, plans)
+            ]
+        del frames
+
+        if loader:
+            loader.open(DryRunScraper.MODELS[data_type])
+            with _stage(stages, "load"):
+                records = sum(loader.write(frame) for frame in normalized)
+            loader.reset()
+        del normalized
+
+        class BenchSource(DryRunScraper):
+            def load(self, data_type, frame, rejected=0, unit=None):
+                return loader.write(frame) if loader else len(frame)
+
+        source = BenchSource()
+        download = {
+            "status": "fetched",
+            "digest": "benchmark",
+            "headers": {},
+            "content_length": os.path.getsize(path),
+            "filepath": path,
+        }
+        with _stage(stages, "end_to_end"):
+            end_to_end_records = source._import_download(link_info, download)
+    finally:
+        if loader:
+            loader.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    queue.put(
+        {
+            **{key: case[key] for key in ("data_type", "format", "rows", "load", "chunk_size")},
+            "parsed_rows": rows,
+            "records": records or end_to_end_records,
+            "file_mib": round(os.path.getsize(path) / 2**20, 2),
+            "stages": stages,
+        }
+    )
+
+
+def run_in_child(context, case: Dict) -> Dict:
+    """Run ``_run_case`` in a fresh process so peak memory is not shared between cases."""
+    queue = context.Queue()
+    process = context.Process(target=_run_case, args=(case, queue))
+    process.start()
+    while True:
+        try:
+            result = queue.get(timeout=1)
+            break
+        except queue_module.Empty:
+            if not process.is_alive():
+                raise RuntimeError(f"Benchmark case {case} exited with code {process.exitcode}")
+    process.join()
+    return result
+
+
+def best_of(runs: List[Dict]) -> Dict:
+    """Merge repeated runs of a case: fastest seconds and highest peak memory per stage."""
+    merged = dict(runs[0], runs=len(runs))
+    merged["stages"] = {
+        stage: {
+            "seconds": min(run["stages"][stage]["seconds"] for run in runs),
+            "peak_mib": max(run["stages"][stage]["peak_mib"] for run in runs),
+        }
+        for stage in runs[0]["stages"]
+    }
+    return merged
+
+
+def environment() -> Dict:
+    """What the numbers were measured on, for comparing runs across commits."""
+    from config import config
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "excel_engine": config.EXCEL_ENGINE,
+        "db_load_method": config.DB_LOAD_METHOD,
+    }
+
+
+def _case_key(result: Dict) -> tuple:
+    return result["data_type"], result["format"], result["rows"], result["load"]
+
+
+def compare(results: List[Dict], baseline: Dict, threshold: float, min_delta: float) -> Tuple[int, List[str]]:
+    """Cases found in the baseline, and stages slower than it by more than ``threshold`` (0.1 = 10%).
+
+    Slowdowns under ``min_delta`` seconds are ignored as timer noise.
+    """
+    previous = {_case_key(result): result for result in baseline.get("results", [])}
+    matched = 0
+    regressions = []
+    for result in results:
+        old = previous.get(_case_key(result))
+        if not old:
+            continue
+        matched += 1
+        for stage, stats in result["stages"].items():
+            before = old["stages"].get(stage, {}).get("seconds")
+            if before and stats["seconds"] > max(before * (1 + threshold), before + min_delta):
+                regressions.append(
+                    f"{'/'.join(map(str, _case_key(result)))} {stage}: {before:.3f}s -> {stats['seconds']:.3f}s "
+                    f"({stats['seconds'] / before - 1:+.0%})"
+                )
+    return matched, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--formats", nargs="+", choices=["csv", "xlsx"], default=["csv", "xlsx"])
+    parser.add_argument("--data-types", nargs="+", choices=["arrests", "detentions", "removals"], default=["arrests"])
+    parser.add_argument("--load", choices=["none", "sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--chunk-size", type=int, default=0, help="CSV_CHUNK_SIZE for parsing (0 = whole file)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest is reported")
+    parser.add_argument("--fixtures", help="directory to keep generated files in between runs")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="earlier JSON result to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown flagged as a regression")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="ignore slowdowns under this many seconds")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    fixtures = args.fixtures or tempfile.mkdtemp(prefix="ohss-fixtures-")
+    os.makedirs(fixtures, exist_ok=True)
+    results = []
+
+    for data_type in args.data_types:
+        for fmt in args.formats:
+            for rows in args.rows:
+                path = fixture_path(fixtures, data_type, fmt, rows, args.seed)
+                case = {
+                    "data_type": data_type,
+                    "format": fmt,
+                    "rows": rows,
+                    "load": args.load,
+                    "chunk_size": args.chunk_size,
+                    "path": path,
+                }
+                result = best_of([run_in_child(context, case) for _ in range(max(1, args.repeat))])
+                results.append(result)
+
+                timings = "  ".join(
+                    f"{stage}={stats['seconds']:.2f}s/{stats['peak_mib']:.0f}MiB"
+                    for stage, stats in result["stages"].items()
+                )
+                print(f"{data_type:<10} {fmt:<4} {rows:>8} rows  {timings}")
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            matched, regressions = compare(results, json.load(f), args.threshold, args.min_delta)
+        print(
+            f"Compared {matched} of {len(results)} cases with {args.baseline}: "
+            f"{len(regressions)} stage(s) slower by more than {args.threshold:.0%}"
+        )
+        for line in regressions:
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
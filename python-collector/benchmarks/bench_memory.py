@@ -0,0 +1,86 @@
+"""Measure peak RSS of parsing and normalizing a CSV, whole-file vs streamed in chunks.
+
+Each measurement runs in a fresh child process so peak RSS is not
+polluted by earlier runs. Imports are normalized but not written to a
+database (the COPY loader only ever buffers ``COPY_BATCH_SIZE`` rows).
+
+Usage (from ``python-collector``)::
+
+    python -m benchmarks.bench_memory --rows 100000 1000000 --chunk-sizes 0 50000
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from benchmarks.synthetic import make_arrests_frame
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB.
+
+    Prefers ``VmHWM`` from ``/proc`` because ``ru_maxrss`` survives
+    ``exec`` and would include the parent's peak.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(path: str, chunk_size: int, queue):
+    from config import config
+    from benchmarks.fixtures import DryRunScraper
+
+    config.CSV_CHUNK_SIZE = chunk_size
+    config.DATA_DIR = os.path.dirname(path)
+    config.FETCH_CACHE_PATH = os.path.join(config.DATA_DIR, "fetch_metadata.json")
+    scraper = DryRunScraper()
+    baseline = _peak_rss_mb()
+
+    started = time.perf_counter()
+    download = {
+        "status": "fetched",
+        "digest": "benchmark",
+        "headers": {},
+        "content_length": os.path.getsize(path),
+        "filepath": path,
+    }
+    records = scraper._import_download({"url": path, "type": "arrests"}, download)
+    queue.put((records, time.perf_counter() - started, baseline, _peak_rss_mb()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[0, 50_000], help="0 = whole file")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory(prefix="ohss-mem-") as directory:
+        for rows in args.rows:
+            path = os.path.join(directory, f"arrests_{rows}.csv")
+            make_arrests_frame(rows).to_csv(path, index=False)
+            size_mb = os.path.getsize(path) / 2**20
+            print(f"{rows} rows ({size_mb:.1f} MiB on disk)")
+
+            for chunk_size in args.chunk_sizes:
+                queue = context.Queue()
+                process = context.Process(target=_measure, args=(path, chunk_size, queue))
+                process.start()
+                records, seconds, baseline, peak = queue.get()
+                process.join()
+                label = "whole file" if chunk_size == 0 else f"chunks of {chunk_size}"
+                print(
+                    f"  {label:<18} {seconds:6.2f}s  peak RSS {peak:7.1f} MiB "
+                    f"(+{peak - baseline:.1f} MiB over baseline)  records={records}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Measure OHSS scrape wall-clock time as normalization scales across worker processes.
+
+Runs fully offline against a local fixture site with no request latency,
+so the time is dominated by CPU-bound parsing and normalization. With the
+staged pipeline, chunks are normalized in worker processes and handed
+back to the single writer, but not written to a database. Files are still
+read on ``PARSE_THREADS`` threads, so workbook-heavy runs gain less.
+``--workers 1`` normalizes in-process; speedup is bounded by the cores
+available.
+
+Usage (from ``python-collector``)::
+
+    python -m benchmarks.bench_parse_workers --files-per-type 8 --rows 200000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+from config import config
+from benchmarks.fixtures import DryRunScraper, sample_ohss_site
+
+
+def run_once(base_url: str, workers: int) -> dict:
+    """Scrape the fixture site once with fresh fetch and layout caches."""
+    with tempfile.TemporaryDirectory(prefix="ohss-bench-") as data_dir:
+        config.DATA_DIR = data_dir
+        config.FETCH_CACHE_PATH = f"{data_dir}/fetch_metadata.json"
+        config.LAYOUT_CACHE_PATH = f"{data_dir}/layouts.json"
+        config.COLUMNAR_CACHE_ENABLED = False
+        config.PARSE_WORKERS = workers
+        config.IMPORT_PIPELINE = "staged"
+        config.OHSS_BASE_URL = base_url
+        config.OHSS_DATA_PATH = "/index.html"
+
+        started = time.perf_counter()
+        result = DryRunScraper().scrape()
+        result["seconds"] = time.perf_counter() - started
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files-per-type", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--xlsx", action="store_true", help="make every other file a workbook")
+    args = parser.parse_args()
+
+    with sample_ohss_site(files_per_type=args.files_per_type, rows=args.rows, xlsx=args.xlsx) as (base_url, paths):
+        print(f"{len(paths)} files, {args.rows} rows each, {os.cpu_count()} CPUs")
+        baseline = None
+        for workers in args.workers:
+            result = run_once(base_url, workers)
+            baseline = baseline or result["seconds"]
+            print(
+                f"  workers={workers:<3} {result['seconds']:7.2f}s  speedup={baseline / result['seconds']:4.2f}x  "
+                f"imported={result['files_imported']} records={result['records_fetched']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
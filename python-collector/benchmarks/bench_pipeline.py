@@ -0,0 +1,109 @@
+"""Compare the serial and staged import pipelines and show where the staged one is bound.
+
+Runs fully offline against a local fixture site with per-request latency.
+Writes are not sent to a database; ``--write-latency`` sleeps per loaded
+chunk to stand in for one. For each mode it prints wall-clock time, and for
+the staged pipeline each stage's throughput, utilization, blocked time and
+peak queue depth. The stage near 100% utilization is the one to scale.
+``--backfill`` also runs the fixture files through ``OHSSBackfill`` in each
+mode and exits non-zero unless every file is checkpointed as done with the
+records it wrote.
+
+Usage (from ``python-collector``)::
+
+    python -m benchmarks.bench_pipeline --latency 0.3 --write-latency 0.05 --rows 100000
+    python -m benchmarks.bench_pipeline --latency 0 --files-per-type 1 --rows 20000 --backfill
+"""
+import argparse
+import sys
+import tempfile
+import time
+from typing import List
+from config import config
+from benchmarks.fixtures import DryRunBackfill, DryRunScraper, sample_ohss_site
+
+
+def run_once(base_url: str, mode: str, write_latency: float) -> dict:
+    """Scrape the fixture site once with fresh caches in the given pipeline mode."""
+    with tempfile.TemporaryDirectory(prefix="ohss-bench-") as data_dir:
+        config.DATA_DIR = data_dir
+        config.FETCH_CACHE_PATH = f"{data_dir}/fetch_metadata.json"
+        config.LAYOUT_CACHE_PATH = f"{data_dir}/layouts.json"
+        config.COLUMNAR_CACHE_ENABLED = False
+        config.IMPORT_PIPELINE = mode
+        config.OHSS_BASE_URL = base_url
+        config.OHSS_DATA_PATH = "/index.html"
+
+        scraper = DryRunScraper()
+        scraper.write_latency = write_latency
+        started = time.perf_counter()
+        result = scraper.scrape()
+        result["seconds"] = time.perf_counter() - started
+        return result
+
+
+def run_backfill(base_url: str, paths: List[str], mode: str) -> List[str]:
+    """Backfill the fixture files once in the given pipeline mode; returns what went wrong, if anything."""
+    with tempfile.TemporaryDirectory(prefix="ohss-bench-") as data_dir:
+        config.DATA_DIR = data_dir
+        config.FETCH_CACHE_PATH = f"{data_dir}/fetch_metadata.json"
+        config.LAYOUT_CACHE_PATH = f"{data_dir}/layouts.json"
+        config.COLUMNAR_CACHE_ENABLED = False
+        config.IMPORT_PIPELINE = mode
+
+        backfill = DryRunBackfill(f"{data_dir}/checkpoints.json")
+        sources = [f"{base_url}/{name}" for name in paths]
+        result = backfill.run([{"source": source, "type": None, "date": None} for source in sources])
+
+        problems = [f"{result['files_failed']} files failed"] if result["files_failed"] else []
+        written = 0
+        for source in sources:
+            checkpoint = backfill.checkpoints.get(source) or {}
+            if checkpoint.get("status") != "done":
+                problems.append(f"{source} checkpointed as {checkpoint.get('status')}")
+            written += checkpoint.get("records_written", 0)
+        if written != result["records_fetched"]:
+            problems.append(f"checkpoints hold {written} records, the run wrote {result['records_fetched']}")
+        return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds of delay per HTTP request")
+    parser.add_argument("--write-latency", type=float, default=0.05, help="seconds of delay per loaded chunk")
+    parser.add_argument("--files-per-type", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=config.CSV_CHUNK_SIZE)
+    parser.add_argument("--queue-size", type=int, default=config.PIPELINE_QUEUE_SIZE)
+    parser.add_argument("--backfill", action="store_true", help="also check backfill checkpoints in both modes")
+    args = parser.parse_args()
+    config.CSV_CHUNK_SIZE = args.chunk_size
+    config.PIPELINE_QUEUE_SIZE = args.queue_size
+
+    with sample_ohss_site(latency=args.latency, files_per_type=args.files_per_type, rows=args.rows, xlsx=False) as (
+        base_url,
+        paths,
+    ):
+        print(f"{len(paths)} files, {args.rows} rows each, {args.latency}s per request, {args.write_latency}s per write")
+        for mode in ["serial", "staged"]:
+            result = run_once(base_url, mode, args.write_latency)
+            print(f"  {mode:<7} {result['seconds']:7.2f}s  records={result['records_fetched']}")
+            for name, stats in result["pipeline"].items():
+                print(
+                    f"    {name:<10} workers={stats['workers']:<2} items={stats['items']:<5} "
+                    f"rows/s={stats['rows_per_second']:<10} utilization={stats['utilization']:6.1%} "
+                    f"blocked={stats['blocked_seconds']:6.2f}s max_queue={stats['max_queue_depth']}"
+                )
+
+        if args.backfill:
+            failed = False
+            for mode in ["serial", "staged"]:
+                problems = run_backfill(base_url, paths, mode)
+                print(f"  backfill {mode:<7} {'ok' if not problems else '; '.join(problems)}")
+                failed = failed or bool(problems)
+            if failed:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
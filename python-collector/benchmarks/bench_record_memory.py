@@ -0,0 +1,100 @@
+"""Measure memory per million normalized rows for each in-memory record representation.
+
+Each representation's retained size is measured with ``tracemalloc``
+(which sees NumPy buffers) plus Arrow's own allocator, then scaled to 1M
+rows. Frames are normalized from the raw chunk inside the measurement;
+record dicts and ORM instances are built from an existing frame and
+share its strings, so their figures are lower bounds:
+
+- ``orm``: model instances added to a session, as a per-row ORM load would hold them
+- ``dicts``: ``ColumnarNormalizer.to_records`` for a whole chunk
+- ``dict-batch``: one ``COPY_BATCH_SIZE`` batch of ``record_batches``, the most
+  the executemany load path holds at once (reported as a total, not per row)
+- ``frame``: the normalized DataFrame
+- ``compact``: the frame after ``FileParser.compact``, as worker processes return it
+- ``arrow``: a ``pyarrow.Table`` of the compacted frame
+
+Usage (from ``python-collector``)::
+
+    python -m benchmarks.bench_record_memory --rows 200000 --data-types arrests detentions removals
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable, Dict
+import pandas as pd
+import pyarrow as pa
+from sqlalchemy.orm import Session
+from config import config
+from benchmarks.synthetic import make_arrests_frame, make_detentions_frame, make_removals_frame
+from database.models import Arrest, Detention, Removal
+from processors.columnar_normalizer import ColumnarNormalizer
+from processors.file_parser import FileParser
+
+BUILDERS = {"arrests": make_arrests_frame, "detentions": make_detentions_frame, "removals": make_removals_frame}
+MODELS = {"arrests": Arrest, "detentions": Detention, "removals": Removal}
+
+
+def retained_bytes(build: Callable) -> int:
+    """Bytes still allocated once ``build()`` returns, while its result is alive."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0] + pa.total_allocated_bytes()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] + pa.total_allocated_bytes() - baseline
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def orm_session(model, frame: pd.DataFrame) -> Session:
+    session = Session()
+    session.add_all(model(**record) for record in ColumnarNormalizer.to_records(frame))
+    return session
+
+
+def representations(data_type: str, raw: pd.DataFrame, frame: pd.DataFrame) -> Dict[str, Callable]:
+    model = MODELS[data_type]
+
+    def normalize():
+        return ColumnarNormalizer.normalize(raw, data_type, {"url": "https://example.test/file.csv"}, "OHSS")[0]
+
+    return {
+        "orm": lambda: orm_session(model, frame),
+        "dicts": lambda: ColumnarNormalizer.to_records(frame),
+        "dict-batch": lambda: next(ColumnarNormalizer.record_batches(frame, config.COPY_BATCH_SIZE)),
+        "frame": normalize,
+        "compact": lambda: FileParser.compact(normalize()),
+        "arrow": lambda: pa.Table.from_pandas(FileParser.compact(normalize()), preserve_index=False),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--data-types", nargs="+", default=list(BUILDERS), choices=list(BUILDERS))
+    parser.add_argument("--skip", nargs="*", default=[], help="representations to leave out (orm is slow)")
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows per data type, COPY_BATCH_SIZE={config.COPY_BATCH_SIZE}")
+    for data_type in args.data_types:
+        raw = BUILDERS[data_type](args.rows)
+        frame, _ = ColumnarNormalizer.normalize(raw, data_type, {"url": "https://example.test/file.csv"}, "OHSS")
+        rows = len(frame)
+        print(f"  {data_type} ({rows} normalized rows)")
+        for name, build in representations(data_type, raw, frame).items():
+            if name in args.skip:
+                continue
+            started = time.perf_counter()
+            size = retained_bytes(build)
+            if name == "dict-batch":
+                measured = f"{size / (1 << 20):8.1f} MiB total"
+            else:
+                measured = f"{size / rows * 1_000_000 / (1 << 20):8.1f} MiB/1M rows ({size / rows:5.0f} B/row)"
+            print(f"    {name:<11}{measured}  [{time.perf_counter() - started:.2f}s]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Measure hypertable disk footprint and query latency before and after the storage policy.
+
+By default, the same synthetic arrests rows are loaded into two scratch
+hypertables. One uses TimescaleDB's default 7-day chunks and no
+compression. The other uses the configured ``CHUNK_INTERVALS`` and has
+chunks older than ``COMPRESS_AFTER`` compressed. The script compares chunk
+count, size and query latency, then drops both tables.
+
+With ``--live`` it measures the real fact tables, applies
+``StoragePolicy``, compresses the chunks the new policy would compress,
+and measures again. Chunk intervals only apply to chunks created after
+that, so the scratch mode is the way to see the interval's effect.
+
+Needs a local TimescaleDB configured through ``TIMESCALE_*``, with the
+schema applied.
+
+Usage (from ``python-collector``)::
+
+    python -m benchmarks.bench_storage_policy --rows 1000000
+    python -m benchmarks.bench_storage_policy --live
+"""
+import argparse
+import time
+from typing import Dict, Optional
+from sqlalchemy import text
+from config import config
+from database.copy_loader import CopyLoader
+from database.models import get_engine, get_session
+from database.storage_policy import COMPRESSION_ORDER_BY, COMPRESSION_SEGMENT_BY, StoragePolicy
+from processors.columnar_normalizer import ColumnarNormalizer
+from benchmarks.synthetic import make_arrests_frame
+
+QUERIES = {
+    "state x month totals": "SELECT date_trunc('month', timestamp), state, SUM(arrest_count) FROM {table} GROUP BY 1, 2",
+    "one state, one year": (
+        "SELECT SUM(arrest_count) FROM {table} "
+        "WHERE state = 'CA' AND timestamp >= '2020-01-01' AND timestamp < '2021-01-01'"
+    ),
+    "latest 100 rows": "SELECT * FROM {table} ORDER BY timestamp DESC LIMIT 100",
+}
+
+
+def footprint(conn, table: str) -> Dict:
+    """Total bytes, chunk count and compressed chunk count of a hypertable."""
+    total = conn.execute(text("SELECT total_bytes FROM hypertable_size(:t)"), {"t": table}).scalar() or 0
+    chunks, compressed = conn.execute(
+        text(
+            "SELECT COUNT(*), COUNT(*) FILTER (WHERE is_compressed) "
+            "FROM timescaledb_information.chunks WHERE hypertable_name = :t"
+        ),
+        {"t": table},
+    ).one()
+    return {"bytes": int(total), "chunks": chunks, "compressed": compressed}
+
+
+def latency(conn, sql: str, repeat: int) -> float:
+    """Best wall-clock milliseconds over ``repeat`` runs, planning included."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(text(sql)).fetchall()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def compress_older_than(conn, table: str, interval: str) -> int:
+    """Compress every chunk the compression policy would, right now."""
+    return len(
+        conn.execute(
+            text(
+                f"SELECT compress_chunk(c, if_not_compressed => true) "
+                f"FROM show_chunks('{table}', older_than => INTERVAL '{interval}') c"
+            )
+        ).fetchall()
+    )
+
+
+def report(label: str, conn, table: str, repeat: int, query_table: Optional[str] = None):
+    """Print a table's footprint and, when ``query_table`` is given, the query latencies against it."""
+    size = footprint(conn, table)
+    print(
+        f"  {label:<8} {size['bytes'] / 2**20:9.1f} MiB  chunks={size['chunks']:<5} "
+        f"compressed={size['compressed']}"
+    )
+    if query_table:
+        for name, sql in QUERIES.items():
+            print(f"           {name:<22} {latency(conn, sql.format(table=query_table), repeat):8.1f} ms")
+
+
+def run_scratch(rows: int, repeat: int):
+    raw = make_arrests_frame(rows)
+    frame, _ = ColumnarNormalizer.normalize(raw, "arrests", {"url": "benchmark"}, data_source="BENCH")
+    interval = config.CHUNK_INTERVALS.get("arrests", "7 days")
+    variants = {"default": ("7 days", None), "policy": (interval, config.COMPRESS_AFTER)}
+
+    print(f"{len(frame)} arrests rows from {frame['timestamp'].min():%Y-%m} to {frame['timestamp'].max():%Y-%m}")
+    engine = get_engine()
+    try:
+        for label, (chunk_interval, compress_after) in variants.items():
+            table = f"bench_arrests_{label}"
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+                conn.execute(text(f"CREATE TABLE {table} (LIKE arrests)"))
+                conn.execute(text(f"ALTER TABLE {table} DROP COLUMN id"))
+                conn.execute(
+                    text(
+                        f"SELECT create_hypertable('{table}', 'timestamp', "
+                        f"chunk_time_interval => INTERVAL '{chunk_interval}')"
+                    )
+                )
+                conn.execute(text(f"CREATE INDEX ON {table} (state, timestamp DESC)"))
+                conn.execute(text(f"CREATE UNIQUE INDEX ON {table} (dedup_key, timestamp)"))
+
+            db = get_session()
+            try:
+                CopyLoader(table, frame.columns).load(db, frame)
+                db.commit()
+            finally:
+                db.close()
+
+            with engine.begin() as conn:
+                if compress_after:
+                    conn.execute(
+                        text(
+                            f"ALTER TABLE {table} SET (timescaledb.compress, "
+                            f"timescaledb.compress_segmentby = '{COMPRESSION_SEGMENT_BY['arrests']}', "
+                            f"timescaledb.compress_orderby = '{COMPRESSION_ORDER_BY}')"
+                        )
+                    )
+                    compress_older_than(conn, table, compress_after)
+                conn.execute(text(f"ANALYZE {table}"))
+                print(f"{label}: {chunk_interval} chunks, compress after {compress_after or 'never'}")
+                report(label, conn, table, repeat, query_table=table)
+    finally:
+        with engine.begin() as conn:
+            for label in variants:
+                conn.execute(text(f"DROP TABLE IF EXISTS bench_arrests_{label}"))
+
+
+def run_live(repeat: int):
+    engine = get_engine()
+    tables = ["arrests", "detentions", "removals", "data_source_health"]
+
+    print("before")
+    with engine.connect() as conn:
+        for table in tables:
+            report(table, conn, table, repeat, query_table="arrests" if table == "arrests" else None)
+
+    settings = StoragePolicy.settings()
+    StoragePolicy.apply(engine, settings)
+    with engine.begin() as conn:
+        if settings["compress_after"]:
+            for table in COMPRESSION_SEGMENT_BY:
+                compress_older_than(conn, table, settings["compress_after"])
+
+    print("after")
+    with engine.connect() as conn:
+        for table in tables:
+            report(table, conn, table, repeat, query_table="arrests" if table == "arrests" else None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="synthetic rows for the scratch comparison")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--live", action="store_true", help="apply the policy to the real tables and compare")
+    args = parser.parse_args()
+
+    if args.live:
+        run_live(args.repeat)
+    else:
+        run_scratch(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Offline fixtures for collector benchmarks: a slow local OHSS site, a database-free scraper and a TCP delay line."""
+import contextlib
+import functools
+import os
+import queue
+import socket
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List, Tuple
+from scrapers.backfill import OHSSBackfill
+from scrapers.ohss_scraper import OHSSScraper
+from benchmarks.synthetic import FRAME_BUILDERS, write_ohss_workbook
+
+
+class DryRunScraper(OHSSScraper):
+    """OHSS scraper that normalizes records without touching the database.
+
+    ``write_latency`` seconds are slept per written frame to stand in for a database round trip.
+    """
+
+    write_latency = 0.0
+
+    def load(self, data_type, frame, rejected=0, unit=None):
+        time.sleep(self.write_latency)
+        return len(frame)
+
+    def _record_health_check(self, result):
+        pass
+
+
+class DryRunBackfill(OHSSBackfill):
+    """Backfill that checkpoints files as usual but normalizes records without touching the database."""
+
+    write_latency = 0.0
+    load = DryRunScraper.load
+    _record_health_check = DryRunScraper._record_health_check
+
+
+class LatencyRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler that sleeps before answering each request."""
+
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def write_sample_site(directory: str, files_per_type: int = 2, rows: int = 1000, xlsx: bool = True) -> List[str]:
+    """Write sample CSV/XLSX tables plus an index page linking to them.
+
+    Returns the relative paths of the generated data files.
+    """
+    paths = []
+    for data_type, builder in FRAME_BUILDERS.items():
+        for i in range(files_per_type):
+            frame = builder(rows, seed=i)
+            extension = "xlsx" if xlsx and i % 2 else "csv"
+            name = f"{data_type}_2024-{i + 1:02d}.{extension}"
+            if extension == "csv":
+                frame.to_csv(os.path.join(directory, name), index=False)
+            else:
+                write_ohss_workbook(frame, os.path.join(directory, name))
+            paths.append(name)
+
+    links = "\n".join(f'<a href="/{name}">{name}</a>' for name in paths)
+    with open(os.path.join(directory, "index.html"), "w", encoding="utf-8") as f:
+        f.write(f"<html><body>{links}</body></html>")
+    return paths
+
+
+@contextlib.contextmanager
+def serve_directory(directory: str, latency: float = 0.0) -> Iterator[str]:
+    """Serve a directory on a random local port, yielding its base URL."""
+    handler = type("Handler", (LatencyRequestHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(handler, directory=directory))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextlib.contextmanager
+def sample_ohss_site(latency: float = 0.0, **kwargs) -> Iterator[Tuple[str, List[str]]]:
+    """Generate a sample site in a temp directory and serve it.
+
+    Yields the base URL and the generated data file names.
+    """
+    with tempfile.TemporaryDirectory(prefix="ohss-site-") as directory:
+        paths = write_sample_site(directory, **kwargs)
+        with serve_directory(directory, latency) as base_url:
+            yield base_url, paths
+
+
+def _delay_line(source: socket.socket, target: socket.socket, delay: float):
+    """Forward bytes one way, delivering each read ``delay`` seconds after it arrived."""
+    pending = queue.Queue()
+
+    def receive():
+        try:
+            while True:
+                data = source.recv(65536)
+                pending.put((time.monotonic() + delay, data))
+                if not data:
+                    return
+        except OSError:
+            pending.put((0.0, b""))
+
+    def send():
+        while True:
+            due, data = pending.get()
+            time.sleep(max(0.0, due - time.monotonic()))
+            try:
+                if not data:
+                    target.shutdown(socket.SHUT_WR)
+                    return
+                target.sendall(data)
+            except OSError:
+                return
+
+    for worker in (receive, send):
+        threading.Thread(target=worker, daemon=True).start()
+
+
+@contextlib.contextmanager
+def latency_proxy(host: str, port: int, latency: float) -> Iterator[int]:
+    """Relay TCP connections to ``host:port`` through a local port, adding ``latency`` seconds per round trip.
+
+    Half the delay is added in each direction without limiting throughput,
+    like a link to a distant database. Yields the local port.
+    """
+    listener = socket.create_server(("127.0.0.1", 0))
+
+    def accept():
+        while True:
+            try:
+                client, _ = listener.accept()
+            except OSError:
+                return
+            upstream = socket.create_connection((host, port))
+            for sock in (client, upstream):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            _delay_line(client, upstream, latency / 2)
+            _delay_line(upstream, client, latency / 2)
+
+    threading.Thread(target=accept, daemon=True).start()
+    try:
+        yield listener.getsockname()[1]
+    finally:
+        listener.close()
@@ -0,0 +1,92 @@
+"""Synthetic OHSS-shaped tables for benchmarks."""
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+STATE_CODES = [
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID", "IL", "IN", "IA", "KS", "KY",
+    "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND",
+    "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY",
+]
+
+
+def _months(rng: np.random.Generator, rows: int) -> np.ndarray:
+    """Random "Month YYYY" period strings, the way OHSS monthly tables label rows."""
+    periods = pd.period_range("2015-01", "2025-12", freq="M").strftime("%B %Y").to_numpy()
+    return rng.choice(periods, rows)
+
+
+def make_arrests_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Raw arrests table as it would come out of ``pd.read_csv``."""
+    rng = np.random.default_rng(seed)
+    criminal = rng.integers(0, 500, rows)
+    non_criminal = rng.integers(0, 500, rows)
+    return pd.DataFrame(
+        {
+            "Month": _months(rng, rows),
+            "State": rng.choice(STATE_CODES, rows),
+            "County": [f"County {i}" for i in rng.integers(0, 250, rows)],
+            "City": [f"City {i}" for i in rng.integers(0, 1000, rows)],
+            "Arrests": criminal + non_criminal,
+            "Criminal": criminal,
+            "Non_Criminal": non_criminal,
+        }
+    )
+
+
+def make_detentions_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Raw detentions table as it would come out of ``pd.read_csv``."""
+    rng = np.random.default_rng(seed)
+    facility = rng.integers(0, 400, rows)
+    capacity = rng.integers(50, 2000, rows)
+    return pd.DataFrame(
+        {
+            "Month": _months(rng, rows),
+            "Facility_Name": [f"Facility {i}" for i in facility],
+            "Facility_ID": [f"F{i:04d}" for i in facility],
+            "State": rng.choice(STATE_CODES, rows),
+            "City": [f"City {i}" for i in rng.integers(0, 1000, rows)],
+            "ADP": (capacity * rng.uniform(0.2, 1.1, rows)).astype(int),
+            "Bed_Capacity": capacity,
+        }
+    )
+
+
+def make_removals_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Raw removals table as it would come out of ``pd.read_csv``."""
+    rng = np.random.default_rng(seed)
+    countries = ["Mexico", "Guatemala", "Honduras", "El Salvador", "Colombia", "Ecuador", "Venezuela"]
+    return pd.DataFrame(
+        {
+            "Month": _months(rng, rows),
+            "State": rng.choice(STATE_CODES, rows),
+            "Removals": rng.integers(0, 1000, rows),
+            "Country": rng.choice(countries, rows),
+            "Removal_Type": rng.choice(["removal", "return"], rows),
+        }
+    )
+
+
+FRAME_BUILDERS = {
+    "arrests": make_arrests_frame,
+    "detentions": make_detentions_frame,
+    "removals": make_removals_frame,
+}
+
+
+def write_ohss_workbook(frame: pd.DataFrame, path: str, sheet_name: str = "Monthly", title_rows: int = 2):
+    """Write a frame as an OHSS-style workbook: title rows, header, data, plus a notes sheet.
+
+    Uses openpyxl's write-only mode so large workbooks can be generated quickly.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    for i in range(title_rows):
+        sheet.append([f"Office of Homeland Security Statistics - table title line {i + 1}"])
+    sheet.append(list(frame.columns))
+    for row in frame.itertuples(index=False):
+        sheet.append([value.item() if hasattr(value, "item") else value for value in row])
+
+    notes = workbook.create_sheet("Notes")
+    notes.append(["Source: synthetic benchmark data"])
+    workbook.save(path)
@@ -23,6 +23,43 @@ class Config:
             f"@{self.TIMESCALE_HOST}:{self.TIMESCALE_PORT}/{self.TIMESCALE_DATABASE}"
         )
 
+    # Connection pool. DB_PRE_PING is "always" (a round trip per checkout), "idle" (only
+    # connections idle longer than DB_PRE_PING_IDLE seconds) or "never"; 0 disables the timeout
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_PRE_PING = os.getenv("DB_PRE_PING", "idle").lower()
+    DB_PRE_PING_IDLE = float(os.getenv("DB_PRE_PING_IDLE", "300"))
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+    # Bulk load settings ("copy" streams via COPY FROM STDIN, "insert" uses executemany)
+    DB_LOAD_METHOD = os.getenv("DB_LOAD_METHOD", "copy").lower()
+    COPY_BATCH_SIZE = int(os.getenv("COPY_BATCH_SIZE", "10000"))
+    CSV_CHUNK_SIZE = int(os.getenv("CSV_CHUNK_SIZE", "50000"))  # rows per streamed chunk, 0 = whole file
+    CONTINUOUS_AGGREGATES_ENABLED = os.getenv("CONTINUOUS_AGGREGATES_ENABLED", "true").lower() == "true"
+    ROLLUPS_ENABLED = os.getenv("ROLLUPS_ENABLED", "true").lower() == "true"
+    DATE_CACHE_SIZE = int(os.getenv("DATE_CACHE_SIZE", "4096"))  # distinct date strings memoized
+
+    # Database writer: "sync" writes each chunk through SQLAlchemy before the load stage moves on;
+    # "async" hands chunks to asyncpg connections (sized like the pool above) and keeps going,
+    # with up to ASYNC_WRITER_MAX_PENDING chunks per file queued ahead of the database (always COPY)
+    DB_WRITER = os.getenv("DB_WRITER", "sync").lower()
+    ASYNC_WRITER_MAX_PENDING = int(os.getenv("ASYNC_WRITER_MAX_PENDING", "4"))
+
+    # Hypertable storage policy: "table=interval" chunk sizes, compression age ("" disables), retention
+    STORAGE_POLICY_ENABLED = os.getenv("STORAGE_POLICY_ENABLED", "true").lower() == "true"
+    CHUNK_INTERVALS = dict(
+        item.strip().split("=", 1)
+        for item in os.getenv(
+            "CHUNK_INTERVALS",
+            "arrests=1 year,removals=1 year,detentions=3 months,data_source_health=1 month",
+        ).split(",")
+        if "=" in item
+    )
+    COMPRESS_AFTER = os.getenv("COMPRESS_AFTER", "6 months")
+    HEALTH_RETENTION = os.getenv("HEALTH_RETENTION", "90 days")
+
     # Scheduler settings
     SCHEDULER_TIMEZONE = os.getenv("SCHEDULER_TIMEZONE", "America/Chicago")
     SCRAPER_ENABLED = os.getenv("SCRAPER_ENABLED", "true").lower() == "true"
@@ -31,13 +68,54 @@ class Config:
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     LOG_DIR = os.getenv("LOG_DIR", "/logs")
 
+    # Prometheus-style metrics endpoint (http://METRICS_HOST:METRICS_PORT/metrics)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_HOST = os.getenv("METRICS_HOST", "0.0.0.0")
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+
+    # Opt-in job profiling, written to LOG_DIR/profiles. PROFILE_JOBS is a
+    # comma-separated list of scheduler job ids (or "all"); "sampling" sees every
+    # thread with overhead capped at PROFILE_MAX_OVERHEAD, "cprofile" only the job thread
+    PROFILE_JOBS = [job.strip() for job in os.getenv("PROFILE_JOBS", "").split(",") if job.strip()]
+    PROFILER = os.getenv("PROFILER", "sampling")
+    PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.01"))
+    PROFILE_MAX_OVERHEAD = float(os.getenv("PROFILE_MAX_OVERHEAD", "0.02"))
+    PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "30"))
+    PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "20"))
+
     # Data storage
     DATA_DIR = os.getenv("DATA_DIR", "/data")
+    FETCH_CACHE_PATH = os.getenv("FETCH_CACHE_PATH", os.path.join(DATA_DIR, "cache", "fetch_metadata.json"))
+    BACKFILL_CHECKPOINT_PATH = os.getenv(
+        "BACKFILL_CHECKPOINT_PATH", os.path.join(DATA_DIR, "cache", "backfill_checkpoints.json")
+    )
+    LAYOUT_CACHE_PATH = os.getenv("LAYOUT_CACHE_PATH", os.path.join(DATA_DIR, "cache", "layouts.json"))
+    COLUMNAR_CACHE_ENABLED = os.getenv("COLUMNAR_CACHE_ENABLED", "true").lower() == "true"
+    COLUMNAR_CACHE_DIR = os.getenv("COLUMNAR_CACHE_DIR", os.path.join(DATA_DIR, "cache", "columnar"))
+    # Downloads are kept by content hash under DATA_DIR/archive; CSVs are stored "none", "gzip" or "zstd"
+    ARCHIVE_COMPRESSION = os.getenv("ARCHIVE_COMPRESSION", "none")
+    DOWNLOAD_BLOCK_SIZE = int(os.getenv("DOWNLOAD_BLOCK_SIZE", str(1 << 20)))
+
+    # Excel parsing ("openpyxl-stream" or "pandas"); EXCEL_SHEETS pins sheet names instead of header matching
+    EXCEL_ENGINE = os.getenv("EXCEL_ENGINE", "openpyxl-stream")
+    EXCEL_SHEETS = [name.strip() for name in os.getenv("EXCEL_SHEETS", "").split(",") if name.strip()]
+    EXCEL_HEADER_SCAN_ROWS = int(os.getenv("EXCEL_HEADER_SCAN_ROWS", "20"))
 
     # Scraper settings
     USER_AGENT = "ICE Activities Tracker (Research/Monitoring Project)"
     REQUEST_TIMEOUT = 30
     MAX_RETRIES = 3
+    DOWNLOAD_WORKERS = int(os.getenv("DOWNLOAD_WORKERS", "4"))
+    DOWNLOAD_PER_HOST_LIMIT = int(os.getenv("DOWNLOAD_PER_HOST_LIMIT", "4"))
+    # >1 normalizes chunks in worker processes. Staged pipeline only: the serial one normalizes in-process
+    # and warns. Reading files (workbooks included) always stays on the PARSE_THREADS threads below
+    PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "1"))
+
+    # Import pipeline: "staged" runs fetch -> parse -> normalize -> load concurrently
+    # with bounded queues between stages; "serial" handles one file at a time
+    IMPORT_PIPELINE = os.getenv("IMPORT_PIPELINE", "staged")
+    PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))
+    PARSE_THREADS = int(os.getenv("PARSE_THREADS", "1"))  # files read concurrently by the parse stage
 
     # OHSS specific settings
     OHSS_BASE_URL = "https://ohss.dhs.gov"
@@ -7,9 +7,21 @@ from .models import (
     CommunityReport,
     NewsArticle,
     DataSourceHealth,
+    StateMonthRollup,
+    FacilityDayRollup,
+    DEDUP_CONFLICT_COLUMNS,
+    get_engine,
     get_session,
     init_db,
 )
+from .rollups import RollupMaintainer
+from .storage_policy import StoragePolicy
+from .aggregates import CONTINUOUS_AGGREGATES, refresh_continuous_aggregates
+from .copy_loader import CopyLoader
+from .pool import UnitOfWork
+from .async_writer import AsyncWriter, AsyncUnitOfWork, get_async_writer, close_async_writer
+from .range_swap import RangeSwap
+from .upsert import upsert_records
 
 __all__ = [
     "Base",
@@ -19,6 +31,22 @@ __all__ = [
     "CommunityReport",
     "NewsArticle",
     "DataSourceHealth",
+    "StateMonthRollup",
+    "FacilityDayRollup",
+    "DEDUP_CONFLICT_COLUMNS",
+    "get_engine",
     "get_session",
     "init_db",
+    "CopyLoader",
+    "RangeSwap",
+    "UnitOfWork",
+    "AsyncWriter",
+    "AsyncUnitOfWork",
+    "get_async_writer",
+    "close_async_writer",
+    "upsert_records",
+    "RollupMaintainer",
+    "StoragePolicy",
+    "CONTINUOUS_AGGREGATES",
+    "refresh_continuous_aggregates",
 ]
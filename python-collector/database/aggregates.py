@@ -0,0 +1,75 @@
+"""Incremental refresh of the TimescaleDB continuous aggregates behind the summary views."""
+import logging
+from datetime import datetime
+from typing import Dict, List, Tuple
+import pandas as pd
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Continuous aggregates built on each fact table (see init-scripts/01-schema.sql)
+CONTINUOUS_AGGREGATES: Dict[str, List[str]] = {
+    "arrests": ["arrests_state_daily", "arrests_by_state_month"],
+    "detentions": ["detentions_facility_daily"],
+}
+
+
+def refresh_window(start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+    """Widen a loaded time range to whole months.
+
+    ``refresh_continuous_aggregate`` only refreshes buckets that lie entirely
+    inside the window, so the window must cover the coarsest (monthly)
+    bucket touched.
+    """
+    window_start = pd.Timestamp(start).to_period("M").to_timestamp()
+    window_end = (pd.Timestamp(end).to_period("M") + 1).to_timestamp()
+    return window_start.to_pydatetime(), window_end.to_pydatetime()
+
+
+def refresh_continuous_aggregates(engine, table: str, start: datetime, end: datetime) -> List[str]:
+    """Re-materialize the aggregates on ``table`` over the months spanning ``start``..``end``.
+
+    ``refresh_continuous_aggregate`` cannot run inside a transaction, so this
+    uses its own autocommit connection. Returns the aggregates refreshed.
+    """
+    names = CONTINUOUS_AGGREGATES.get(table, [])
+    if not names:
+        return []
+
+    window_start, window_end = refresh_window(start, end)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name in names:
+            conn.execute(
+                text("CALL refresh_continuous_aggregate(:name, CAST(:start AS timestamptz), CAST(:end AS timestamptz))"),
+                {"name": name, "start": window_start, "end": window_end},
+            )
+
+    logger.info(f"Refreshed {', '.join(names)} for {window_start:%Y-%m-%d} to {window_end:%Y-%m-%d}")
+    return names
+
+
+class LoadedRanges:
+    """Time range written per fact table since the last aggregate refresh."""
+
+    def __init__(self):
+        self.ranges: Dict[str, Tuple[datetime, datetime]] = {}
+
+    def add(self, table: str, timestamps: pd.Series):
+        """Widen a table's range to cover a batch of written timestamps."""
+        if timestamps.empty:
+            return
+        start, end = timestamps.min(), timestamps.max()
+        if table in self.ranges:
+            start = min(start, self.ranges[table][0])
+            end = max(end, self.ranges[table][1])
+        self.ranges[table] = (start, end)
+
+    def merge(self, other: "LoadedRanges"):
+        """Widen this set's ranges to cover another's."""
+        for table, (start, end) in other.ranges.items():
+            self.add(table, pd.Series([start, end]))
+
+    def pop_all(self) -> Dict[str, Tuple[datetime, datetime]]:
+        """Return and clear the collected ranges."""
+        ranges, self.ranges = self.ranges, {}
+        return ranges
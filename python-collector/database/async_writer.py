@@ -0,0 +1,221 @@
+"""asyncpg writer that upserts each file's chunks in the background while the import carries on."""
+import asyncio
+import io
+import logging
+import threading
+import time
+from concurrent.futures import Future, wait
+from typing import List, Optional
+import asyncpg
+import pandas as pd
+from config import config
+from monitoring.metrics import DB_POOL_WAIT_SECONDS
+from .aggregates import LoadedRanges
+from .copy_loader import CopyLoader
+from .models import DEDUP_CONFLICT_COLUMNS
+from .rollups import ROLLUP_SPECS, RollupMaintainer
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWriter:
+    """An asyncpg pool driven by an event loop on its own thread.
+
+    Import threads hand chunks over with ``AsyncUnitOfWork.submit`` and go
+    straight back to parsing. Each file's chunks run in order on one pooled
+    connection, while different files write over different connections at
+    the same time. Round trips to a distant database then overlap each other
+    and the rest of the pipeline instead of adding up. The pool takes its
+    size, checkout timeout and statement timeout from the same settings as
+    the SQLAlchemy pool; connections idle longer than ``DB_PRE_PING_IDLE``
+    are closed rather than pinged.
+    """
+
+    def __init__(self, dsn: Optional[str] = None):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="db-async-writer", daemon=True)
+        self._thread.start()
+
+        try:
+            self.pool = self.call(self._create_pool(dsn or config.DATABASE_URL))
+        except Exception:
+            self._stop()
+            raise
+
+    @staticmethod
+    async def _create_pool(dsn: str):
+        # Created on the writer's loop, which the pool binds to
+        server_settings = {}
+        if config.DB_STATEMENT_TIMEOUT_MS > 0:
+            server_settings["statement_timeout"] = str(config.DB_STATEMENT_TIMEOUT_MS)
+        return await asyncpg.create_pool(
+            dsn,
+            min_size=1,
+            max_size=config.DB_POOL_SIZE + config.DB_MAX_OVERFLOW,
+            max_inactive_connection_lifetime=config.DB_PRE_PING_IDLE,
+            server_settings=server_settings,
+        )
+
+    def run(self, coro) -> Future:
+        """Schedule a coroutine on the writer's loop from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call(self, coro):
+        """Run a coroutine on the writer's loop and wait for its result."""
+        return self.run(coro).result()
+
+    def unit(self, source: str) -> "AsyncUnitOfWork":
+        """A new per-file unit of work; it checks a connection out on its first chunk."""
+        return AsyncUnitOfWork(self, source)
+
+    def close(self):
+        """Close the pool's connections and stop the loop."""
+        try:
+            self.call(self.pool.close())
+        finally:
+            self._stop()
+
+    def _stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+class AsyncUnitOfWork:
+    """One file's writes through an ``AsyncWriter``, on a connection held until ``close``.
+
+    Has the same interface as ``UnitOfWork`` for the importing thread, plus
+    ``submit``. Each chunk commits on its own in two round trips. The first
+    is a COPY into the connection's staging table. The second is a single
+    script, run as one implicit transaction, that folds the rollup deltas in
+    (``RollupMaintainer.replace_sql``) and moves the staged rows into the
+    fact table. The script starts with a per-table advisory lock so that
+    concurrent files never compute rollup deltas from rows another file is
+    replacing. Once a chunk fails, the ones queued behind it are skipped and
+    the error is raised from the next ``submit`` or from ``close``.
+    ``written`` collects the time ranges of the chunks that committed, so
+    aggregates over them are refreshed only after they are in.
+    """
+
+    def __init__(self, writer: AsyncWriter, source: str):
+        self.writer = writer
+        self.source = source
+        self.waited = 0.0
+        self.written = LoadedRanges()
+        self._futures: List[Future] = []
+        self._slots = threading.BoundedSemaphore(max(1, config.ASYNC_WRITER_MAX_PENDING))
+        self._lock = asyncio.Lock()
+        self._conn = None
+        self._staged = set()
+        self._error: Optional[BaseException] = None
+
+    @property
+    def active(self) -> bool:
+        return bool(self._futures)
+
+    def submit(self, table: str, data_type: str, frame: pd.DataFrame):
+        """Queue a normalized chunk for upsert, waiting only if this file has too many chunks queued.
+
+        The chunk is serialized to CSV here, on the calling thread, so the
+        frame can be freed as soon as this returns.
+        """
+        if self._error:
+            raise self._error
+        loader = CopyLoader(table, frame.columns)
+        data = frame.to_csv(columns=loader.columns, header=False, index=False).encode()
+        span = frame["timestamp"].agg(["min", "max"])
+
+        self._slots.acquire()
+        future = self.writer.run(self._write(loader, data_type, data, span))
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def commit(self):
+        """Nothing to do: every chunk commits as soon as it is written."""
+
+    def rollback(self):
+        """Nothing to do: a failed chunk rolls back on its own."""
+
+    def close(self) -> int:
+        """Wait for the file's chunks, return the connection, and return how many records they wrote.
+
+        Raises the error of the first chunk that failed.
+        """
+        futures, self._futures = self._futures, []
+        wait(futures)
+        self.writer.call(self._release())
+        return sum(future.result() for future in futures)
+
+    async def _write(self, loader: CopyLoader, data_type: str, data: bytes, span: pd.Series) -> int:
+        # Tasks reach the lock in submission order, so a file's chunks are written in order
+        async with self._lock:
+            if self._error:
+                raise RuntimeError(f"Skipped after an earlier chunk failed: {self._error}")
+            try:
+                records = await self._upsert(loader, data_type, data)
+            except BaseException as e:
+                self._error = e
+                raise
+            if records:
+                self.written.add(loader.table, span)
+            return records
+
+    async def _upsert(self, loader: CopyLoader, data_type: str, data: bytes) -> int:
+        conn = await self._connection()
+        staging = loader.staging_table
+        if staging not in self._staged:
+            await conn.execute(
+                f"DROP TABLE IF EXISTS {staging}; "
+                f"CREATE TEMP TABLE {staging} AS SELECT {', '.join(loader.columns)} FROM {loader.table} WITH NO DATA"
+            )
+            self._staged.add(staging)
+        await conn.copy_to_table(staging, source=io.BytesIO(data), columns=loader.columns, format="csv")
+
+        script = [f"SELECT pg_advisory_xact_lock(hashtext('{loader.table}'))"]
+        if config.ROLLUPS_ENABLED and data_type in ROLLUP_SPECS:
+            keys = ", ".join(DEDUP_CONFLICT_COLUMNS)
+            replaced = f"SELECT {loader.table}.* FROM {loader.table} JOIN {staging} USING ({keys})"
+            script.append(RollupMaintainer.replace_sql(data_type, replaced, f"SELECT * FROM {staging}"))
+        # Emptying the staging table in the same statement leaves the upsert's row count as the script's status
+        script.append(
+            f"WITH staged AS (DELETE FROM {staging} RETURNING *) "
+            + loader.upsert_sql(DEDUP_CONFLICT_COLUMNS, source="staged")
+        )
+        status = await conn.execute("; ".join(script))
+        return int(status.split()[-1])
+
+    async def _connection(self):
+        if self._conn is None:
+            started = time.perf_counter()
+            self._conn = await self.writer.pool.acquire(timeout=config.DB_POOL_TIMEOUT)
+            self.waited = time.perf_counter() - started
+            DB_POOL_WAIT_SECONDS.observe(self.waited, source=self.source)
+        return self._conn
+
+    async def _release(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._staged.clear()
+            await self.writer.pool.release(conn)
+
+
+_writer: Optional[AsyncWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_async_writer() -> AsyncWriter:
+    """The shared ``AsyncWriter``, started on first use."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = AsyncWriter()
+        return _writer
+
+
+def close_async_writer():
+    """Shut the shared writer down; the next ``get_async_writer`` starts a new one."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer:
+        writer.close()
@@ -0,0 +1,111 @@
+"""Streaming bulk loader using PostgreSQL COPY ... FROM STDIN."""
+import io
+import logging
+from typing import Iterable, List, Optional, Union
+import pandas as pd
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class CopyLoader:
+    """Stream normalized records into a fact table with ``COPY ... FROM STDIN``.
+
+    Records are serialized into an in-memory CSV buffer one batch at a time,
+    so the buffer never holds more than ``batch_size`` rows regardless of
+    how large the source file is.
+    """
+
+    def __init__(self, table: str, columns: List[str], batch_size: Optional[int] = None):
+        self.table = table
+        self.columns = list(columns)
+        self.batch_size = batch_size or config.COPY_BATCH_SIZE
+
+    @property
+    def staging_table(self) -> str:
+        """Session-local temp table used to stage rows for an upsert."""
+        return f"{self.table}_staging"
+
+    def copy_sql(self, table: Optional[str] = None) -> str:
+        """COPY statement for this column list into ``table`` (the target table by default)."""
+        column_list = ", ".join(self.columns)
+        return f"COPY {table or self.table} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+
+    def upsert_sql(self, conflict_columns: List[str], source: Optional[str] = None) -> str:
+        """Merge the staging table (or ``source``) into the target, rewriting only rows whose values changed."""
+        column_list = ", ".join(self.columns)
+        update_columns = [col for col in self.columns if col not in conflict_columns]
+        assignments = ", ".join(f"{col} = EXCLUDED.{col}" for col in update_columns)
+        current = ", ".join(f"{self.table}.{col}" for col in update_columns)
+        incoming = ", ".join(f"EXCLUDED.{col}" for col in update_columns)
+        return (
+            f"INSERT INTO {self.table} ({column_list}) "
+            f"SELECT {column_list} FROM {source or self.staging_table} "
+            f"ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET {assignments} "
+            f"WHERE ({current}) IS DISTINCT FROM ({incoming})"
+        )
+
+    def load(self, db, frames: Union[pd.DataFrame, Iterable[pd.DataFrame]]) -> int:
+        """COPY one frame, or an iterable of frames, inside the session's transaction.
+
+        The caller owns the transaction and is responsible for committing.
+        """
+        cursor = db.connection().connection.cursor()
+        try:
+            rows_loaded = self._copy_frames(cursor, frames, self.table)
+        finally:
+            cursor.close()
+
+        logger.debug(f"COPY loaded {rows_loaded} rows into {self.table}")
+        return rows_loaded
+
+    def upsert(
+        self,
+        db,
+        frames: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        conflict_columns: List[str],
+    ) -> int:
+        """COPY into a temp staging table, then merge into the target with ``ON CONFLICT``.
+
+        Returns the number of rows actually written (new rows plus rows whose
+        values changed); unchanged rows are left untouched. Conflict keys must
+        be unique across everything passed in one call.
+        """
+        column_list = ", ".join(self.columns)
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.execute(f"DROP TABLE IF EXISTS {self.staging_table}")
+            cursor.execute(
+                f"CREATE TEMP TABLE {self.staging_table} AS "
+                f"SELECT {column_list} FROM {self.table} WITH NO DATA"
+            )
+            rows_staged = self._copy_frames(cursor, frames, self.staging_table)
+            cursor.execute(self.upsert_sql(conflict_columns))
+            rows_written = cursor.rowcount
+            cursor.execute(f"DROP TABLE {self.staging_table}")
+        finally:
+            cursor.close()
+
+        logger.debug(f"Upserted {rows_written} of {rows_staged} staged rows into {self.table}")
+        return rows_written
+
+    def _copy_frames(self, cursor, frames: Union[pd.DataFrame, Iterable[pd.DataFrame]], table: str) -> int:
+        """Stream frames into ``table`` in batches through one reusable buffer."""
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+
+        copy_sql = self.copy_sql(table)
+        buffer = io.StringIO()
+        rows_loaded = 0
+
+        for frame in frames:
+            for start in range(0, len(frame), self.batch_size):
+                batch = frame.iloc[start : start + self.batch_size]
+                buffer.seek(0)
+                buffer.truncate()
+                batch.to_csv(buffer, columns=self.columns, header=False, index=False)
+                buffer.seek(0)
+                cursor.copy_expert(copy_sql, buffer)
+                rows_loaded += len(batch)
+
+        return rows_loaded
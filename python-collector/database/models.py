@@ -3,19 +3,27 @@ from datetime import datetime
 from sqlalchemy import (
     create_engine,
     Column,
+    BigInteger,
     Integer,
     String,
     Text,
     Boolean,
     Numeric,
     DateTime,
+    Index,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from config import config
+from .pool import engine_options, install_pool_events
 
 Base = declarative_base()
 
+# Natural-key unique index used for idempotent upserts into the fact tables.
+# Hypertable unique indexes must include the partitioning column.
+DEDUP_CONFLICT_COLUMNS = ["dedup_key", "timestamp"]
+
 
 class Arrest(Base):
     """Arrest activities table."""
@@ -32,8 +40,11 @@ class Arrest(Base):
     non_criminal_arrests = Column(Integer)
     data_source = Column(String(50))
     source_url = Column(Text)
+    dedup_key = Column(Text)
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
 
+    __table_args__ = (Index("uq_arrests_dedup_key", *DEDUP_CONFLICT_COLUMNS, unique=True),)
+
 
 class Detention(Base):
     """Detention facilities table."""
@@ -51,8 +62,11 @@ class Detention(Base):
     avg_daily_population = Column(Numeric(10, 2))
     facility_type = Column(String(50))
     data_source = Column(String(50))
+    dedup_key = Column(Text)
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
 
+    __table_args__ = (Index("uq_detentions_dedup_key", *DEDUP_CONFLICT_COLUMNS, unique=True),)
+
 
 class Removal(Base):
     """Removals and deportations table."""
@@ -66,8 +80,45 @@ class Removal(Base):
     country_of_citizenship = Column(String(100))
     removal_type = Column(String(50))
     data_source = Column(String(50))
+    dedup_key = Column(Text)
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
 
+    __table_args__ = (Index("uq_removals_dedup_key", *DEDUP_CONFLICT_COLUMNS, unique=True),)
+
+
+class StateMonthRollup(Base):
+    """Arrest and removal totals per state, month and source, maintained by the collector."""
+
+    __tablename__ = "state_month_rollup"
+
+    month = Column(DateTime(timezone=True), primary_key=True)
+    state = Column(String(2), primary_key=True, default="")
+    data_source = Column(String(50), primary_key=True, default="")
+    arrests = Column(BigInteger, nullable=False, default=0)
+    criminal_arrests = Column(BigInteger, nullable=False, default=0)
+    non_criminal_arrests = Column(BigInteger, nullable=False, default=0)
+    arrest_rows = Column(Integer, nullable=False, default=0)
+    removals = Column(BigInteger, nullable=False, default=0)
+    removal_rows = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+
+class FacilityDayRollup(Base):
+    """Detention population and capacity totals per facility and day, maintained by the collector."""
+
+    __tablename__ = "facility_day_rollup"
+
+    day = Column(DateTime(timezone=True), primary_key=True)
+    facility_id = Column(String(50), primary_key=True, default="")
+    facility_name = Column(String(255), primary_key=True, default="")
+    state = Column(String(2), primary_key=True, default="")
+    data_source = Column(String(50), primary_key=True, default="")
+    detained_sum = Column(BigInteger, nullable=False, default=0)
+    detained_rows = Column(Integer, nullable=False, default=0)
+    capacity_sum = Column(BigInteger, nullable=False, default=0)
+    capacity_rows = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+
 
 class CommunityReport(Base):
     """Community-reported ICE activities."""
@@ -118,6 +169,7 @@ class DataSourceHealth(Base):
     status = Column(String(20))
     error_message = Column(Text)
     records_fetched = Column(Integer)
+    stage_breakdown = Column(JSONB)  # seconds per import step and pipeline stage metrics for the run
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
 
 
@@ -129,19 +181,21 @@ SessionLocal = None
 def init_db():
     """Initialize database connection."""
     global engine, SessionLocal
-    engine = create_engine(
-        config.DATABASE_URL,
-        pool_size=5,
-        max_overflow=10,
-        pool_pre_ping=True,
-        echo=False,
-    )
+    engine = create_engine(config.DATABASE_URL, echo=False, **engine_options())
+    install_pool_events(engine)
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     return engine
 
 
-def get_session():
-    """Get a database session."""
+def get_engine():
+    """Get the database engine, initializing it on first use."""
+    if engine is None:
+        init_db()
+    return engine
+
+
+def get_session(bind=None):
+    """Get a database session, optionally bound to an already checked-out connection."""
     if SessionLocal is None:
         init_db()
-    return SessionLocal()
+    return SessionLocal(bind=bind) if bind is not None else SessionLocal()
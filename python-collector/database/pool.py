@@ -0,0 +1,136 @@
+"""Config-driven connection pool settings, pool metrics, and a per-file unit of work."""
+import logging
+import time
+from typing import Dict
+from sqlalchemy import event, exc
+from config import config
+from monitoring.metrics import DB_COMMIT_SECONDS, DB_POOL_CHECKED_OUT, DB_POOL_PINGS_TOTAL, DB_POOL_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+PRE_PING_POLICIES = ("always", "idle", "never")
+
+
+def engine_options() -> Dict:
+    """``create_engine`` keyword arguments for the pool and per-connection settings in ``Config``."""
+    if config.DB_PRE_PING not in PRE_PING_POLICIES:
+        raise ValueError(f"Unknown DB_PRE_PING policy: {config.DB_PRE_PING}")
+
+    options = {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_PRE_PING == "always",
+    }
+    if config.DB_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = {"options": f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def install_pool_events(engine):
+    """Track checked-out connections and, for the ``idle`` pre-ping policy, ping only long-idle ones.
+
+    ``always`` costs a round trip on every checkout; ``idle`` only pings a
+    connection that sat in the pool longer than ``DB_PRE_PING_IDLE``
+    seconds, which is when the server or a proxy may have dropped it.
+    """
+    pool = engine.pool
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.pop("checked_in_at", None)
+        if config.DB_PRE_PING == "idle" and checked_in_at is not None:
+            if time.monotonic() - checked_in_at > config.DB_PRE_PING_IDLE:
+                _ping(dbapi_connection)
+        DB_POOL_CHECKED_OUT.set(pool.checkedout())
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+        # The event fires before the connection is back in the pool, so it still counts as checked out
+        DB_POOL_CHECKED_OUT.set(max(pool.checkedout() - 1, 0))
+
+
+def _ping(dbapi_connection):
+    """Round-trip a stale-looking connection; a dead one makes the pool retry with a fresh connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        dbapi_connection.rollback()
+    except Exception as e:
+        DB_POOL_PINGS_TOTAL.inc(outcome="disconnected")
+        raise exc.DisconnectionError(f"Pooled connection failed its ping: {e}") from e
+    finally:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+    DB_POOL_PINGS_TOTAL.inc(outcome="ok")
+
+
+class UnitOfWork:
+    """One session and pooled connection shared by every write for a file.
+
+    The connection is checked out lazily on first use, with the wait
+    recorded as ``collector_db_pool_wait_seconds``, so a unit that is never
+    written to costs nothing. It then stays checked out until ``close``,
+    so a file pays for one checkout however many chunks it has. Each chunk
+    is still committed on its own: files are upserted idempotently, and
+    short transactions keep files loaded side by side from waiting on each
+    other's locks.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.waited = 0.0
+        self._connection = None
+        self._db = None
+
+    @property
+    def session(self):
+        """The unit's session, checking a connection out of the pool the first time."""
+        if self._db is None:
+            from .models import get_engine, get_session
+
+            started = time.perf_counter()
+            self._connection = get_engine().connect()
+            self.waited = time.perf_counter() - started
+            DB_POOL_WAIT_SECONDS.observe(self.waited, source=self.source)
+            self._db = get_session(bind=self._connection)
+        return self._db
+
+    @property
+    def active(self) -> bool:
+        return self._db is not None
+
+    def commit(self):
+        """Commit what has been written since the last commit; the connection stays checked out."""
+        if self._db is None:
+            return
+        started = time.perf_counter()
+        try:
+            self._db.commit()
+        except Exception:
+            self.rollback()
+            raise
+        DB_COMMIT_SECONDS.observe(time.perf_counter() - started, source=self.source)
+
+    def rollback(self):
+        """Discard what has been written since the last commit."""
+        if self._db is not None:
+            self._db.rollback()
+
+    def close(self) -> int:
+        """Discard anything uncommitted and return the connection to the pool.
+
+        Returns 0: chunks written through the session are counted as they are loaded.
+        """
+        if self._db is None:
+            return 0
+        db, connection, self._db, self._connection = self._db, self._connection, None, None
+        try:
+            db.close()
+        finally:
+            connection.close()
+        return 0
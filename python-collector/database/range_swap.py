@@ -0,0 +1,129 @@
+"""Replace the fact rows of re-normalized files with their rows from a staging table."""
+import logging
+from datetime import datetime
+from typing import Dict, List
+import pandas as pd
+from sqlalchemy import text
+from config import config
+from .copy_loader import CopyLoader
+from .models import DEDUP_CONFLICT_COLUMNS
+from .rollups import RollupMaintainer
+
+logger = logging.getLogger(__name__)
+
+
+class RangeSwap:
+    """Stage re-normalized rows for one fact table, then swap them in for the stored rows of the same files.
+
+    Rows are COPYed into an unlogged ``<table>_reprocess`` table, tagged with
+    the file they came from so a file that fails halfway can be dropped
+    again. ``swap`` then runs in a single short transaction: rollups are
+    adjusted by (new totals - old totals), the staged files' own rows are
+    deleted, and the staged rows are inserted, keeping the last-loaded row
+    per natural key. A file's own rows are the source's stored rows sharing
+    a natural key with a staged row, plus, in tables that record
+    ``source_url``, every row loaded from that file. Readers keep seeing the
+    old rows until the commit and the new ones after it, never a gap or a
+    mix. Rows from files that were not staged (files that failed, or older
+    imports missing from the raw archive) are left as they were, even in
+    months a staged file also covers. Where a fix changes natural keys in a
+    table without ``source_url``, the rows under the old keys stay too.
+    """
+
+    FILE_COLUMN = "reprocess_file"
+    SEQ_COLUMN = "reprocess_seq"
+
+    def __init__(self, table: str, data_type: str, data_source: str):
+        self.table = table
+        self.data_type = data_type
+        self.data_source = data_source
+        self.columns: List[str] = []
+
+    @property
+    def staging_table(self) -> str:
+        return f"{self.table}_reprocess"
+
+    def create(self, db, columns: List[str]):
+        """(Re)create the staging table for the given fact columns."""
+        self.columns = [col for col in columns if col != self.FILE_COLUMN]
+        db.execute(text(f"DROP TABLE IF EXISTS {self.staging_table}"))
+        db.execute(
+            text(
+                f"CREATE UNLOGGED TABLE {self.staging_table} AS "
+                f"SELECT {', '.join(self.columns)} FROM {self.table} WITH NO DATA"
+            )
+        )
+        db.execute(
+            text(
+                f"ALTER TABLE {self.staging_table} "
+                f"ADD COLUMN {self.FILE_COLUMN} text, ADD COLUMN {self.SEQ_COLUMN} bigserial"
+            )
+        )
+
+    def stage(self, db, frame: pd.DataFrame, source_file: str) -> int:
+        """COPY a normalized frame into the staging table, tagged with its source file."""
+        loader = CopyLoader(self.staging_table, [*self.columns, self.FILE_COLUMN])
+        return loader.load(db, frame.assign(**{self.FILE_COLUMN: source_file}))
+
+    def discard(self, db, source_file: str) -> int:
+        """Drop a file's staged rows, so a failed file leaves its months untouched."""
+        result = db.execute(
+            text(f"DELETE FROM {self.staging_table} WHERE {self.FILE_COLUMN} = :file"), {"file": source_file}
+        )
+        return result.rowcount
+
+    def own_rows(self) -> str:
+        """WHERE clause for the stored rows the staged files replace (see the class docstring); binds ``:source``."""
+        keys = ", ".join(DEDUP_CONFLICT_COLUMNS)
+        matches = [f"({keys}) IN (SELECT {keys} FROM {self.staging_table})"]
+        if "source_url" in self.columns:
+            matches.append(f"source_url IN (SELECT {self.FILE_COLUMN} FROM {self.staging_table})")
+        return f"data_source = :source AND ({' OR '.join(matches)})"
+
+    def months(self, db) -> List[datetime]:
+        """Start of every month with staged or replaced rows, in local time like the collector's timestamps."""
+        month = "date_trunc('month', timestamp::timestamp)"
+        result = db.execute(
+            text(
+                f"SELECT {month} FROM {self.staging_table} "
+                f"UNION SELECT {month} FROM {self.table} WHERE {self.own_rows()} ORDER BY 1"
+            ),
+            {"source": self.data_source},
+        )
+        return [row[0] for row in result]
+
+    def swap(self, db) -> Dict:
+        """Replace the staged files' own rows with the staged rows, in the caller's transaction.
+
+        The caller commits. Returns the months touched and the rows deleted
+        and inserted.
+        """
+        months = self.months(db)
+        if not months:
+            return {"months": [], "deleted": 0, "inserted": 0}
+
+        column_list = ", ".join(self.columns)
+        keys = ", ".join(DEDUP_CONFLICT_COLUMNS)
+        params = {"source": self.data_source}
+        own_rows = self.own_rows()
+
+        old_rows = f"SELECT * FROM {self.table} WHERE {own_rows}"
+        new_rows = (
+            f"SELECT DISTINCT ON ({keys}) {column_list} FROM {self.staging_table} "
+            f"ORDER BY {keys}, {self.SEQ_COLUMN} DESC"
+        )
+
+        if config.ROLLUPS_ENABLED:
+            RollupMaintainer.replace(db, self.data_type, old_rows, new_rows, params)
+        deleted = db.execute(text(f"DELETE FROM {self.table} WHERE {own_rows}"), params).rowcount
+        inserted = db.execute(text(f"INSERT INTO {self.table} ({column_list}) {new_rows}")).rowcount
+
+        logger.info(
+            f"Swapped {self.data_source} {self.table} rows for {len(months)} months "
+            f"({months[0]:%Y-%m} to {months[-1]:%Y-%m}): {deleted} deleted, {inserted} inserted"
+        )
+        return {"months": [f"{month:%Y-%m}" for month in months], "deleted": deleted, "inserted": inserted}
+
+    def drop(self, db):
+        """Remove the staging table."""
+        db.execute(text(f"DROP TABLE IF EXISTS {self.staging_table}"))
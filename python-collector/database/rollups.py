@@ -0,0 +1,215 @@
+"""Collector-maintained rollup tables updated with deltas as each batch is loaded."""
+import logging
+from typing import Dict, List
+import pandas as pd
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from .models import FacilityDayRollup, StateMonthRollup
+
+logger = logging.getLogger(__name__)
+
+# Per fact table: the rollup it feeds, the time bucket, the grouping columns,
+# and which measures are summed / counted (non-null) into which rollup columns.
+ROLLUP_SPECS = {
+    "arrests": {
+        "model": StateMonthRollup,
+        "bucket": ("month", "M"),
+        "group": ["state", "data_source"],
+        "sums": {
+            "arrest_count": "arrests",
+            "criminal_arrests": "criminal_arrests",
+            "non_criminal_arrests": "non_criminal_arrests",
+        },
+        "counts": {"arrest_count": "arrest_rows"},
+    },
+    "removals": {
+        "model": StateMonthRollup,
+        "bucket": ("month", "M"),
+        "group": ["state", "data_source"],
+        "sums": {"removal_count": "removals"},
+        "counts": {"removal_count": "removal_rows"},
+    },
+    "detentions": {
+        "model": FacilityDayRollup,
+        "bucket": ("day", "D"),
+        "group": ["facility_id", "facility_name", "state", "data_source"],
+        "sums": {"detained_count": "detained_sum", "capacity": "capacity_sum"},
+        "counts": {"detained_count": "detained_rows", "capacity": "capacity_rows"},
+    },
+}
+
+
+class RollupMaintainer:
+    """Keep rollup tables in step with upserts into the fact tables.
+
+    Before a normalized batch is upserted, the current values of any rows it
+    will replace are read back in the same transaction. Each rollup group
+    then changes by (new values - replaced values), so re-importing a
+    revised file adjusts totals instead of double counting, and re-importing
+    an unchanged file adds nothing. Rollup reads are then O(groups) rather
+    than O(rows).
+    """
+
+    @staticmethod
+    def measures(data_type: str) -> List[str]:
+        """Fact table columns the rollups for a table depend on."""
+        spec = ROLLUP_SPECS[data_type]
+        return list(dict.fromkeys([*spec["sums"], *spec["counts"]]))
+
+    @classmethod
+    def replaced_rows(cls, db, table: str, data_type: str, frame: pd.DataFrame) -> pd.DataFrame:
+        """Current measure values of stored rows sharing a natural key with the batch."""
+        columns = cls.measures(data_type)
+        result = db.execute(
+            text(
+                # Cast back to the naive local timestamps the collector wrote
+                f"SELECT dedup_key, timestamp::timestamp AS timestamp, {', '.join(columns)} FROM {table} "
+                f"WHERE dedup_key = ANY(:keys) AND timestamp BETWEEN :start AND :end"
+            ),
+            {
+                "keys": frame["dedup_key"].tolist(),
+                "start": frame["timestamp"].min().to_pydatetime(),
+                "end": frame["timestamp"].max().to_pydatetime(),
+            },
+        )
+        existing = pd.DataFrame(result.fetchall(), columns=["dedup_key", "timestamp", *columns])
+        existing["timestamp"] = pd.to_datetime(existing["timestamp"]).astype(frame["timestamp"].dtype)
+        return existing
+
+    @staticmethod
+    def deltas(data_type: str, frame: pd.DataFrame, existing: pd.DataFrame) -> pd.DataFrame:
+        """Per-group changes to the rollup columns from replacing ``existing`` rows with ``frame``.
+
+        A replaced row shares its natural key, and therefore its rollup group,
+        with the incoming row, so the two are matched on the key alone.
+        Groups whose totals do not change are dropped.
+        """
+        spec = ROLLUP_SPECS[data_type]
+        bucket, freq = spec["bucket"]
+        measures = RollupMaintainer.measures(data_type)
+
+        merged = frame[["dedup_key", "timestamp", *spec["group"], *measures]].merge(
+            existing, on=["dedup_key", "timestamp"], how="left", suffixes=("", "_old")
+        )
+        changes = pd.DataFrame({bucket: merged["timestamp"].dt.to_period(freq).dt.to_timestamp()})
+        for col in spec["group"]:
+            changes[col] = merged[col].astype(object).where(merged[col].notna(), "")
+        for source, target in spec["sums"].items():
+            new = pd.to_numeric(merged[source]).fillna(0)
+            old = pd.to_numeric(merged[f"{source}_old"]).fillna(0)
+            changes[target] = (new - old).astype("int64")
+        for source, target in spec["counts"].items():
+            changes[target] = merged[source].notna().astype("int64") - merged[f"{source}_old"].notna().astype("int64")
+
+        totals = changes.groupby([bucket, *spec["group"]], sort=False).sum().reset_index()
+        delta_columns = [*spec["sums"].values(), *spec["counts"].values()]
+        return totals[(totals[delta_columns] != 0).any(axis=1)]
+
+    @staticmethod
+    def merge(db, data_type: str, deltas: pd.DataFrame) -> int:
+        """Add per-group deltas into the rollup table, creating missing groups."""
+        if deltas.empty:
+            return 0
+
+        spec = ROLLUP_SPECS[data_type]
+        model = spec["model"]
+        table = model.__table__
+        delta_columns = list(dict.fromkeys([*spec["sums"].values(), *spec["counts"].values()]))
+        records = deltas.astype(object).to_dict("records")
+        for record in records:
+            record[spec["bucket"][0]] = record[spec["bucket"][0]].to_pydatetime()
+
+        stmt = pg_insert(model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[col.name for col in table.primary_key.columns],
+            set_={
+                **{col: table.c[col] + stmt.excluded[col] for col in delta_columns},
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt, records)
+        return len(records)
+
+    @staticmethod
+    def totals_sql(data_type: str, rows_sql: str, sign: str = "") -> str:
+        """SQL for the rollup columns per group over the fact rows selected by ``rows_sql``, negated by ``sign="-"``."""
+        spec = ROLLUP_SPECS[data_type]
+        bucket = spec["bucket"][0]
+        groups = ", ".join(f"COALESCE({col}, '') AS {col}" for col in spec["group"])
+        measures = [f"{sign}COALESCE(SUM({source}), 0) AS {target}" for source, target in spec["sums"].items()]
+        measures += [f"{sign}COUNT({source}) AS {target}" for source, target in spec["counts"].items()]
+        positions = ", ".join(str(i) for i in range(1, len(spec["group"]) + 2))
+        return (
+            f"SELECT date_trunc('{bucket}', timestamp::timestamp) AS {bucket}, {groups}, {', '.join(measures)} "
+            f"FROM ({rows_sql}) AS selected GROUP BY {positions}"
+        )
+
+    @classmethod
+    def group_totals(cls, db, data_type: str, rows_sql: str, params: Dict) -> pd.DataFrame:
+        """Rollup columns per group over the fact rows selected by ``rows_sql``, computed in the database."""
+        result = db.execute(text(cls.totals_sql(data_type, rows_sql)), params)
+        return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+    @classmethod
+    def replace(cls, db, data_type: str, old_rows_sql: str, new_rows_sql: str, params: Dict) -> int:
+        """Fold replacing one set of fact rows with another into the rollup, in the same transaction.
+
+        For bulk swaps, where per-key deltas would mean reading every row
+        back: each group changes by (new totals - old totals). Call before
+        the old rows are deleted. Returns the number of rollup groups touched.
+        """
+        if data_type not in ROLLUP_SPECS:
+            return 0
+        spec = ROLLUP_SPECS[data_type]
+        keys = [spec["bucket"][0], *spec["group"]]
+        old = cls.group_totals(db, data_type, old_rows_sql, params).set_index(keys)
+        new = cls.group_totals(db, data_type, new_rows_sql, params).set_index(keys)
+
+        totals = new.sub(old, fill_value=0).astype("int64").reset_index()
+        delta_columns = [*spec["sums"].values(), *spec["counts"].values()]
+        groups = cls.merge(db, data_type, totals[(totals[delta_columns] != 0).any(axis=1)])
+        logger.debug(f"Updated {groups} {spec['model'].__tablename__} groups for a {data_type} swap")
+        return groups
+
+    @classmethod
+    def replace_sql(cls, data_type: str, old_rows_sql: str, new_rows_sql: str) -> str:
+        """``replace`` as a single statement, for writers that merge server-side instead of reading totals back.
+
+        Rollup columns the data type does not feed start at their default.
+        Groups are written in key order, so concurrent writers lock them in
+        the same order.
+        """
+        spec = ROLLUP_SPECS[data_type]
+        table = spec["model"].__table__
+        keys = ", ".join([spec["bucket"][0], *spec["group"]])
+        delta_columns = list(dict.fromkeys([*spec["sums"].values(), *spec["counts"].values()]))
+        defaults = {
+            col.name: col.default.arg
+            for col in table.columns
+            if col.name not in delta_columns and not col.primary_key and col.default and col.default.is_scalar
+        }
+
+        columns = [keys, *delta_columns, *defaults, "updated_at"]
+        values = [keys, *(f"SUM({col})" for col in delta_columns), *map(repr, defaults.values()), "now()"]
+        changed = " OR ".join(f"SUM({col}) <> 0" for col in delta_columns)
+        updates = [f"{col} = {table.name}.{col} + EXCLUDED.{col}" for col in delta_columns]
+        return (
+            f"INSERT INTO {table.name} ({', '.join(columns)}) SELECT {', '.join(values)} FROM "
+            f"({cls.totals_sql(data_type, new_rows_sql)} UNION ALL {cls.totals_sql(data_type, old_rows_sql, '-')}) "
+            f"AS changes GROUP BY {keys} HAVING {changed} ORDER BY {keys} "
+            f"ON CONFLICT ({', '.join(col.name for col in table.primary_key.columns)}) "
+            f"DO UPDATE SET {', '.join(updates)}, updated_at = now()"
+        )
+
+    @classmethod
+    def apply(cls, db, table: str, data_type: str, frame: pd.DataFrame) -> int:
+        """Fold a batch about to be upserted into its rollup. Call before the upsert, in the same transaction.
+
+        Returns the number of rollup groups touched.
+        """
+        if data_type not in ROLLUP_SPECS or frame.empty:
+            return 0
+        existing = cls.replaced_rows(db, table, data_type, frame)
+        groups = cls.merge(db, data_type, cls.deltas(data_type, frame, existing))
+        logger.debug(f"Updated {groups} {ROLLUP_SPECS[data_type]['model'].__tablename__} groups from {table}")
+        return groups
@@ -0,0 +1,115 @@
+"""Config-driven TimescaleDB chunk intervals, compression and retention policies."""
+import logging
+from typing import Dict, List, Optional
+from sqlalchemy import text
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Columns native compression segments each hypertable by; rows for the same
+# segment value are stored together, so per-state / per-facility scans stay cheap.
+COMPRESSION_SEGMENT_BY = {
+    "arrests": "state",
+    "detentions": "facility_id",
+    "removals": "state",
+}
+
+# Order within a segment. dedup_key completes the unique (dedup_key, timestamp)
+# index, which compression requires, and its per-batch min/max lets upserts and
+# reprocess deletes decompress only the batches that can hold the key.
+COMPRESSION_ORDER_BY = "timestamp DESC, dedup_key"
+
+# Hypertables whose old rows are dropped by a retention policy
+RETENTION_TABLES = {
+    "data_source_health": "HEALTH_RETENTION",
+}
+
+
+class StoragePolicy:
+    """Apply chunk sizing, compression and retention settings from ``Config``.
+
+    OHSS publishes monthly tables, so the default 7-day chunks leave most
+    chunks nearly empty and planning time grows with chunk count. Intervals
+    come from ``CHUNK_INTERVALS`` (applied to chunks created from now on),
+    ``COMPRESS_AFTER`` enables native compression of older fact table chunks
+    segmented by ``COMPRESSION_SEGMENT_BY``, and ``HEALTH_RETENTION`` bounds
+    ``data_source_health``. Re-applying is idempotent: existing policies are
+    replaced, so changing the config and restarting takes effect. Segmenting
+    and ordering are (re)set while a table has no compressed chunks; after
+    that they only change once its chunks are decompressed. Each table's
+    policy is applied in its own transaction, so one table failing does not
+    hold back the others.
+    """
+
+    @staticmethod
+    def settings() -> Dict:
+        """The current policy settings from ``Config``."""
+        return {
+            "chunk_intervals": dict(config.CHUNK_INTERVALS),
+            "compress_after": config.COMPRESS_AFTER,
+            "retention": {table: getattr(config, name) for table, name in RETENTION_TABLES.items()},
+        }
+
+    @staticmethod
+    def statements(settings: Dict) -> Dict[str, List[str]]:
+        """SQL statements per table that bring the database in line with the settings."""
+        statements: Dict[str, List[str]] = {}
+
+        for table, interval in settings["chunk_intervals"].items():
+            statements.setdefault(table, []).append(
+                f"SELECT set_chunk_time_interval('{table}', INTERVAL '{interval}')"
+            )
+
+        for table, segment_by in COMPRESSION_SEGMENT_BY.items():
+            table_statements = statements.setdefault(table, [])
+            table_statements.append(f"SELECT remove_compression_policy('{table}', if_exists => true)")
+            if not settings["compress_after"]:
+                continue
+            # Compression settings cannot be changed once chunks are compressed
+            table_statements.append(
+                f"DO $$ BEGIN "
+                f"IF NOT EXISTS (SELECT 1 FROM timescaledb_information.chunks "
+                f"WHERE hypertable_name = '{table}' AND is_compressed) THEN "
+                f"ALTER TABLE {table} SET (timescaledb.compress, "
+                f"timescaledb.compress_segmentby = '{segment_by}', "
+                f"timescaledb.compress_orderby = '{COMPRESSION_ORDER_BY}'); "
+                f"END IF; END $$"
+            )
+            table_statements.append(
+                f"SELECT add_compression_policy('{table}', INTERVAL '{settings['compress_after']}')"
+            )
+
+        for table, interval in settings["retention"].items():
+            table_statements = statements.setdefault(table, [])
+            table_statements.append(f"SELECT remove_retention_policy('{table}', if_exists => true)")
+            if interval:
+                table_statements.append(f"SELECT add_retention_policy('{table}', INTERVAL '{interval}')")
+
+        return statements
+
+    @classmethod
+    def apply(cls, engine, settings: Optional[Dict] = None) -> int:
+        """Run each table's policy statements in a transaction of its own; returns how many ran.
+
+        A table whose statements fail is logged and left as it was.
+        """
+        settings = settings or cls.settings()
+        applied = 0
+        failed = []
+        for table, statements in cls.statements(settings).items():
+            try:
+                with engine.begin() as conn:
+                    for statement in statements:
+                        logger.debug(statement)
+                        conn.execute(text(statement))
+                applied += len(statements)
+            except Exception as e:
+                logger.warning(f"Could not apply storage policy to {table}: {e}")
+                failed.append(table)
+
+        logger.info(
+            f"Applied storage policy: chunk intervals {settings['chunk_intervals']}, "
+            f"compress after {settings['compress_after'] or 'never'}, retention {settings['retention']}"
+            + (f"; failed for {', '.join(failed)}" if failed else "")
+        )
+        return applied
@@ -0,0 +1,25 @@
+"""Idempotent executemany upserts keyed on a natural-key unique index."""
+from typing import Dict, List
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+
+def upsert_records(db, model, records: List[Dict], conflict_columns: List[str]) -> int:
+    """Insert records, updating existing rows only when their values changed.
+
+    Returns the number of rows written as reported by the driver, falling
+    back to the number of records when the driver cannot tell.
+    """
+    if not records:
+        return 0
+
+    stmt = pg_insert(model)
+    update_columns = [col for col in records[0] if col not in conflict_columns]
+    table = model.__table__
+    stmt = stmt.on_conflict_do_update(
+        index_elements=conflict_columns,
+        set_={col: stmt.excluded[col] for col in update_columns},
+        where=or_(*(table.c[col].is_distinct_from(stmt.excluded[col]) for col in update_columns)),
+    )
+    result = db.execute(stmt, records)
+    return result.rowcount if result.rowcount >= 0 else len(records)
@@ -8,8 +8,12 @@ from apscheduler.triggers.cron import CronTrigger
 import pytz
 
 from config import config
+from database.async_writer import close_async_writer
 from database.models import init_db
+from database.storage_policy import StoragePolicy
+from monitoring import profiled, start_metrics_server
 from scrapers.ohss_scraper import OHSSScraper
+from scrapers.source import DataSource
 
 # Configure logging
 logging.basicConfig(
@@ -24,36 +28,51 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def run_ohss_scraper():
-    """Run the OHSS scraper job."""
+def run_source(source: DataSource):
+    """Run one data source's scrape job and log the outcome."""
+    name = source.SOURCE_NAME
     logger.info("=" * 80)
-    logger.info("Starting OHSS scraper job")
+    logger.info(f"Starting {name} scraper job")
     logger.info("=" * 80)
 
     try:
-        scraper = OHSSScraper()
-        result = scraper.scrape()
+        result = source.scrape()
 
         if result["success"]:
-            logger.info(f"OHSS scraper completed successfully. Records: {result['records_fetched']}")
+            logger.info(
+                f"{name} scraper completed successfully. Records: {result['records_fetched']}, "
+                f"files fetched: {result['files_fetched']}, skipped: {result['files_skipped']}, "
+                f"imported: {result['files_imported']}, failed: {result['files_failed']}"
+            )
+            logger.info(f"{name} time per step: {result['stages']}")
         else:
-            logger.error(f"OHSS scraper failed: {result.get('error')}")
+            logger.error(f"{name} scraper failed: {result.get('error')}")
 
     except Exception as e:
-        logger.error(f"OHSS scraper job failed with exception: {e}", exc_info=True)
+        logger.error(f"{name} scraper job failed with exception: {e}", exc_info=True)
 
     logger.info("=" * 80)
-    logger.info("OHSS scraper job finished")
+    logger.info(f"{name} scraper job finished")
     logger.info("=" * 80)
 
 
+def run_ohss_scraper():
+    """Run the OHSS scraper job."""
+    try:
+        scraper = OHSSScraper()
+    except Exception as e:
+        logger.error(f"OHSS scraper job failed with exception: {e}", exc_info=True)
+        return
+    run_source(scraper)
+
+
 def run_trac_scraper():
-    """Run the TRAC scraper job (placeholder for Phase 2)."""
+    """Run the TRAC scraper job (placeholder for Phase 2; will be a ``DataSource`` run with ``run_source``)."""
     logger.info("TRAC scraper not yet implemented (Phase 2)")
 
 
 def run_deportation_project_scraper():
-    """Run the Deportation Data Project scraper (placeholder for Phase 2)."""
+    """Run the Deportation Data Project scraper (placeholder for Phase 2; will be a ``DataSource``)."""
     logger.info("Deportation Data Project scraper not yet implemented (Phase 2)")
 
 
@@ -63,16 +82,39 @@ def initialize_database():
     try:
         engine = init_db()
         logger.info(f"Database connection established: {config.TIMESCALE_HOST}:{config.TIMESCALE_PORT}")
+        logger.info(
+            f"Connection pool: size {config.DB_POOL_SIZE} + {config.DB_MAX_OVERFLOW} overflow, "
+            f"recycle {config.DB_POOL_RECYCLE}s, pre-ping {config.DB_PRE_PING}, {config.DB_WRITER} writer"
+        )
+        apply_storage_policy(engine)
         return True
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}", exc_info=True)
         return False
 
 
+def apply_storage_policy(engine):
+    """Apply chunk interval, compression and retention settings; failures are not fatal."""
+    if not config.STORAGE_POLICY_ENABLED:
+        return
+    try:
+        StoragePolicy.apply(engine)
+    except Exception as e:
+        logger.warning(f"Could not apply storage policy: {e}")
+
+
+def start_metrics(host: str, port: int):
+    """Serve collector metrics on /metrics; a port clash is logged, not fatal."""
+    try:
+        start_metrics_server(host, port)
+    except OSError as e:
+        logger.warning(f"Could not start metrics server on {host}:{port}: {e}")
+
+
 def run_initial_scrape():
     """Run an initial scrape on startup."""
     logger.info("Running initial data collection on startup...")
-    run_ohss_scraper()
+    profiled("ohss_scraper", run_ohss_scraper)()
 
 
 def main():
@@ -84,6 +126,9 @@ def main():
     logger.info(f"Scraper enabled: {config.SCRAPER_ENABLED}")
     logger.info("=" * 80)
 
+    if config.METRICS_ENABLED:
+        start_metrics(config.METRICS_HOST, config.METRICS_PORT)
+
     # Initialize database
     if not initialize_database():
         logger.error("Failed to initialize database. Exiting.")
@@ -109,7 +154,7 @@ def main():
 
     # Schedule OHSS scraper (daily at 2 AM CST)
     scheduler.add_job(
-        run_ohss_scraper,
+        profiled("ohss_scraper", run_ohss_scraper),
         trigger=CronTrigger.from_crontab(config.OHSS_SCHEDULE, timezone=timezone),
         id="ohss_scraper",
         name="OHSS Data Scraper",
@@ -119,7 +164,7 @@ def main():
 
     # Schedule TRAC scraper (weekly on Monday at 3 AM)
     scheduler.add_job(
-        run_trac_scraper,
+        profiled("trac_scraper", run_trac_scraper),
         trigger=CronTrigger.from_crontab(config.TRAC_SCHEDULE, timezone=timezone),
         id="trac_scraper",
         name="TRAC Data Scraper",
@@ -129,7 +174,7 @@ def main():
 
     # Schedule Deportation Project scraper (monthly on 1st at 4 AM)
     scheduler.add_job(
-        run_deportation_project_scraper,
+        profiled("deportation_project_scraper", run_deportation_project_scraper),
         trigger=CronTrigger.from_crontab(config.DEPORTATION_PROJECT_SCHEDULE, timezone=timezone),
         id="deportation_project_scraper",
         name="Deportation Data Project Scraper",
@@ -158,6 +203,7 @@ def main():
         logger.info("=" * 80)
     except (KeyboardInterrupt, SystemExit):
         logger.info("Scheduler stopped by user")
+        close_async_writer()
         sys.exit(0)
 
 
@@ -0,0 +1,17 @@
+"""Monitoring package: Prometheus-style collector metrics, their HTTP endpoint and job profiling."""
+from .metrics import Counter, Gauge, Histogram, MetricsRegistry, REGISTRY, StepTimings
+from .profiling import CProfileProfiler, SamplingProfiler, profiled
+from .server import start_metrics_server
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "REGISTRY",
+    "StepTimings",
+    "CProfileProfiler",
+    "SamplingProfiler",
+    "profiled",
+    "start_metrics_server",
+]
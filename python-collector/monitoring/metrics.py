@@ -0,0 +1,264 @@
+"""In-process counters, gauges and histograms rendered in the Prometheus text format."""
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds, from a fast chunk to a slow file
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+BYTES_BUCKETS = tuple(2.0**power for power in range(10, 31, 2))  # 1 KiB .. 1 GiB
+ROWS_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+RATE_BUCKETS = (1_000, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base for a named metric family with a fixed set of label names."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """A value that only goes up."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    """A value that is set to the latest observation."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[Tuple, Dict] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            series["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the wall-clock seconds spent in the ``with`` block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return series["count"] if series else 0
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series["counts"]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series['sum'])}")
+            lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """The set of metrics exposed together on one ``/metrics`` endpoint."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Collector metrics, labelled by source (and fact table where it applies)
+SCRAPE_SECONDS = REGISTRY.histogram(
+    "collector_scrape_seconds", "Wall-clock seconds per source run.", ["source", "status"]
+)
+DOWNLOAD_BYTES = REGISTRY.histogram(
+    "collector_download_bytes",
+    "Bytes downloaded per fetched file.",
+    ["source", "data_type"],
+    BYTES_BUCKETS,
+)
+FETCH_SECONDS = REGISTRY.histogram(
+    "collector_fetch_seconds", "Seconds to fetch one file, including cache checks.", ["source", "data_type"]
+)
+PARSE_SECONDS = REGISTRY.histogram(
+    "collector_parse_seconds", "Seconds reading one file into raw chunks.", ["source", "data_type"]
+)
+MAP_SECONDS = REGISTRY.histogram(
+    "collector_normalize_seconds", "Seconds normalizing one chunk onto its fact table.", ["source", "data_type"]
+)
+ROWS_PER_SECOND = REGISTRY.histogram(
+    "collector_rows_per_second",
+    "Rows parsed, normalized and loaded per second, per file.",
+    ["source", "data_type"],
+    RATE_BUCKETS,
+)
+ROWS_REJECTED = REGISTRY.histogram(
+    "collector_rows_rejected",
+    "Rows rejected by normalization, per file.",
+    ["source", "data_type"],
+    ROWS_BUCKETS,
+)
+REJECTIONS_TOTAL = REGISTRY.counter(
+    "collector_rows_rejected_total", "Rows rejected by normalization, by reason.", ["source", "data_type", "reason"]
+)
+DB_WRITE_SECONDS = REGISTRY.histogram(
+    "collector_db_write_seconds",
+    "Seconds per batch upsert, commit excluded; with DB_WRITER=async, seconds to hand the batch over.",
+    ["source", "table"],
+)
+DB_COMMIT_SECONDS = REGISTRY.histogram(
+    "collector_db_commit_seconds", "Seconds committing a loaded chunk.", ["source"]
+)
+DB_POOL_WAIT_SECONDS = REGISTRY.histogram(
+    "collector_db_pool_wait_seconds",
+    "Seconds waiting to check a connection out of the pool.",
+    ["source"],
+    (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CHECKED_OUT = REGISTRY.gauge("collector_db_pool_checked_out", "Connections currently checked out of the pool.")
+DB_POOL_PINGS_TOTAL = REGISTRY.counter(
+    "collector_db_pool_pings_total", "Pre-pings of idle pooled connections, by outcome.", ["outcome"]
+)
+RECORDS_WRITTEN = REGISTRY.counter(
+    "collector_records_written_total", "New or changed records upserted.", ["source", "table"]
+)
+FILES_TOTAL = REGISTRY.counter("collector_files_total", "Files handled, by outcome.", ["source", "outcome"])
+STAGE_UTILIZATION = REGISTRY.gauge(
+    "collector_stage_utilization", "Busy fraction of a pipeline stage's workers in the last run.", ["source", "stage"]
+)
+STAGE_ROWS_PER_SECOND = REGISTRY.gauge(
+    "collector_stage_rows_per_second", "Rows per second through a pipeline stage in the last run.", ["source", "stage"]
+)
+STAGE_MAX_QUEUE_DEPTH = REGISTRY.gauge(
+    "collector_stage_max_queue_depth",
+    "Peak depth of a pipeline stage's input queue in the last run.",
+    ["source", "stage"],
+)
+
+
+class StepTimings:
+    """Per-run totals of seconds spent in each import step, for the health row.
+
+    Safe to update from the pipeline's worker threads.
+    """
+
+    def __init__(self):
+        self._totals: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, step: str, amount: float):
+        with self._lock:
+            self._totals[step] = self._totals.get(step, 0) + amount
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {step: round(total, 3) for step, total in self._totals.items()}
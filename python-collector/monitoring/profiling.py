@@ -0,0 +1,204 @@
+"""Opt-in profiling of scheduled jobs, written to LOG_DIR as an artifact plus a hot-function summary."""
+import cProfile
+import functools
+import glob
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Longest interval the sampler backs off to when sampling gets expensive
+MAX_SAMPLE_INTERVAL = 1.0
+
+
+class SamplingProfiler:
+    """Wall-clock sampler over every thread, from a background thread.
+
+    Every ``interval`` seconds it records each thread's stack (root to
+    leaf, under the thread's name). Unlike cProfile it sees the pipeline's
+    worker threads and adds no per-call cost. Each sample's cost is timed,
+    and the interval doubles whenever sampling would take more than
+    ``max_overhead`` of wall time, so overhead stays capped however deep
+    the stacks or how many threads run.
+    """
+
+    def __init__(self, interval: float = 0.01, max_overhead: float = 0.02):
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self.started_at = 0.0
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started_at
+
+    @property
+    def overhead(self) -> float:
+        """Fraction of wall time spent taking samples."""
+        return self.sampling_seconds / self.elapsed if self.elapsed else 0.0
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            started = time.perf_counter()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(f"thread {names.get(thread_id, thread_id)}")
+                self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+            cost = time.perf_counter() - started
+            self.sampling_seconds += cost
+            if cost > self.interval * self.max_overhead and self.interval < MAX_SAMPLE_INTERVAL:
+                self.interval = min(self.interval * 2, MAX_SAMPLE_INTERVAL)
+
+    def hot_functions(self) -> Tuple[Counter, Counter]:
+        """Samples per function: as the running (leaf) frame, and anywhere on the stack."""
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            if len(stack) > 1:
+                own[stack[-1]] += count
+            for function in set(stack[1:]):
+                total[function] += count
+        return own, total
+
+    def write(self, path: str, top_n: int, title: str) -> str:
+        """Write the stacks in folded format (``a;b;c count``, for flame graph tools) and a summary."""
+        with open(f"{path}.folded", "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+
+        own, total = self.hot_functions()
+        thread_samples = sum(self.stacks.values()) or 1
+        lines = [
+            title,
+            f"{self.samples} samples over {self.elapsed:.1f}s, final interval {self.interval * 1000:.0f}ms, "
+            f"sampling overhead {self.overhead:.2%}",
+            "",
+            f"Top {top_n} by own samples (running on CPU or blocked in that frame):",
+        ]
+        lines += [f"  {count / thread_samples:7.2%}  {name}" for name, count in own.most_common(top_n)]
+        lines += ["", f"Top {top_n} by total samples (frame anywhere on the stack):"]
+        lines += [f"  {count / thread_samples:7.2%}  {name}" for name, count in total.most_common(top_n)]
+        return "\n".join(lines) + "\n"
+
+
+class CProfileProfiler:
+    """Deterministic cProfile of the job's own thread.
+
+    Exact call counts, but per-call overhead that cannot be capped, and
+    work on pipeline or download threads is only seen as time waiting
+    for them.
+    """
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.started_at = 0.0
+        self.elapsed = 0.0
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        self.elapsed = time.perf_counter() - self.started_at
+
+    def write(self, path: str, top_n: int, title: str) -> str:
+        """Dump pstats data (``python -m pstats``, snakeviz) and summarize by own and cumulative time."""
+        self.profile.dump_stats(f"{path}.prof")
+        lines = [title, f"cProfile of the job thread over {self.elapsed:.1f}s", ""]
+        for order, label in (("tottime", "own"), ("cumulative", "cumulative")):
+            stream = io.StringIO()
+            pstats.Stats(self.profile, stream=stream).sort_stats(order).print_stats(top_n)
+            lines += [f"Top {top_n} by {label} time:", stream.getvalue().strip(), ""]
+        return "\n".join(lines)
+
+
+def profiling_enabled(job_id: str) -> bool:
+    """Whether ``PROFILE_JOBS`` selects a job (``all`` selects every job)."""
+    return "all" in config.PROFILE_JOBS or job_id in config.PROFILE_JOBS
+
+
+def _new_profiler():
+    if config.PROFILER == "cprofile":
+        return CProfileProfiler()
+    return SamplingProfiler(config.PROFILE_INTERVAL, config.PROFILE_MAX_OVERHEAD)
+
+
+def _prune(directory: str, job_id: str, keep: int):
+    """Keep only the newest ``keep`` runs' artifacts for a job."""
+    summaries = sorted(glob.glob(os.path.join(directory, f"{glob.escape(job_id)}-*.txt")))
+    for summary in summaries[: max(len(summaries) - keep, 0)]:
+        for path in glob.glob(f"{glob.escape(summary[: -len('.txt')])}.*"):
+            os.remove(path)
+
+
+def write_profile(profiler, job_id: str, started: datetime) -> Dict[str, str]:
+    """Write a finished profiler's artifact and summary under ``LOG_DIR/profiles``."""
+    directory = os.path.join(config.LOG_DIR, "profiles")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{job_id}-{started:%Y%m%dT%H%M%S}")
+    title = f"Profile of job {job_id} started {started.isoformat(timespec='seconds')}"
+
+    summary = profiler.write(path, config.PROFILE_TOP_N, title)
+    with open(f"{path}.txt", "w", encoding="utf-8") as f:
+        f.write(summary)
+    _prune(directory, job_id, config.PROFILE_KEEP)
+    return {"summary": f"{path}.txt", "artifacts": glob.glob(f"{glob.escape(path)}.*")}
+
+
+def profiled(job_id: str, job: Callable) -> Callable:
+    """Wrap a scheduled job so each run is profiled when ``PROFILE_JOBS`` selects it.
+
+    Jobs that are not selected are returned unchanged. A failure to write
+    the profile is logged and never fails the job.
+    """
+    if not profiling_enabled(job_id):
+        return job
+
+    @functools.wraps(job)
+    def run(*args, **kwargs):
+        profiler = _new_profiler()
+        started = datetime.now()
+        profiler.start()
+        try:
+            return job(*args, **kwargs)
+        finally:
+            profiler.stop()
+            try:
+                written = write_profile(profiler, job_id, started)
+                logger.info(f"Wrote {config.PROFILER} profile of {job_id} to {written['summary']}")
+            except Exception as e:
+                logger.warning(f"Could not write profile of {job_id}: {e}")
+
+    logger.info(f"Profiling enabled for job {job_id} ({config.PROFILER})")
+    return run
+
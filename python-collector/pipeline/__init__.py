@@ -0,0 +1,4 @@
+"""Pipeline package for staged, backpressured collector imports."""
+from .staged import Pipeline, Stage, StageError, StageMetrics
+
+__all__ = ["Pipeline", "Stage", "StageError", "StageMetrics"]
@@ -0,0 +1,212 @@
+"""Thread-backed stages joined by bounded queues, with per-stage throughput and queue metrics."""
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class StageError:
+    """An item a stage failed on, passed downstream in place of its output."""
+
+    def __init__(self, stage: str, item, error: Exception):
+        self.stage = stage
+        self.item = item
+        self.error = error
+
+    def __repr__(self):
+        return f"StageError({self.stage!r}, {self.error!r})"
+
+
+class StageMetrics:
+    """Counters for one stage, safe to update from its worker threads."""
+
+    def __init__(self, name: str, workers: int, inbox: queue.Queue):
+        self.name = name
+        self.workers = workers
+        self.inbox = inbox
+        self.items = 0
+        self.emitted = 0
+        self.errors = 0
+        self.rows = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.max_queue_depth = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, busy: float, blocked: float, emitted: int, rows: int, failed: bool):
+        with self._lock:
+            self.items += 1
+            self.emitted += emitted
+            self.rows += rows
+            self.busy_seconds += busy
+            self.blocked_seconds += blocked
+            self.errors += int(failed)
+
+    def observe_queue(self):
+        depth = self.inbox.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def snapshot(self) -> Dict[str, float]:
+        """Current totals plus derived rates.
+
+        Time spent waiting for room in the next stage's queue counts as
+        blocked, not busy, so utilization near 1.0 marks the bottleneck and
+        high blocked time marks a stage held back by a slower one downstream.
+        """
+        with self._lock:
+            end = self.finished_at or time.perf_counter()
+            elapsed = max(end - self.started_at, 1e-9) if self.started_at else 0.0
+            return {
+                "workers": self.workers,
+                "items": self.items,
+                "emitted": self.emitted,
+                "errors": self.errors,
+                "rows": self.rows,
+                "busy_seconds": round(self.busy_seconds, 3),
+                "blocked_seconds": round(self.blocked_seconds, 3),
+                "items_per_second": round(self.items / elapsed, 3) if elapsed else 0.0,
+                "rows_per_second": round(self.rows / elapsed, 1) if elapsed else 0.0,
+                "utilization": round(self.busy_seconds / (elapsed * self.workers), 3) if elapsed else 0.0,
+                "queue_depth": self.inbox.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+            }
+
+
+class Stage:
+    """One step of a pipeline: ``fn(item)`` returns an iterable of output items.
+
+    ``rows`` tells the stage how many rows an output item carries, for the
+    rows/sec metric. A stage with ``handles_errors`` also receives the
+    ``StageError`` items from upstream; otherwise they pass straight through.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[object], Iterable],
+        workers: int = 1,
+        rows: Optional[Callable[[object], int]] = None,
+        handles_errors: bool = False,
+    ):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.rows = rows
+        self.handles_errors = handles_errors
+
+
+class Pipeline:
+    """Run items through stages, each on its own threads, with bounded queues in between.
+
+    A stage blocks when the queue in front of the next one is full, so a slow
+    stage applies backpressure all the way to the source instead of letting
+    work pile up in memory. Exceptions become ``StageError`` items, so one bad
+    item never stops the run. The caller iterates the last stage's output.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 4):
+        self.stages = stages
+        self.queues = [queue.Queue(maxsize=max(1, queue_size)) for _ in range(len(stages) + 1)]
+        self.metrics = {
+            stage.name: StageMetrics(stage.name, stage.workers, inbox) for stage, inbox in zip(stages, self.queues)
+        }
+
+    def run(self, items: Iterable) -> Iterator:
+        """Feed ``items`` in and yield what comes out of the last stage."""
+        threads = [threading.Thread(target=self._feed, args=(items,), name="pipeline-source", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            remaining = [stage.workers]
+            lock = threading.Lock()
+            for worker in range(stage.workers):
+                threads.append(
+                    threading.Thread(
+                        target=self._work,
+                        args=(index, stage, remaining, lock),
+                        name=f"pipeline-{stage.name}-{worker}",
+                        daemon=True,
+                    )
+                )
+
+        for metrics in self.metrics.values():
+            metrics.started_at = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        outbox = self.queues[-1]
+        while True:
+            item = outbox.get()
+            if item is _DONE:
+                break
+            yield item
+
+        for thread in threads:
+            thread.join()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Metrics for every stage, in pipeline order."""
+        return {name: metrics.snapshot() for name, metrics in self.metrics.items()}
+
+    def log_summary(self):
+        """Log one line of metrics per stage."""
+        for name, stats in self.snapshot().items():
+            logger.info(
+                f"Stage {name}: {stats['items']} items, {stats['rows']} rows, "
+                f"{stats['items_per_second']} items/s, {stats['rows_per_second']} rows/s, "
+                f"utilization {stats['utilization']:.0%}, blocked {stats['blocked_seconds']}s, max queue depth {stats['max_queue_depth']}, "
+                f"{stats['errors']} errors"
+            )
+
+    def _feed(self, items: Iterable):
+        try:
+            for item in items:
+                self.queues[0].put(item)
+        except Exception as e:
+            logger.error(f"Pipeline source failed: {e}")
+        finally:
+            self.queues[0].put(_DONE)
+
+    def _work(self, index: int, stage: Stage, remaining: List[int], lock: threading.Lock):
+        inbox, outbox = self.queues[index], self.queues[index + 1]
+        metrics = self.metrics[stage.name]
+
+        while True:
+            metrics.observe_queue()
+            item = inbox.get()
+            if item is _DONE:
+                # Let sibling workers see the end marker too; the last one out closes the next stage
+                inbox.put(_DONE)
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    metrics.finished_at = time.perf_counter()
+                    outbox.put(_DONE)
+                return
+
+            if isinstance(item, StageError) and not stage.handles_errors:
+                outbox.put(item)
+                continue
+
+            started = time.perf_counter()
+            blocked = 0.0
+            emitted = rows = 0
+            failed = False
+            try:
+                for output in stage.fn(item) or ():
+                    waiting = time.perf_counter()
+                    outbox.put(output)
+                    blocked += time.perf_counter() - waiting
+                    emitted += 1
+                    rows += stage.rows(output) if stage.rows else 0
+            except Exception as e:
+                failed = True
+                outbox.put(StageError(stage.name, item, e))
+            metrics.record(time.perf_counter() - started - blocked, blocked, emitted, rows, failed)
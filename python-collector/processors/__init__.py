@@ -1,5 +1,10 @@
 """Processors package for data normalization and transformation."""
 from .csv_processor import CSVProcessor
 from .data_normalizer import DataNormalizer
+from .columnar_normalizer import ColumnarNormalizer
+from .workbook_reader import WorkbookReader
+from .date_parser import DateParser, date_parser
+from .layout_cache import LayoutCache
+from .file_parser import FileParser
 
-__all__ = ["CSVProcessor", "DataNormalizer"]
+__all__ = ["CSVProcessor", "DataNormalizer", "ColumnarNormalizer", "WorkbookReader", "DateParser", "date_parser", "LayoutCache", "FileParser"]
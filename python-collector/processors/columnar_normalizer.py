@@ -0,0 +1,218 @@
+"""Whole-column normalization of scraped tables into fact table records."""
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+import numpy as np
+import pandas as pd
+from .data_normalizer import DataNormalizer, DEDUP_LOCATION_PARTS
+from .date_parser import date_parser
+from .geography import normalize_states
+
+logger = logging.getLogger(__name__)
+
+DATE_COLUMNS = ["date", "month", "year_month", "period"]
+
+# Per-table import specs: candidate source column names for each logical
+# column, the kind/default used to build each database field, and the fields
+# beyond source/date/location that make up a record's natural key.
+TABLE_SPECS = {
+    "arrests": {
+        "col_mappings": {
+            "state": ["state", "state_code", "st"],
+            "county": ["county", "county_name"],
+            "city": ["city", "city_name"],
+            "arrests": ["arrests", "arrest_count", "total_arrests"],
+            "criminal": ["criminal_arrests", "criminal"],
+            "non_criminal": ["non_criminal_arrests", "non_criminal", "civil"],
+            "date": DATE_COLUMNS,
+        },
+        "fields": {
+            "state": ("state", "state"),
+            "county": ("county", "text"),
+            "city": ("city", "text"),
+            "arrest_count": ("arrests", "int"),
+            "criminal_arrests": ("criminal", "int"),
+            "non_criminal_arrests": ("non_criminal", "int"),
+        },
+        "defaults": {},
+        "key_fields": [],
+        "include_source_url": True,
+    },
+    "detentions": {
+        "col_mappings": {
+            "facility": ["facility", "facility_name", "detention_facility"],
+            "facility_id": ["facility_id", "id", "facility_code"],
+            "state": ["state", "state_code", "st"],
+            "city": ["city", "city_name"],
+            "detained": ["detained", "detained_count", "population", "adp"],
+            "capacity": ["capacity", "bed_capacity", "total_capacity"],
+            "date": DATE_COLUMNS,
+        },
+        "fields": {
+            "facility_name": ("facility", "text"),
+            "facility_id": ("facility_id", "text"),
+            "state": ("state", "state"),
+            "city": ("city", "text"),
+            "detained_count": ("detained", "int"),
+            "capacity": ("capacity", "int"),
+        },
+        "defaults": {},
+        "key_fields": ["facility_id", "facility_name"],
+        "include_source_url": False,
+    },
+    "removals": {
+        "col_mappings": {
+            "state": ["state", "state_code", "st"],
+            "removals": ["removals", "removal_count", "deportations"],
+            "country": ["country", "country_of_citizenship", "nationality"],
+            "type": ["removal_type", "type", "category"],
+            "date": DATE_COLUMNS,
+        },
+        "fields": {
+            "state": ("state", "state"),
+            "removal_count": ("removals", "int"),
+            "country_of_citizenship": ("country", "text"),
+            "removal_type": ("type", "text"),
+        },
+        "defaults": {"removal_type": "removal"},
+        "key_fields": ["country_of_citizenship", "removal_type"],
+        "include_source_url": False,
+    },
+}
+
+
+class ColumnarNormalizer:
+    """Normalize whole DataFrames into fact table records without per-row Python loops."""
+
+    @staticmethod
+    def map_columns(actual_cols: List[str], mappings: Dict) -> Dict[str, str]:
+        """Map actual CSV columns to expected column names."""
+        result = {}
+        actual_lookup = {}
+        for col in actual_cols:
+            actual_lookup.setdefault(str(col).lower().strip(), col)
+
+        for key, possible_names in mappings.items():
+            for name in possible_names:
+                if name.lower() in actual_lookup:
+                    result[key] = actual_lookup[name.lower()]
+                    break
+
+        return result
+
+    @staticmethod
+    def expected_columns(data_type: str) -> List[str]:
+        """Every source column name the importer for a table recognizes."""
+        mappings = TABLE_SPECS[data_type]["col_mappings"]
+        return [name for names in mappings.values() for name in names]
+
+    @staticmethod
+    def to_int(series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        """Coerce a column to integers, returning the values and a mask of invalid rows."""
+        if series.dtype == "object":
+            series = series.astype(str).str.replace(",", "", regex=False).str.strip()
+
+        numeric = pd.to_numeric(series, errors="coerce")
+        invalid = numeric.isna() | np.isinf(numeric)
+        values = np.trunc(numeric.where(~invalid)).astype("Int64")
+        return values, invalid
+
+    @staticmethod
+    def to_text(series: pd.Series) -> pd.Series:
+        """Convert a column to strings, keeping missing values as None."""
+        return series.astype(str).where(series.notna(), None)
+
+    @staticmethod
+    def _reject(rejected: pd.Series, invalid: pd.Series, error: str, rejections: Dict[str, int]):
+        """Count rows newly rejected by a check under its error class and fold them into the mask."""
+        newly = invalid & ~rejected
+        if newly.any():
+            rejections[error] = rejections.get(error, 0) + int(newly.sum())
+        rejected |= invalid
+
+    @classmethod
+    def normalize(
+        cls,
+        df: pd.DataFrame,
+        data_type: str,
+        link_info: Dict,
+        data_source: str,
+        column_map: Optional[Dict[str, str]] = None,
+    ) -> Tuple[pd.DataFrame, Dict[str, int]]:
+        """Build a frame of database-ready records for a fact table.
+
+        Rows with a missing or unparseable date, or a value that cannot be
+        coerced into an integer column, are dropped. Each record gets a
+        ``dedup_key`` natural key; when several rows share a key only the
+        last one is kept.
+
+        Returns the normalized frame and the number of rejected rows per
+        error class (``invalid_date``, ``invalid_<field>``), each row counted
+        once under the first check it failed. A precomputed ``column_map``
+        (from the layout cache) skips column name matching.
+        """
+        spec = TABLE_SPECS[data_type]
+        cols = column_map if column_map is not None else cls.map_columns(df.columns, spec["col_mappings"])
+        out = pd.DataFrame(index=df.index)
+        rejected = pd.Series(False, index=df.index)
+        rejections = {}
+
+        if cols.get("date"):
+            out["timestamp"] = date_parser.parse_series(df[cols["date"]])
+        else:
+            link_date = date_parser.parse_value(link_info.get("date"))
+            out["timestamp"] = pd.Series(link_date or pd.NaT, index=df.index, dtype="datetime64[ns]")
+
+        invalid_dates = out["timestamp"].isna()
+        if invalid_dates.any():
+            sample = df.loc[invalid_dates, cols["date"]].head(3).tolist() if cols.get("date") else [link_info.get("date")]
+            logger.warning(f"Rejected {int(invalid_dates.sum())} {data_type} rows with invalid dates (e.g. {sample})")
+        cls._reject(rejected, invalid_dates, "invalid_date", rejections)
+
+        for field, (key, kind) in spec["fields"].items():
+            source_col = cols.get(key)
+            if source_col is None:
+                out[field] = spec["defaults"].get(field)
+                continue
+
+            if kind == "int":
+                values, invalid = cls.to_int(df[source_col])
+                if invalid.any():
+                    sample = df.loc[invalid, source_col].head(3).tolist()
+                    logger.warning(
+                        f"Rejected {int(invalid.sum())} {data_type} rows with invalid {field} values "
+                        f"(e.g. {sample})"
+                    )
+                cls._reject(rejected, invalid, f"invalid_{field}", rejections)
+                out[field] = values
+            elif kind == "state":
+                out[field] = normalize_states(df[source_col])
+            else:
+                out[field] = cls.to_text(df[source_col])
+
+        out["data_source"] = data_source
+        if spec["include_source_url"]:
+            out["source_url"] = link_info.get("url")
+
+        out = out[~rejected]
+        location = out[[part for part in DEDUP_LOCATION_PARTS if part in out.columns]]
+        extra = out[spec["key_fields"]] if spec["key_fields"] else None
+        out = out.assign(dedup_key=DataNormalizer.deduplicate_keys(data_source, out["timestamp"], location, extra))
+
+        duplicated = out.duplicated(subset=["dedup_key", "timestamp"], keep="last")
+        if duplicated.any():
+            logger.info(f"Collapsed {int(duplicated.sum())} {data_type} rows sharing a natural key")
+            out = out[~duplicated]
+
+        return out, rejections
+
+    @staticmethod
+    def to_records(frame: pd.DataFrame) -> List[Dict]:
+        """Convert a normalized frame into plain Python dicts for a bulk insert."""
+        records = frame.astype(object).where(frame.notna(), None)
+        return records.to_dict("records")
+
+    @staticmethod
+    def record_batches(frame: pd.DataFrame, batch_size: int) -> Iterator[List[Dict]]:
+        """``to_records`` one ``batch_size`` slice at a time, so a chunk's row dicts never exist all at once."""
+        for start in range(0, len(frame), batch_size):
+            yield ColumnarNormalizer.to_records(frame.iloc[start : start + batch_size])
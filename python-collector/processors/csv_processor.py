@@ -2,6 +2,7 @@
 import pandas as pd
 from typing import Dict, List, Optional
 import logging
+from .geography import normalize_states
 
 logger = logging.getLogger(__name__)
 
@@ -69,70 +70,5 @@ class CSVProcessor:
 
     @staticmethod
     def standardize_state_codes(series: pd.Series) -> pd.Series:
-        """Standardize state codes to 2-letter uppercase format."""
-        # Map full state names to codes if needed
-        state_map = {
-            "alabama": "AL",
-            "alaska": "AK",
-            "arizona": "AZ",
-            "arkansas": "AR",
-            "california": "CA",
-            "colorado": "CO",
-            "connecticut": "CT",
-            "delaware": "DE",
-            "florida": "FL",
-            "georgia": "GA",
-            "hawaii": "HI",
-            "idaho": "ID",
-            "illinois": "IL",
-            "indiana": "IN",
-            "iowa": "IA",
-            "kansas": "KS",
-            "kentucky": "KY",
-            "louisiana": "LA",
-            "maine": "ME",
-            "maryland": "MD",
-            "massachusetts": "MA",
-            "michigan": "MI",
-            "minnesota": "MN",
-            "mississippi": "MS",
-            "missouri": "MO",
-            "montana": "MT",
-            "nebraska": "NE",
-            "nevada": "NV",
-            "new hampshire": "NH",
-            "new jersey": "NJ",
-            "new mexico": "NM",
-            "new york": "NY",
-            "north carolina": "NC",
-            "north dakota": "ND",
-            "ohio": "OH",
-            "oklahoma": "OK",
-            "oregon": "OR",
-            "pennsylvania": "PA",
-            "rhode island": "RI",
-            "south carolina": "SC",
-            "south dakota": "SD",
-            "tennessee": "TN",
-            "texas": "TX",
-            "utah": "UT",
-            "vermont": "VT",
-            "virginia": "VA",
-            "washington": "WA",
-            "west virginia": "WV",
-            "wisconsin": "WI",
-            "wyoming": "WY",
-        }
-
-        def convert_state(val):
-            if pd.isna(val):
-                return None
-            val_str = str(val).strip().lower()
-            if val_str in state_map:
-                return state_map[val_str]
-            # If already 2 letters, uppercase it
-            if len(val_str) == 2:
-                return val_str.upper()
-            return val_str.upper()[:2]
-
-        return series.apply(convert_state)
+        """Standardize state names, abbreviations and FIPS codes to 2-letter postal codes."""
+        return normalize_states(series)
@@ -1,113 +1,37 @@
 """Data normalization utilities."""
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 import logging
+import pandas as pd
+from .date_parser import date_parser
+from .geography import normalize_state
 
 logger = logging.getLogger(__name__)
 
+DEDUP_LOCATION_PARTS = ["state", "city", "county"]
+
 
 class DataNormalizer:
     """Normalize data from different sources into consistent formats."""
 
     @staticmethod
     def normalize_timestamp(date_value: any, default: Optional[datetime] = None) -> Optional[datetime]:
-        """Normalize various date formats into a datetime object."""
-        if date_value is None:
-            return default or datetime.now()
-
-        if isinstance(date_value, datetime):
-            return date_value
-
-        # Try to parse string dates
-        date_str = str(date_value).strip()
-
-        formats = [
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%d",
-            "%m/%d/%Y",
-            "%d/%m/%Y",
-            "%Y-%m",
-            "%B %Y",
-            "%b %Y",
-            "%Y",
-        ]
-
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt)
-            except ValueError:
-                continue
-
-        logger.warning(f"Could not parse date: {date_value}")
-        return default or datetime.now()
+        """Normalize various date formats into a datetime object.
+
+        Returns ``default`` (None unless given) when the value is missing or
+        cannot be parsed, rather than inventing a timestamp.
+        """
+        parsed = date_parser.parse_value(date_value)
+        if parsed is None:
+            if date_value is not None:
+                logger.warning(f"Could not parse date: {date_value}")
+            return default
+        return parsed
 
     @staticmethod
     def normalize_state_code(state_value: any) -> Optional[str]:
         """Normalize state values to 2-letter codes."""
-        if state_value is None:
-            return None
-
-        state_str = str(state_value).strip().upper()
-
-        # If already 2 characters, return as-is
-        if len(state_str) == 2:
-            return state_str
-
-        # Map common state names
-        state_names = {
-            "ALABAMA": "AL",
-            "ALASKA": "AK",
-            "ARIZONA": "AZ",
-            "ARKANSAS": "AR",
-            "CALIFORNIA": "CA",
-            "COLORADO": "CO",
-            "CONNECTICUT": "CT",
-            "DELAWARE": "DE",
-            "FLORIDA": "FL",
-            "GEORGIA": "GA",
-            "HAWAII": "HI",
-            "IDAHO": "ID",
-            "ILLINOIS": "IL",
-            "INDIANA": "IN",
-            "IOWA": "IA",
-            "KANSAS": "KS",
-            "KENTUCKY": "KY",
-            "LOUISIANA": "LA",
-            "MAINE": "ME",
-            "MARYLAND": "MD",
-            "MASSACHUSETTS": "MA",
-            "MICHIGAN": "MI",
-            "MINNESOTA": "MN",
-            "MISSISSIPPI": "MS",
-            "MISSOURI": "MO",
-            "MONTANA": "MT",
-            "NEBRASKA": "NE",
-            "NEVADA": "NV",
-            "NEW HAMPSHIRE": "NH",
-            "NEW JERSEY": "NJ",
-            "NEW MEXICO": "NM",
-            "NEW YORK": "NY",
-            "NORTH CAROLINA": "NC",
-            "NORTH DAKOTA": "ND",
-            "OHIO": "OH",
-            "OKLAHOMA": "OK",
-            "OREGON": "OR",
-            "PENNSYLVANIA": "PA",
-            "RHODE ISLAND": "RI",
-            "SOUTH CAROLINA": "SC",
-            "SOUTH DAKOTA": "SD",
-            "TENNESSEE": "TN",
-            "TEXAS": "TX",
-            "UTAH": "UT",
-            "VERMONT": "VT",
-            "VIRGINIA": "VA",
-            "WASHINGTON": "WA",
-            "WEST VIRGINIA": "WV",
-            "WISCONSIN": "WI",
-            "WYOMING": "WY",
-        }
-
-        return state_names.get(state_str, state_str[:2] if state_str else None)
+        return normalize_state(state_value)
 
     @staticmethod
     def clean_numeric(value: any, default: int = 0) -> int:
@@ -126,12 +50,38 @@ class DataNormalizer:
             return default
 
     @staticmethod
-    def deduplicate_key(source: str, timestamp: datetime, location: dict) -> str:
+    def deduplicate_key(source: str, timestamp: datetime, location: dict, extra: Optional[List] = None) -> str:
         """Generate a deduplication key for a record."""
-        # Create a hash key from source, timestamp, and location
-        location_str = f"{location.get('state', '')}_{location.get('city', '')}_{location.get('county', '')}"
+        # Create a hash key from source, timestamp, location and any table-specific parts
+        location_str = "_".join(str(location.get(part) or "") for part in DEDUP_LOCATION_PARTS)
         timestamp_str = timestamp.strftime("%Y-%m-%d") if isinstance(timestamp, datetime) else str(timestamp)
-        return f"{source}_{timestamp_str}_{location_str}".lower().replace(" ", "_")
+        key = f"{source}_{timestamp_str}_{location_str}"
+        if extra:
+            key += "_" + "_".join(str(part) if part is not None else "" for part in extra)
+        return key.lower().replace(" ", "_")
+
+    @staticmethod
+    def deduplicate_keys(
+        source: str,
+        timestamps: pd.Series,
+        location: pd.DataFrame,
+        extra: Optional[pd.DataFrame] = None,
+    ) -> pd.Series:
+        """Vectorized ``deduplicate_key`` over whole columns.
+
+        ``location`` may hold any of the state/city/county columns; missing
+        columns and null values contribute empty parts, exactly as in the
+        scalar version.
+        """
+        parts = [timestamps.dt.strftime("%Y-%m-%d")]
+        for part in DEDUP_LOCATION_PARTS:
+            parts.append(location[part] if part in location.columns else pd.Series(None, index=timestamps.index))
+        if extra is not None:
+            parts.extend(extra[col] for col in extra.columns)
+
+        parts = [part.astype(object).where(part.notna(), "").astype(str) for part in parts]
+        key = pd.Series(source, index=timestamps.index).str.cat(parts, sep="_")
+        return key.str.lower().str.replace(" ", "_", regex=False)
 
     @staticmethod
     def validate_latitude(lat: any) -> Optional[float]:
@@ -0,0 +1,129 @@
+"""Shared date parsing engine with per-column format detection and a bounded memo cache."""
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from config import config
+
+logger = logging.getLogger(__name__)
+
+DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+    "%Y-%m",
+    "%B %Y",
+    "%b %Y",
+    "%Y",
+]
+
+
+class DateParser:
+    """Parse date columns once per distinct value instead of once per row.
+
+    A column's format is detected from a sample of its distinct values and
+    applied to all of them in one vectorized ``pd.to_datetime`` call; values
+    that do not match fall through the remaining formats the same way,
+    except the detected format with day and month swapped, so a column is
+    never read both ways. Parsed values are memoized per format in a
+    bounded LRU cache, since monthly tables repeat the same few hundred
+    period strings across files. Values that match no format come back as
+    ``NaT`` for the caller to count and reject.
+    """
+
+    def __init__(self, formats: Optional[List[str]] = None, cache_size: Optional[int] = None, sample_size: int = 100):
+        self.formats = formats or DATE_FORMATS
+        self.cache_size = cache_size if cache_size is not None else config.DATE_CACHE_SIZE
+        self.sample_size = sample_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def detect_format(self, values: Sequence[str]) -> Optional[str]:
+        """The format that parses the most values in a sample, or None if none parse."""
+        sample = pd.Series(list(values)[: self.sample_size], dtype="object")
+        best_format, best_hits = None, 0
+        for fmt in self.formats:
+            hits = int(pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum())
+            if hits > best_hits:
+                best_format, best_hits = fmt, hits
+                if hits == len(sample):
+                    break
+        return best_format
+
+    def parse_series(self, series: pd.Series) -> pd.Series:
+        """Parse a column into naive ``datetime64[ns]``; missing or unparseable values become ``NaT``."""
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series.dt.tz_localize(None) if series.dt.tz is not None else series
+
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        if len(uniques) == 0:
+            return pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+
+        keys = [str(value).strip() for value in uniques]
+        parsed = self._parse_distinct(keys, self.detect_format(keys))
+        values = np.where(codes >= 0, parsed[np.maximum(codes, 0)], np.datetime64("NaT", "ns"))
+        return pd.Series(values, index=series.index, dtype="datetime64[ns]")
+
+    def parse_value(self, value) -> Optional[datetime]:
+        """Parse a single value, returning None if it is missing or unparseable."""
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            return None
+        if isinstance(value, datetime):
+            return value
+        parsed = self._parse_distinct([str(value).strip()], None)[0]
+        return None if np.isnat(parsed) else pd.Timestamp(parsed).to_pydatetime()
+
+    def fallback_formats(self, detected: Optional[str]) -> List[str]:
+        """Formats to try, in order, for a column detected as ``detected`` (every format when None).
+
+        The detected format with day and month swapped is left out, so
+        ``13/02/2024`` is rejected in a ``%m/%d/%Y`` column instead of being
+        read as 13 February next to values read month first.
+        """
+        if not detected:
+            return list(self.formats)
+        swapped = detected.replace("%m", "\0").replace("%d", "%m").replace("\0", "%d")
+        return [detected] + [fmt for fmt in self.formats if fmt not in (detected, swapped)]
+
+    def _parse_distinct(self, keys: List[str], detected: Optional[str]) -> np.ndarray:
+        """Parse distinct strings of a column detected as ``detected``, consulting and filling the memo cache.
+
+        Entries are keyed by (detected format, value): the same string can
+        mean different dates in columns of different formats.
+        """
+        results = np.full(len(keys), np.datetime64("NaT", "ns"), dtype="datetime64[ns]")
+        misses = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                if (detected, key) in self._cache:
+                    self._cache.move_to_end((detected, key))
+                    results[i] = self._cache[(detected, key)]
+                else:
+                    misses.append(i)
+
+        if not misses:
+            return results
+
+        pending = pd.Series([keys[i] for i in misses], index=misses, dtype="object")
+        for fmt in self.fallback_formats(detected):
+            if pending.empty:
+                break
+            attempt = pd.to_datetime(pending, format=fmt, errors="coerce")
+            matched = attempt.notna()
+            results[attempt.index[matched]] = attempt[matched].to_numpy()
+            pending = pending[~matched]
+
+        with self._lock:
+            for i in misses:
+                self._cache[(detected, keys[i])] = results[i]
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return results
+
+
+date_parser = DateParser()
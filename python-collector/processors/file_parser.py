@@ -0,0 +1,118 @@
+"""Read downloaded data files and normalize them into load-ready frames, in or out of process."""
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, Optional
+import pandas as pd
+from config import config
+from storage.raw_archive import data_extension, open_raw
+from .columnar_normalizer import ColumnarNormalizer
+from .layout_cache import LayoutCache
+from .workbook_reader import WorkbookReader
+
+logger = logging.getLogger(__name__)
+
+# Settings a worker process needs from its parent, which may have overridden the environment defaults
+WORKER_SETTINGS = [
+    "CSV_CHUNK_SIZE",
+    "LAYOUT_CACHE_PATH",
+    "COLUMNAR_CACHE_ENABLED",
+    "COLUMNAR_CACHE_DIR",
+    "EXCEL_ENGINE",
+    "EXCEL_SHEETS",
+    "EXCEL_HEADER_SCAN_ROWS",
+]
+
+
+class FileParser:
+    """Turn a downloaded CSV or workbook into normalized fact table frames.
+
+    This is the CPU-bound half of an import (parsing, column mapping,
+    normalization, dedup keys) with no database access, so it can run in
+    the scraper thread or in a worker process (see ``worker_pool``).
+    """
+
+    def __init__(self, layout_cache: Optional[LayoutCache] = None, workbook_reader: Optional[WorkbookReader] = None):
+        self.layout_cache = layout_cache or LayoutCache(config.LAYOUT_CACHE_PATH)
+        self.workbook_reader = workbook_reader or WorkbookReader()
+
+    def read_chunks(self, filepath: str, data_type: str, digest: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """Read a data file as a sequence of DataFrames tagged with their layout's column map.
+
+        CSVs are streamed in ``CSV_CHUNK_SIZE`` row chunks (0 reads the whole
+        file at once); workbooks go through the configured ``WorkbookReader``.
+        Known CSV layouts are read with only the mapped columns and their
+        planned dtypes, under this file's spelling of the headers. Files may
+        be compressed raw archive copies.
+        """
+        if data_extension(filepath) == ".csv":
+            with open_raw(filepath) as source:
+                header = pd.read_csv(source, nrows=0).columns
+            fingerprint = LayoutCache.fingerprint(header)
+            plan = self.layout_cache.lookup(fingerprint, data_type)
+            if plan:
+                plan = LayoutCache.resolve(plan, header)
+                for frame in self.read_csv(filepath, usecols=plan["usecols"], dtype=plan["dtypes"]):
+                    frame.attrs["column_map"] = plan["column_map"]
+                    yield frame
+                return
+            frames = self.read_csv(filepath)
+        else:
+            expected = ColumnarNormalizer.expected_columns(data_type)
+            frames = self.workbook_reader.read(filepath, expected, digest)
+
+        for frame in frames:
+            sheet_name = frame.attrs.get("sheet_name", "")
+            plan = self.layout_cache.plan_for(frame, data_type, sheet_name)
+            frame.attrs["column_map"] = plan["column_map"]
+            yield frame
+
+    @staticmethod
+    def read_csv(filepath: str, **kwargs) -> Iterator[pd.DataFrame]:
+        """Stream a CSV in ``CSV_CHUNK_SIZE`` row chunks, or whole when it is 0.
+
+        The file is memory-mapped (or decompressed as a stream), so the
+        parser reads straight from the page cache without a buffered copy.
+        """
+        with open_raw(filepath) as source:
+            if config.CSV_CHUNK_SIZE > 0:
+                yield from pd.read_csv(source, chunksize=config.CSV_CHUNK_SIZE, **kwargs)
+            else:
+                yield pd.read_csv(source, **kwargs)
+
+    @staticmethod
+    def compact(frame: pd.DataFrame) -> pd.DataFrame:
+        """Store text columns compactly so normalized batches are cheap to hold and to ship between processes.
+
+        Repetitive columns become categoricals. Other all-string columns
+        (``dedup_key``) become Arrow-backed strings: one contiguous buffer
+        rather than a Python object per value, roughly halving a batch.
+        """
+        compacted = {}
+        for col in frame.select_dtypes(include=["object"]).columns:
+            if frame[col].nunique(dropna=True) <= len(frame) // 2:
+                compacted[col] = frame[col].astype("category")
+            elif pd.api.types.infer_dtype(frame[col], skipna=True) == "string":
+                compacted[col] = frame[col].astype("string[pyarrow]")
+        return frame.assign(**compacted) if compacted else frame
+
+
+def worker_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool for normalizing chunks with the parent's parser settings.
+
+    Workers are spawned rather than forked because the pool is started while
+    download threads are running.
+    """
+    settings = {name: getattr(config, name) for name in WORKER_SETTINGS}
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(settings,),
+    )
+
+
+def _init_worker(settings: Dict):
+    """Apply the parent's parser settings in a fresh worker process."""
+    for name, value in settings.items():
+        setattr(config, name, value)
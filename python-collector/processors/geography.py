@@ -0,0 +1,127 @@
+"""Precomputed state/territory lookup shared by every state normalization call site."""
+import logging
+from typing import Dict, Optional
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# (postal code, name, FIPS code, other spellings seen in source tables)
+STATES = [
+    ("AL", "Alabama", "01", ["Ala"]),
+    ("AK", "Alaska", "02", []),
+    ("AZ", "Arizona", "04", ["Ariz"]),
+    ("AR", "Arkansas", "05", ["Ark"]),
+    ("CA", "California", "06", ["Calif", "Cal"]),
+    ("CO", "Colorado", "08", ["Colo"]),
+    ("CT", "Connecticut", "09", ["Conn"]),
+    ("DE", "Delaware", "10", ["Del"]),
+    ("DC", "District of Columbia", "11", ["Washington DC", "Washington D.C.", "D.C.", "Dist of Columbia"]),
+    ("FL", "Florida", "12", ["Fla"]),
+    ("GA", "Georgia", "13", []),
+    ("HI", "Hawaii", "15", []),
+    ("ID", "Idaho", "16", []),
+    ("IL", "Illinois", "17", ["Ill"]),
+    ("IN", "Indiana", "18", ["Ind"]),
+    ("IA", "Iowa", "19", []),
+    ("KS", "Kansas", "20", ["Kan", "Kans"]),
+    ("KY", "Kentucky", "21", []),
+    ("LA", "Louisiana", "22", []),
+    ("ME", "Maine", "23", []),
+    ("MD", "Maryland", "24", []),
+    ("MA", "Massachusetts", "25", ["Mass"]),
+    ("MI", "Michigan", "26", ["Mich"]),
+    ("MN", "Minnesota", "27", ["Minn"]),
+    ("MS", "Mississippi", "28", ["Miss"]),
+    ("MO", "Missouri", "29", []),
+    ("MT", "Montana", "30", ["Mont"]),
+    ("NE", "Nebraska", "31", ["Neb", "Nebr"]),
+    ("NV", "Nevada", "32", ["Nev"]),
+    ("NH", "New Hampshire", "33", []),
+    ("NJ", "New Jersey", "34", []),
+    ("NM", "New Mexico", "35", []),
+    ("NY", "New York", "36", []),
+    ("NC", "North Carolina", "37", []),
+    ("ND", "North Dakota", "38", []),
+    ("OH", "Ohio", "39", []),
+    ("OK", "Oklahoma", "40", ["Okla"]),
+    ("OR", "Oregon", "41", ["Ore", "Oreg"]),
+    ("PA", "Pennsylvania", "42", ["Penn", "Penna"]),
+    ("RI", "Rhode Island", "44", []),
+    ("SC", "South Carolina", "45", []),
+    ("SD", "South Dakota", "46", []),
+    ("TN", "Tennessee", "47", ["Tenn"]),
+    ("TX", "Texas", "48", ["Tex"]),
+    ("UT", "Utah", "49", []),
+    ("VT", "Vermont", "50", []),
+    ("VA", "Virginia", "51", []),
+    ("WA", "Washington", "53", ["Wash"]),
+    ("WV", "West Virginia", "54", ["W.Va.", "W Va"]),
+    ("WI", "Wisconsin", "55", ["Wis", "Wisc"]),
+    ("WY", "Wyoming", "56", ["Wyo"]),
+    # Territories
+    ("AS", "American Samoa", "60", []),
+    ("GU", "Guam", "66", []),
+    ("MP", "Northern Mariana Islands", "69", ["Northern Marianas", "CNMI"]),
+    ("PR", "Puerto Rico", "72", []),
+    ("VI", "U.S. Virgin Islands", "78", ["Virgin Islands", "US Virgin Islands", "USVI"]),
+    # Military mail codes
+    ("AA", "Armed Forces Americas", None, []),
+    ("AE", "Armed Forces Europe", None, []),
+    ("AP", "Armed Forces Pacific", None, []),
+]
+
+
+def _token(value: str) -> str:
+    """Canonical lookup token: uppercase, no periods, single spaces."""
+    return " ".join(str(value).upper().replace(".", " ").split())
+
+
+def _build_lookup() -> Dict[str, str]:
+    """Map every known spelling, code and FIPS code to its postal code."""
+    lookup = {}
+    for code, name, fips, aliases in STATES:
+        for spelling in [code, name, *aliases]:
+            lookup[_token(spelling)] = code
+            lookup[_token(spelling).replace(" ", "")] = code
+        if fips:
+            lookup[fips] = code
+            lookup[fips.lstrip("0")] = code
+    return lookup
+
+
+STATE_LOOKUP = _build_lookup()
+
+
+def normalize_states(series: pd.Series) -> pd.Series:
+    """Map a whole column of state values to postal codes.
+
+    Each distinct value is normalized once and looked up in ``STATE_LOOKUP``,
+    then codes are broadcast back to the rows, so cost scales with the number
+    of distinct values rather than rows. Missing or unrecognized values
+    become None.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    if len(uniques) == 0:
+        return pd.Series(None, index=series.index, dtype="object")
+
+    tokens = pd.Series(uniques).astype(str).str.upper().str.replace(".", " ", regex=False)
+    tokens = tokens.str.split().str.join(" ")
+    # Numeric FIPS codes may arrive as 6, "06" or 6.0
+    tokens = tokens.str.replace(r"^0*(\d+)(\.0+)?$", r"\1", regex=True)
+    mapped = tokens.map(STATE_LOOKUP)
+    mapped = mapped.fillna(tokens.str.replace(" ", "", regex=False).map(STATE_LOOKUP))
+
+    unknown = mapped.isna()
+    if unknown.any():
+        logger.debug(f"Unrecognized state values: {list(pd.Series(uniques)[unknown].head(5))}")
+
+    mapped = mapped.astype(object).where(mapped.notna(), None).to_numpy()
+    values = pd.Series(mapped.take(codes.clip(min=0)), index=series.index, dtype="object")
+    return values.where(codes >= 0, None)
+
+
+def normalize_state(value: any) -> Optional[str]:
+    """Map a single state value to its postal code, or None if unrecognized."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return normalize_states(pd.Series([value], dtype="object")).iloc[0]
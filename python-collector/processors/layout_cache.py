@@ -0,0 +1,99 @@
+"""Persisted column mappings and dtype plans for recurring table layouts."""
+import hashlib
+import logging
+from typing import Dict, Iterable, Optional
+import pandas as pd
+from storage.json_store import JsonStore
+from .columnar_normalizer import ColumnarNormalizer, TABLE_SPECS
+from .csv_processor import CSVProcessor
+
+logger = logging.getLogger(__name__)
+
+# Semantic column types that are low-cardinality enough to read as categoricals
+CATEGORICAL_TYPES = {"datetime", "geography", "categorical"}
+
+
+class LayoutCache:
+    """Remember how each table layout maps onto a fact table.
+
+    OHSS republishes the same layouts month after month. A layout is
+    fingerprinted by its normalized header set and sheet name; the first
+    time one is seen, column mapping and type detection run on a sample and
+    the resulting plan is persisted. Later files with the same layout skip
+    inference and are read straight into typed columns with only the needed
+    columns (``usecols``/``dtype``). As headers only have to match once
+    normalized, a stored plan is ``resolve``-d against each file's own
+    header spelling before use.
+    """
+
+    def __init__(self, path: str):
+        self.store = JsonStore(path)
+
+    @staticmethod
+    def normalize_header(column) -> str:
+        """A header name as layouts compare it: case and surrounding whitespace ignored."""
+        return str(column).lower().strip()
+
+    @classmethod
+    def fingerprint(cls, columns: Iterable, sheet_name: str = "") -> str:
+        """Stable hash of a layout's normalized header set and sheet name."""
+        headers = sorted({cls.normalize_header(col) for col in columns})
+        payload = "\x1f".join([sheet_name.lower().strip(), *headers])
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, fingerprint: str, data_type: str) -> Optional[Dict]:
+        """The stored plan for a layout and fact table, if any."""
+        return (self.store.get(fingerprint) or {}).get(data_type)
+
+    @classmethod
+    def resolve(cls, plan: Dict, columns: Iterable) -> Dict:
+        """A plan with its column names translated to the spelling in ``columns``, a header of the same layout.
+
+        A plan learned from ``State,Month`` then reads a file headed ``STATE, MONTH``.
+        """
+        actual = {}
+        for col in columns:
+            actual.setdefault(cls.normalize_header(col), col)
+
+        def rename(col):
+            return actual.get(cls.normalize_header(col), col)
+
+        return {
+            "column_map": {key: rename(col) for key, col in plan["column_map"].items()},
+            "column_types": {rename(col): kind for col, kind in plan["column_types"].items()},
+            "usecols": [rename(col) for col in plan["usecols"]],
+            "dtypes": {rename(col): dtype for col, dtype in plan["dtypes"].items()},
+        }
+
+    def learn(self, fingerprint: str, data_type: str, sample: pd.DataFrame) -> Dict:
+        """Infer and persist a plan from a sample of a new layout."""
+        spec = TABLE_SPECS[data_type]
+        column_map = ColumnarNormalizer.map_columns(sample.columns, spec["col_mappings"])
+        int_columns = {column_map[key] for key, kind in spec["fields"].values() if kind == "int" and key in column_map}
+
+        column_types = {}
+        dtypes = {}
+        for col in dict.fromkeys(column_map.values()):
+            column_types[col] = CSVProcessor.detect_column_type(sample, col)
+            if col not in int_columns and column_types[col] in CATEGORICAL_TYPES:
+                dtypes[col] = "category"
+
+        plan = {
+            "column_map": column_map,
+            "column_types": column_types,
+            "usecols": list(column_types),
+            "dtypes": dtypes,
+        }
+        entry = dict(self.store.get(fingerprint) or {})
+        entry[data_type] = plan
+        self.store.set(fingerprint, entry)
+        logger.info(f"Learned new {data_type} layout {fingerprint[:12]}: {column_map}")
+        return plan
+
+    def plan_for(self, frame: pd.DataFrame, data_type: str, sheet_name: str = "") -> Dict:
+        """Plan for a frame's layout, learning it from the frame if unseen."""
+        fingerprint = self.fingerprint(frame.columns, sheet_name)
+        plan = self.lookup(fingerprint, data_type)
+        if plan:
+            return self.resolve(plan, frame.columns)
+        return self.learn(fingerprint, data_type, frame)
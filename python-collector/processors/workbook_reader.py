@@ -0,0 +1,205 @@
+"""Pluggable Excel workbook readers with header detection and a columnar cache."""
+import hashlib
+import itertools
+import logging
+import os
+import shutil
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import pandas as pd
+from openpyxl import load_workbook
+from config import config
+from storage.raw_archive import open_raw
+
+logger = logging.getLogger(__name__)
+
+CACHE_COMPLETE_MARKER = "_SUCCESS"
+
+
+class WorkbookReader:
+    """Read the relevant sheets of an OHSS workbook as a sequence of DataFrames.
+
+    Engines:
+
+    - ``openpyxl-stream``: read-only openpyxl row iteration, yielding
+      ``chunk_size`` row frames so large sheets never sit in memory whole.
+    - ``pandas``: ``pd.read_excel`` on each selected sheet.
+
+    Only sheets whose detected header row matches the expected column names
+    are read (or the sheets named in ``EXCEL_SHEETS``). When a content digest
+    is supplied, each parsed sheet is also written once to Parquet so later
+    reads of the same file skip Excel parsing entirely.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        sheets: Optional[List[str]] = None,
+    ):
+        self.engine = engine or config.EXCEL_ENGINE
+        if self.engine not in self.ENGINES:
+            raise ValueError(f"Unknown Excel engine: {self.engine}")
+        self.chunk_size = chunk_size if chunk_size is not None else config.CSV_CHUNK_SIZE
+        self.cache_dir = cache_dir if cache_dir is not None else (
+            config.COLUMNAR_CACHE_DIR if config.COLUMNAR_CACHE_ENABLED else None
+        )
+        self.sheets = sheets if sheets is not None else config.EXCEL_SHEETS
+
+    def read(
+        self,
+        filepath: str,
+        expected_columns: Iterable[str],
+        digest: Optional[str] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Yield DataFrames for every relevant sheet in the workbook."""
+        expected = {name.lower().strip() for name in expected_columns}
+
+        cache_path = self._cache_path(digest, expected)
+        if cache_path and os.path.exists(os.path.join(cache_path, CACHE_COMPLETE_MARKER)):
+            logger.info(f"Reading {os.path.basename(filepath)} from columnar cache")
+            yield from self._read_cache(cache_path)
+            return
+
+        frames = self._read_excel(filepath, expected)
+        if cache_path:
+            frames = self._write_through_cache(frames, cache_path)
+        yield from frames
+
+    def _read_excel(self, filepath: str, expected: set) -> Iterator[pd.DataFrame]:
+        """Parse the workbook with the configured engine (``.xls`` always uses pandas)."""
+        if filepath.lower().endswith(".xls"):
+            return self._read_pandas(filepath, expected)
+        return self.ENGINES[self.engine](self, filepath, expected)
+
+    @staticmethod
+    def detect_header(rows: List[Tuple], expected: set) -> int:
+        """Index of the row that looks most like a header, 0 if none match."""
+        best_index, best_score = 0, 0
+        for index, row in enumerate(rows):
+            score = sum(1 for value in row if isinstance(value, str) and value.lower().strip() in expected)
+            if score > best_score:
+                best_index, best_score = index, score
+        return best_index
+
+    def _wanted_sheet(self, name: str, preview: List[Tuple], expected: set) -> bool:
+        """Whether a sheet should be imported, by configured name or by header match."""
+        if self.sheets:
+            return name in self.sheets
+        header = preview[self.detect_header(preview, expected)] if preview else ()
+        return any(isinstance(value, str) and value.lower().strip() in expected for value in header)
+
+    @staticmethod
+    def _header_names(row: Tuple) -> List[str]:
+        """Unique column names from a header row, filling blanks with positional names."""
+        names = []
+        seen = {}
+        for i, value in enumerate(row):
+            name = str(value).strip() if value is not None else f"column_{i}"
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            names.append(name)
+        return names
+
+    def _read_openpyxl_stream(self, filepath: str, expected: set) -> Iterator[pd.DataFrame]:
+        """Stream rows from read-only worksheets in ``chunk_size`` frames, reading the memory-mapped file."""
+        with open_raw(filepath) as source:
+            yield from self._read_worksheets(load_workbook(source, read_only=True, data_only=True), filepath, expected)
+
+    def _read_worksheets(self, workbook, filepath: str, expected: set) -> Iterator[pd.DataFrame]:
+        """Frames from each wanted sheet of an open read-only workbook, which is closed at the end."""
+        try:
+            selected = 0
+            for worksheet in workbook.worksheets:
+                rows = worksheet.iter_rows(values_only=True)
+                preview = [row for _, row in zip(range(config.EXCEL_HEADER_SCAN_ROWS), rows)]
+                if not self._wanted_sheet(worksheet.title, preview, expected):
+                    logger.debug(f"Skipping sheet {worksheet.title!r}")
+                    continue
+                selected += 1
+
+                header_index = self.detect_header(preview, expected)
+                columns = self._header_names(preview[header_index])
+                body = iter(preview[header_index + 1 :])
+                for frame in self._row_frames(itertools.chain(body, rows), columns):
+                    frame.attrs["sheet_name"] = worksheet.title
+                    yield frame
+
+            if not selected:
+                logger.warning(f"No sheet in {os.path.basename(filepath)} matched the expected columns")
+        finally:
+            workbook.close()
+
+    def _row_frames(self, rows: Iterator[Tuple], columns: List[str]) -> Iterator[pd.DataFrame]:
+        """Group row tuples into DataFrames of at most ``chunk_size`` rows."""
+        width = len(columns)
+        batch = []
+        for row in rows:
+            if row is None or all(value is None for value in row):
+                continue
+            batch.append(tuple(row[:width]) + (None,) * (width - len(row)))
+            if self.chunk_size > 0 and len(batch) >= self.chunk_size:
+                yield pd.DataFrame.from_records(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=columns)
+
+    def _read_pandas(self, filepath: str, expected: set) -> Iterator[pd.DataFrame]:
+        """Read each wanted sheet whole with ``pd.read_excel``."""
+        previews = pd.read_excel(filepath, sheet_name=None, header=None, nrows=config.EXCEL_HEADER_SCAN_ROWS)
+        for name, preview in previews.items():
+            rows = [tuple(None if pd.isna(v) else v for v in row) for row in preview.itertuples(index=False)]
+            if not self._wanted_sheet(name, rows, expected):
+                continue
+            header_index = self.detect_header(rows, expected)
+            frame = pd.read_excel(filepath, sheet_name=name, header=header_index).dropna(how="all")
+            frame.attrs["sheet_name"] = name
+            yield frame
+
+    def _cache_path(self, digest: Optional[str], expected: set) -> Optional[str]:
+        """Cache directory for a workbook's content and the column set it was read for."""
+        if not self.cache_dir or not digest:
+            return None
+        names = self.sheets or sorted(expected)
+        layout = hashlib.sha1("\n".join(names).encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.cache_dir, digest, layout)
+
+    @staticmethod
+    def _read_cache(cache_path: str) -> Iterator[pd.DataFrame]:
+        """Yield cached parts in the order they were written."""
+        for name in sorted(os.listdir(cache_path)):
+            if name.endswith(".parquet"):
+                yield pd.read_parquet(os.path.join(cache_path, name))
+
+    @staticmethod
+    def _arrow_safe(frame: pd.DataFrame) -> pd.DataFrame:
+        """Stringify mixed-type object columns so they can be stored in Parquet."""
+        frame = frame.copy()
+        frame.columns = [str(col) for col in frame.columns]
+        for col in frame.select_dtypes(include=["object"]).columns:
+            frame[col] = frame[col].where(frame[col].isna(), frame[col].astype(str))
+        return frame
+
+    def _write_through_cache(self, frames: Iterator[pd.DataFrame], cache_path: str) -> Iterator[pd.DataFrame]:
+        """Yield frames while saving each as a Parquet part; mark the cache complete at the end."""
+        shutil.rmtree(cache_path, ignore_errors=True)
+        os.makedirs(cache_path, exist_ok=True)
+        try:
+            for index, frame in enumerate(frames):
+                frame = self._arrow_safe(frame)
+                frame.to_parquet(os.path.join(cache_path, f"part-{index:05d}.parquet"), index=False)
+                yield frame
+        except Exception:
+            shutil.rmtree(cache_path, ignore_errors=True)
+            raise
+
+        open(os.path.join(cache_path, CACHE_COMPLETE_MARKER), "w").close()
+
+    ENGINES: Dict[str, Callable] = {
+        "openpyxl-stream": _read_openpyxl_stream,
+        "pandas": _read_pandas,
+    }
+
@@ -0,0 +1,55 @@
+"""Command-line entry point for re-importing archived OHSS files after a mapping or normalizer change.
+
+Usage::
+
+    python reprocess.py [--types arrests removals] [--parse-workers 4] [--dry-run]
+
+Every file in the raw archive (``DATA_DIR/archive``) is parsed and
+normalized again, and its new rows are swapped into the fact tables in
+place of its old ones; see ``OHSSReprocess``. ``--dry-run`` stops after
+staging and reports which months would change.
+"""
+import argparse
+import json
+import logging
+import sys
+
+from config import config
+from database.models import init_db
+from scrapers.reprocess import OHSSReprocess
+
+logging.basicConfig(
+    level=getattr(logging, config.LOG_LEVEL),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-import archived OHSS files and swap their rows into the fact tables")
+    parser.add_argument("--types", nargs="+", choices=sorted(OHSSReprocess.MODELS), help="only these data types")
+    parser.add_argument("--parse-threads", type=int, default=config.PARSE_THREADS)
+    parser.add_argument("--parse-workers", type=int, default=config.PARSE_WORKERS)
+    parser.add_argument("--dry-run", action="store_true", help="stage and report the months that would change, but swap nothing")
+    args = parser.parse_args()
+    if args.parse_workers > 1 and config.IMPORT_PIPELINE != "staged":
+        parser.error("--parse-workers needs IMPORT_PIPELINE=staged")
+
+    config.PARSE_THREADS = args.parse_threads
+    config.PARSE_WORKERS = args.parse_workers
+
+    init_db()
+    reprocess = OHSSReprocess()
+    if not reprocess.archived_links(args.types):
+        logger.error("The raw archive has no OHSS files to reprocess")
+        sys.exit(1)
+
+    result = reprocess.run(args.types, dry_run=args.dry_run)
+    print(json.dumps(result, indent=2, default=str))
+    sys.exit(1 if result["files_failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
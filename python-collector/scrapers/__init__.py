@@ -1,4 +1,7 @@
 """Scrapers package for collecting ICE data from various sources."""
+from .source import DataSource
 from .ohss_scraper import OHSSScraper
+from .backfill import OHSSBackfill
+from .reprocess import OHSSReprocess
 
-__all__ = ["OHSSScraper"]
+__all__ = ["DataSource", "OHSSScraper", "OHSSBackfill", "OHSSReprocess"]
@@ -0,0 +1,218 @@
+"""Resumable bulk import of archived OHSS files from a manifest of paths and URLs."""
+import glob
+import hashlib
+import logging
+import os
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+from config import config
+from storage.json_store import JsonStore
+from .ohss_scraper import OHSSScraper
+
+logger = logging.getLogger(__name__)
+
+DATA_EXTENSIONS = (".csv", ".xlsx", ".xls")
+
+# Checkpoint statuses that mean a file needs no further work
+COMPLETE_STATUSES = {"done", "unchanged", "not_modified"}
+
+
+def is_url(source: str) -> bool:
+    """Whether a manifest entry is a remote URL rather than a local path."""
+    return source.startswith(("http://", "https://"))
+
+
+def file_sha256(filepath: str, block_size: int = 1 << 20) -> str:
+    """Hex SHA-256 of a file, read in blocks so large archives are never loaded whole."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BackfillCheckpoints:
+    """Per-file backfill progress: content hash, rows and records loaded, and status.
+
+    Every update is persisted atomically, so an interrupted backfill knows
+    exactly which files were fully loaded.
+    """
+
+    def __init__(self, path: str):
+        self.store = JsonStore(path)
+
+    def get(self, source: str) -> Optional[Dict]:
+        """The last checkpoint recorded for a manifest entry."""
+        return self.store.get(source)
+
+    def is_complete(self, source: str, sha256: Optional[str] = None) -> bool:
+        """Whether an entry was fully handled, and (when a hash is given) still has the same content."""
+        entry = self.get(source) or {}
+        if entry.get("status") not in COMPLETE_STATUSES:
+            return False
+        return sha256 is None or entry.get("sha256") == sha256
+
+    def record(
+        self,
+        source: str,
+        status: str,
+        sha256: Optional[str] = None,
+        rows_loaded: int = 0,
+        records_written: int = 0,
+        error: Optional[str] = None,
+    ):
+        """Store the outcome for a manifest entry."""
+        self.store.set(
+            source,
+            {
+                "status": status,
+                "sha256": sha256,
+                "rows_loaded": rows_loaded,
+                "records_written": records_written,
+                "error": error,
+                "updated_at": datetime.now().isoformat(),
+            },
+        )
+
+
+class OHSSBackfill(OHSSScraper):
+    """Load a list of archived OHSS files through the regular import pipeline.
+
+    Manifest entries are local files, directories, globs or URLs. They go
+    through the same import pipeline as a scrape (``IMPORT_PIPELINE``), with
+    ``DOWNLOAD_WORKERS`` fetching and ``PARSE_WORKERS`` normalizing. Each
+    file's outcome is checkpointed; on a re-run, files already loaded are
+    skipped (local files only if their hash is unchanged) and failed or
+    unfinished files are retried.
+    """
+
+    def __init__(self, checkpoint_path: Optional[str] = None):
+        super().__init__()
+        self.checkpoints = BackfillCheckpoints(checkpoint_path or config.BACKFILL_CHECKPOINT_PATH)
+
+    @staticmethod
+    def read_manifest(path: str) -> List[Dict[str, Optional[str]]]:
+        """Parse a manifest file into entries.
+
+        Each non-blank line not starting with ``#`` is
+        ``source[<TAB>data_type[<TAB>date]]``. Directories expand to the data
+        files inside them and globs to their matches; type and date are
+        inferred from the file name when omitted.
+        """
+        entries = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                source, data_type, date = (line.split("\t") + [None, None])[:3]
+                for expanded in OHSSBackfill._expand_source(source.strip()):
+                    entries.append({"source": expanded, "type": data_type, "date": date})
+        return entries
+
+    @staticmethod
+    def _expand_source(source: str) -> List[str]:
+        """A URL or file as is, a directory's data files, or a glob's matches, in sorted order."""
+        if is_url(source):
+            return [source]
+        if os.path.isdir(source):
+            return sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(source)
+                for name in names
+                if name.lower().endswith(DATA_EXTENSIONS)
+            )
+        if glob.has_magic(source):
+            return sorted(glob.glob(source))
+        return [source]
+
+    def links_for(self, entries: List[Dict[str, Optional[str]]]) -> List[Dict[str, str]]:
+        """Turn manifest entries into the link dicts the import pipeline expects."""
+        links = []
+        for entry in entries:
+            source = entry["source"]
+            name = os.path.basename(source)
+            links.append(
+                {
+                    "url": source,
+                    "text": name,
+                    "type": entry.get("type") or self._classify_data_type(name, source),
+                    "date": entry.get("date") or self._extract_date(name),
+                }
+            )
+        return links
+
+    def run(self, entries: List[Dict[str, Optional[str]]]) -> Dict[str, any]:
+        """Import every manifest entry not already checkpointed as complete."""
+        links = self.links_for(entries)
+        logger.info(f"Starting OHSS backfill of {len(links)} files")
+        self.rejections = Counter()
+        self.file_stats = {"skipped": 0, "fetched": 0, "imported": 0, "resumed": 0, "failed": 0}
+        self.pipeline_stats = {}
+
+        total_records = self._import_links(links)
+
+        result = {
+            "records_fetched": total_records,
+            "records_rejected": sum(self.rejections.values()),
+            "rejections": dict(self.rejections),
+        }
+        for key, count in self.file_stats.items():
+            result[f"files_{key}"] = count
+        result["pipeline"] = self.pipeline_stats
+        logger.info(
+            f"OHSS backfill completed. Records: {total_records}, imported: {self.file_stats['imported']}, "
+            f"already done: {self.file_stats['resumed']}, skipped: {self.file_stats['skipped']}, "
+            f"failed: {self.file_stats['failed']}"
+        )
+        return result
+
+    def fetch(self, link_info: Dict[str, str]) -> Dict:
+        """Hash a local file or download a URL, short-circuiting entries already checkpointed."""
+        source = link_info["url"]
+        if is_url(source):
+            if self.checkpoints.is_complete(source):
+                return {"status": "checkpointed"}
+            return super().fetch(link_info)
+
+        digest = file_sha256(source)
+        if self.checkpoints.is_complete(source, digest):
+            return {"status": "checkpointed"}
+        return {
+            "status": "fetched",
+            "digest": digest,
+            "headers": {},
+            "content_length": os.path.getsize(source),
+            "filepath": source,
+        }
+
+    def _needs_import(self, link_info: Dict[str, str], download: Dict) -> bool:
+        """Skip checkpointed entries and checkpoint entries the scraper decides to skip."""
+        if download["status"] == "checkpointed":
+            logger.info(f"Already loaded by an earlier backfill, skipping: {link_info['url']}")
+            self._count("resumed")
+            return False
+
+        if super()._needs_import(link_info, download):
+            return True
+
+        status = download["status"] if download["status"] in COMPLETE_STATUSES else "skipped"
+        self.checkpoints.record(link_info["url"], status, sha256=download.get("digest"))
+        return False
+
+    def _finish_import(self, link_info: Dict[str, str], download: Dict, rows: int, records: int) -> int:
+        deferred = super()._finish_import(link_info, download, rows, records)
+        self.checkpoints.record(
+            link_info["url"], "done", sha256=download["digest"], rows_loaded=rows, records_written=records + deferred
+        )
+        return deferred
+
+    def _import_failed(self, link_info: Dict[str, str], error: Exception):
+        super()._import_failed(link_info, error)
+        self.checkpoints.record(link_info["url"], "failed", error=str(error))
+
+    def _remember_download(self, url: str, download: Dict):
+        """Only URLs go in the fetch cache; local files are tracked by their checkpoints."""
+        if is_url(url):
+            super()._remember_download(url, download)
@@ -0,0 +1,47 @@
+"""Persistent HTTP fetch metadata for conditional downloads."""
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+from storage.json_store import JsonStore
+
+logger = logging.getLogger(__name__)
+
+
+class FetchCache:
+    """Remember ETag, Last-Modified, size and SHA-256 per URL.
+
+    Entries are only recorded once a file has been imported successfully,
+    so a failed import is retried on the next run.
+    """
+
+    def __init__(self, path: str):
+        self.store = JsonStore(path)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Request headers that let the server answer 304 Not Modified."""
+        entry = self.store.get(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def is_unchanged(self, url: str, sha256: str) -> bool:
+        """Whether a downloaded body matches the last imported content for this URL."""
+        entry = self.store.get(url) or {}
+        return entry.get("sha256") == sha256
+
+    def record(self, url: str, headers: Dict[str, str], sha256: str, content_length: int, filepath: Optional[str] = None):
+        """Store metadata for a successfully processed download."""
+        self.store.set(
+            url,
+            {
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "content_length": content_length,
+                "sha256": sha256,
+                "filepath": filepath,
+                "checked_at": datetime.now().isoformat(),
+            },
+        )
@@ -0,0 +1,183 @@
+"""Offline re-import of archived OHSS files, swapping their re-normalized rows into the fact tables."""
+import logging
+from collections import Counter
+from typing import Dict, List, Optional
+import pandas as pd
+from database.models import get_session
+from database.range_swap import RangeSwap
+from .ohss_scraper import OHSSScraper
+
+logger = logging.getLogger(__name__)
+
+
+class OHSSReprocess(OHSSScraper):
+    """Re-parse and re-normalize the raw archive, then swap the results into the fact tables.
+
+    Applies a mapping or normalizer fix to history without the network.
+    The newest archived copy of every OHSS URL goes through the regular
+    import pipeline, with ``PARSE_THREADS`` reading files and
+    ``PARSE_WORKERS`` normalizing chunks in parallel. Instead of being
+    upserted, chunks are staged per fact table by a ``RangeSwap``. Once
+    every file is in, each table's staged files replace their stored rows
+    in a single transaction. A file that fails is dropped from staging, so
+    its rows stay as they are, as do rows from files not in the archive.
+    The fetch cache is left alone.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.swaps: Dict[str, RangeSwap] = {}
+
+    def archived_links(self, data_types: Optional[List[str]] = None) -> List[Dict]:
+        """Link dicts for the newest archived copy of each of this source's URLs, oldest month first."""
+        latest = {}
+        for entry in self.archive.entries():
+            if entry.get("source") != self.SOURCE_NAME or not entry.get("url"):
+                continue
+            if data_types and entry.get("type") not in data_types:
+                continue
+            current = latest.get(entry["url"])
+            if current is None or entry["stored_at"] > current["stored_at"]:
+                latest[entry["url"]] = entry
+
+        entries = sorted(latest.values(), key=lambda entry: (entry.get("date") or "", entry["url"]))
+        return [
+            {
+                "url": entry["url"],
+                "text": entry["name"],
+                "type": entry["type"],
+                "date": entry.get("date"),
+                "archived": entry,
+            }
+            for entry in entries
+        ]
+
+    def run(self, data_types: Optional[List[str]] = None, dry_run: bool = False) -> Dict[str, any]:
+        """Reprocess every archived file (of the given types) and swap it in, or only stage it on a dry run."""
+        links = self.archived_links(data_types)
+        logger.info(f"Reprocessing {len(links)} archived {self.SOURCE_NAME} files{' (dry run)' if dry_run else ''}")
+        self.rejections = Counter()
+        self.file_stats = {"skipped": 0, "fetched": 0, "imported": 0, "failed": 0}
+        self.pipeline_stats = {}
+        self.swaps = {}
+
+        try:
+            total_staged = self._import_links(links)
+            swapped = self._staged_months() if dry_run else self._swap_all()
+        finally:
+            self._drop_staging()
+
+        result = {
+            "records_staged": total_staged,
+            "records_rejected": sum(self.rejections.values()),
+            "rejections": dict(self.rejections),
+            "dry_run": dry_run,
+            "tables": swapped,
+        }
+        for key, count in self.file_stats.items():
+            result[f"files_{key}"] = count
+        result["pipeline"] = self.pipeline_stats
+        logger.info(
+            f"{self.SOURCE_NAME} reprocess completed. Records staged: {total_staged}, "
+            f"files: {self.file_stats['imported']} staged, {self.file_stats['failed']} failed"
+        )
+        return result
+
+    def fetch(self, link_info: Dict[str, str]) -> Dict:
+        """Read from the archive; nothing is downloaded."""
+        archived = link_info["archived"]
+        return {
+            "status": "archived",
+            "digest": archived["digest"],
+            "headers": {},
+            "content_length": archived["size"],
+            "filepath": archived["path"],
+        }
+
+    def load(self, data_type: str, frame: pd.DataFrame, rejected: int = 0, unit=None) -> int:
+        """Stage a normalized chunk for its table's swap, creating the staging table on first use.
+
+        Chunks go through sessions of their own rather than the file's
+        ``unit``; ``_import_failed`` discards a failed file's staged rows.
+        """
+        if frame.empty:
+            return 0
+
+        swap = self.swaps.get(data_type)
+        db = get_session()
+        try:
+            if swap is None:
+                swap = RangeSwap(self.MODELS[data_type].__tablename__, data_type, self.SOURCE_NAME)
+                swap.create(db, list(frame.columns))
+            staged = swap.stage(db, frame, frame.attrs["source_file"])
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error staging {data_type}: {e}")
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        self.swaps[data_type] = swap
+        return staged
+
+    def _load(self, link_info: Dict[str, str], download: Dict, frame: pd.DataFrame, rejections: Dict[str, int]) -> int:
+        frame.attrs["source_file"] = link_info["url"]
+        return super()._load(link_info, download, frame, rejections)
+
+    def _import_failed(self, link_info: Dict[str, str], error: Exception):
+        """Drop whatever the failed file already staged."""
+        super()._import_failed(link_info, error)
+        db = get_session()
+        try:
+            for swap in self.swaps.values():
+                swap.discard(db, link_info["url"])
+            db.commit()
+        except Exception as e:
+            logger.error(f"Could not discard staged rows of {link_info['url']}: {e}")
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _swap_all(self) -> Dict[str, Dict]:
+        """Swap each table's staged files in, one transaction per table, then refresh the aggregates."""
+        swapped = {}
+        for swap in self.swaps.values():
+            db = get_session()
+            try:
+                swapped[swap.table] = stats = swap.swap(db)
+                db.commit()
+            except Exception as e:
+                logger.error(f"Error swapping {swap.table}: {e}")
+                db.rollback()
+                raise
+            finally:
+                db.close()
+            months = pd.to_datetime(pd.Series(stats["months"], dtype=object))
+            self.loaded_ranges.add(swap.table, months)
+        self._refresh_aggregates()
+        return swapped
+
+    def _staged_months(self) -> Dict[str, Dict]:
+        """What a swap would replace, for a dry run."""
+        db = get_session()
+        try:
+            return {swap.table: {"months": [f"{m:%Y-%m}" for m in swap.months(db)]} for swap in self.swaps.values()}
+        finally:
+            db.close()
+
+    def _drop_staging(self):
+        db = get_session()
+        try:
+            for swap in self.swaps.values():
+                swap.drop(db)
+            db.commit()
+        except Exception as e:
+            logger.warning(f"Could not drop reprocess staging tables: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def _remember_download(self, url: str, download: Dict):
+        """Reprocessing does not change what has been fetched, so the fetch cache is left as is."""
@@ -0,0 +1,698 @@
+"""Base class for data source plugins: discover -> fetch -> parse -> map -> load."""
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import List, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+import pandas as pd
+from config import config
+from database.models import (
+    Arrest,
+    Detention,
+    Removal,
+    DataSourceHealth,
+    DEDUP_CONFLICT_COLUMNS,
+    get_engine,
+)
+from database.async_writer import AsyncUnitOfWork, get_async_writer
+from database.pool import UnitOfWork
+from database.aggregates import LoadedRanges, refresh_continuous_aggregates
+from database.rollups import RollupMaintainer
+from database.copy_loader import CopyLoader
+from database.upsert import upsert_records
+from processors.columnar_normalizer import ColumnarNormalizer
+from processors.file_parser import FileParser, worker_pool
+from processors.workbook_reader import WorkbookReader
+from processors.layout_cache import LayoutCache
+from storage.raw_archive import RawArchive
+from pipeline import Pipeline, Stage, StageError
+from monitoring import StepTimings
+from monitoring.metrics import (
+    DB_WRITE_SECONDS,
+    DOWNLOAD_BYTES,
+    FETCH_SECONDS,
+    FILES_TOTAL,
+    MAP_SECONDS,
+    PARSE_SECONDS,
+    RECORDS_WRITTEN,
+    REJECTIONS_TOTAL,
+    ROWS_PER_SECOND,
+    ROWS_REJECTED,
+    SCRAPE_SECONDS,
+    STAGE_MAX_QUEUE_DEPTH,
+    STAGE_ROWS_PER_SECOND,
+    STAGE_UTILIZATION,
+)
+from .fetch_cache import FetchCache
+
+logger = logging.getLogger(__name__)
+
+
+class DataSource:
+    """A collector source built from five overridable steps.
+
+    ``discover`` lists the files a source publishes (``{"url", "type", ...}``
+    link dicts); ``fetch`` downloads one into the raw archive, skipping
+    unchanged content; ``parse`` reads it into raw chunks; ``map`` normalizes a chunk
+    onto a fact table; ``load`` upserts it. Only ``discover`` is required.
+    The defaults give every source conditional fetches and the fetch cache,
+    cached CSV/workbook layouts, the staged import pipeline with its
+    metrics, worker-process normalization, COPY upserts, rollups, aggregate
+    refreshes and a health row per run. Every step is timed into the
+    ``monitoring`` metrics and into the per-step breakdown on the health row.
+    """
+
+    SOURCE_NAME = ""
+    MODELS = {"arrests": Arrest, "detentions": Detention, "removals": Removal}
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": config.USER_AGENT})
+        adapter = HTTPAdapter(pool_maxsize=max(config.DOWNLOAD_WORKERS, config.DOWNLOAD_PER_HOST_LIMIT))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
+        self.archive = RawArchive(os.path.join(config.DATA_DIR, "archive"), config.ARCHIVE_COMPRESSION)
+        self.fetch_cache = FetchCache(config.FETCH_CACHE_PATH)
+        self.workbook_reader = WorkbookReader()
+        self.layout_cache = LayoutCache(config.LAYOUT_CACHE_PATH)
+        self.file_parser = FileParser(self.layout_cache, self.workbook_reader)
+        self.rejections = Counter()
+        self.file_stats = {"skipped": 0, "fetched": 0, "imported": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+        self.pipeline_stats = {}
+        self.timings = StepTimings()
+        self.loaded_ranges = LoadedRanges()
+        self._units: Dict[str, UnitOfWork] = {}
+
+    def discover(self) -> List[Dict[str, str]]:
+        """Links to the source's data files, each with at least ``url`` and ``type``."""
+        raise NotImplementedError
+
+    def scrape(self) -> Dict[str, any]:
+        """Discover, import and record a health check for one run of the source."""
+        logger.info(f"Starting {self.SOURCE_NAME} data scraping...")
+        result = {
+            "success": False,
+            "records_fetched": 0,
+            "records_rejected": 0,
+            "rejections": {},
+            "files_skipped": 0,
+            "files_fetched": 0,
+            "files_imported": 0,
+            "files_failed": 0,
+            "stages": {},
+            "pipeline": {},
+            "error": None,
+        }
+        self.rejections = Counter()
+        self.file_stats = {"skipped": 0, "fetched": 0, "imported": 0, "failed": 0}
+        self.pipeline_stats = {}
+        self.timings = StepTimings()
+        started = time.perf_counter()
+
+        try:
+            download_links = self.discover()
+            logger.info(f"Found {len(download_links)} data files")
+
+            total_records = self._import_links(download_links)
+
+            result["success"] = True
+            result["records_fetched"] = total_records
+            result["records_rejected"] = sum(self.rejections.values())
+            result["rejections"] = dict(self.rejections)
+            for key, count in self.file_stats.items():
+                result[f"files_{key}"] = count
+            result["pipeline"] = self.pipeline_stats
+            logger.info(
+                f"{self.SOURCE_NAME} scraping completed. Total records: {total_records}, "
+                f"rejected: {result['records_rejected']}, "
+                f"files fetched: {self.file_stats['fetched']}, skipped: {self.file_stats['skipped']}, "
+                f"imported: {self.file_stats['imported']}"
+            )
+
+        except Exception as e:
+            logger.error(f"{self.SOURCE_NAME} scraping failed: {e}")
+            result["error"] = str(e)
+
+        result["stages"] = self.timings.snapshot()
+        SCRAPE_SECONDS.observe(
+            time.perf_counter() - started,
+            source=self.SOURCE_NAME,
+            status="success" if result["success"] else "failed",
+        )
+
+        # Record health check
+        self._record_health_check(result)
+
+        return result
+
+    def fetch(self, link_info: Dict[str, str]) -> Dict:
+        """Download a data file into the raw archive unless it is unchanged since the last import.
+
+        The body is streamed to disk in ``DOWNLOAD_BLOCK_SIZE`` blocks and
+        never held in memory whole. Safe to call from download worker threads.
+        """
+        url = link_info["url"]
+        logger.info(f"Downloading {link_info['type']} file: {url}")
+
+        # Let the server answer 304 if we already have it
+        headers = self.fetch_cache.conditional_headers(url)
+        with self._host_slot(url), self.session.get(
+            url, headers=headers, timeout=config.REQUEST_TIMEOUT, stream=True
+        ) as response:
+            if response.status_code == 304:
+                return {"status": "not_modified"}
+            response.raise_for_status()
+
+            archived = self.archive.store(
+                response.iter_content(config.DOWNLOAD_BLOCK_SIZE),
+                os.path.basename(urlparse(url).path),
+                source=self.SOURCE_NAME,
+                url=url,
+                type=link_info["type"],
+                date=link_info.get("date"),
+            )
+
+        download = {
+            "status": "fetched",
+            "digest": archived["digest"],
+            "headers": response.headers,
+            "content_length": archived["size"],
+            "filepath": archived["path"],
+        }
+        if self.fetch_cache.is_unchanged(url, download["digest"]):
+            download["status"] = "unchanged"
+        return download
+
+    def parse(self, filepath: str, data_type: str, digest: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """Read a data file as a sequence of DataFrames tagged with their layout's column map."""
+        return self.file_parser.read_chunks(filepath, data_type, digest)
+
+    @classmethod
+    def map(cls, df: pd.DataFrame, link_info: Dict) -> Tuple[pd.DataFrame, Dict[str, int]]:
+        """Normalize a raw chunk onto its fact table, returning the frame and rejection counts.
+
+        A classmethod so it can run in a worker process; see ``map_chunk``.
+        """
+        return ColumnarNormalizer.normalize(
+            df, link_info["type"], link_info, data_source=cls.SOURCE_NAME, column_map=df.attrs.get("column_map")
+        )
+
+    def load(self, data_type: str, frame: pd.DataFrame, rejected: int = 0, unit: Optional[UnitOfWork] = None) -> int:
+        """Upsert a normalized frame on its natural key with COPY or executemany.
+
+        The chunk is committed through ``unit``, the file's shared session
+        and connection, or through a unit of its own when none is given.
+        With ``DB_WRITER=async`` it is only handed to the async writer, and
+        its records and time range are counted when the unit closes.
+        """
+        if frame.empty:
+            logger.info(f"No {data_type} records to import ({rejected} rejected)")
+            return 0
+
+        model = self.MODELS[data_type]
+        owns_unit = unit is None
+        if owns_unit:
+            unit = self._new_unit()
+        records_imported = 0
+
+        try:
+            if isinstance(unit, AsyncUnitOfWork):
+                unit.submit(model.__tablename__, data_type, frame)
+                if owns_unit:
+                    records_imported = self._close_unit(unit)
+                logger.info(f"Queued {len(frame)} {data_type} records for the async writer ({rejected} rejected)")
+                return records_imported
+
+            # The first write checks the connection out, so pool wait is measured apart from the write
+            checked_out = unit.active
+            db = unit.session
+            if not checked_out:
+                self.timings.add("pool_wait", unit.waited)
+
+            # Rollup deltas need the values of rows about to be replaced, so they go first
+            if config.ROLLUPS_ENABLED:
+                RollupMaintainer.apply(db, model.__tablename__, data_type, frame)
+            if config.DB_LOAD_METHOD == "copy":
+                loader = CopyLoader(model.__tablename__, frame.columns)
+                records_imported = loader.upsert(db, frame, DEDUP_CONFLICT_COLUMNS)
+            else:
+                # Row dicts cost several times the columnar frame, so only one batch exists at a time
+                records_imported = sum(
+                    upsert_records(db, model, records, DEDUP_CONFLICT_COLUMNS)
+                    for records in ColumnarNormalizer.record_batches(frame, config.COPY_BATCH_SIZE)
+                )
+            unit.commit()
+            if records_imported:
+                self.loaded_ranges.add(model.__tablename__, frame["timestamp"])
+            logger.info(
+                f"Imported {records_imported} new or changed {data_type} records "
+                f"({len(frame) - records_imported} unchanged, {rejected} rejected)"
+            )
+
+        except Exception as e:
+            logger.error(f"Error importing {data_type}: {e}")
+            unit.rollback()
+            raise
+        finally:
+            if owns_unit:
+                unit.close()
+
+        return records_imported
+
+    def _import_links(self, download_links: List[Dict[str, str]]) -> int:
+        """Import every link through the staged pipeline, or serially as each download completes."""
+        if config.IMPORT_PIPELINE == "staged":
+            return self._import_staged(download_links)
+        if config.PARSE_WORKERS > 1:
+            logger.warning(
+                f"PARSE_WORKERS={config.PARSE_WORKERS} is ignored with IMPORT_PIPELINE={config.IMPORT_PIPELINE}; "
+                f"chunks are normalized in-process"
+            )
+
+        total_records = 0
+        try:
+            for link_info, download in self._download_files(download_links):
+                try:
+                    total_records += self._import_download(link_info, download.result())
+                except Exception as e:
+                    self._import_failed(link_info, e)
+        finally:
+            self._close_units()
+        return total_records
+
+    def _import_failed(self, link_info: Dict[str, str], error: Exception):
+        """Log a file that could not be downloaded or imported; the run carries on."""
+        unit = self._units.pop(link_info["url"], None)
+        if unit:
+            self._discard_unit(unit)
+        logger.error(f"Error processing {link_info['url']}: {error}")
+        self._count("failed")
+
+    def _unit(self, url: str) -> UnitOfWork:
+        """The unit of work shared by a file's chunks, created on its first chunk."""
+        if url not in self._units:
+            self._units[url] = self._new_unit()
+        return self._units[url]
+
+    def _new_unit(self) -> UnitOfWork:
+        """A unit of work for the configured ``DB_WRITER``."""
+        if config.DB_WRITER == "async":
+            return get_async_writer().unit(self.SOURCE_NAME)
+        return UnitOfWork(self.SOURCE_NAME)
+
+    def _close_units(self):
+        """Return the connections of files left unfinished when an import run stops early."""
+        units, self._units = self._units, {}
+        for unit in units.values():
+            self._discard_unit(unit)
+
+    def _close_unit(self, unit: UnitOfWork) -> int:
+        """Close a unit, then queue the ranges it committed for the next aggregate refresh.
+
+        A sync unit's chunks are added as each commits; an async unit's
+        chunks commit in the background, so they are only added once the
+        unit has closed, whether or not every chunk made it.
+        """
+        try:
+            return unit.close()
+        finally:
+            if isinstance(unit, AsyncUnitOfWork):
+                self.loaded_ranges.merge(unit.written)
+
+    def _discard_unit(self, unit: UnitOfWork):
+        """Close the unit of a file that failed or was cut short; its write errors are already reported."""
+        try:
+            self._close_unit(unit)
+        except Exception as e:
+            logger.debug(f"Discarded unit of work failed to close cleanly: {e}")
+
+    def _process_data_file(self, link_info: Dict[str, str]) -> int:
+        """Download and process a data file."""
+        return self._import_download(link_info, self._fetch(link_info))
+
+    def _fetch(self, link_info: Dict[str, str]) -> Dict:
+        """``fetch`` with its time and downloaded bytes recorded."""
+        started = time.perf_counter()
+        download = self.fetch(link_info)
+        elapsed = time.perf_counter() - started
+
+        labels = {"source": self.SOURCE_NAME, "data_type": link_info["type"]}
+        FETCH_SECONDS.observe(elapsed, **labels)
+        self.timings.add("fetch", elapsed)
+        if download["status"] == "fetched":
+            DOWNLOAD_BYTES.observe(download["content_length"], **labels)
+            self.timings.add("bytes_downloaded", download["content_length"])
+        return download
+
+    def _parse(self, link_info: Dict[str, str], download: Dict) -> Iterator[pd.DataFrame]:
+        """``parse`` with the time spent reading the file recorded once it is exhausted."""
+        chunks = iter(self.parse(download["filepath"], link_info["type"], download.get("digest")))
+        elapsed = 0.0
+        while True:
+            started = time.perf_counter()
+            df = next(chunks, None)
+            elapsed += time.perf_counter() - started
+            if df is None:
+                break
+            yield df
+
+        PARSE_SECONDS.observe(elapsed, source=self.SOURCE_NAME, data_type=link_info["type"])
+        self.timings.add("parse", elapsed)
+
+    def _map(self, df: pd.DataFrame, link_info: Dict[str, str], pool=None) -> Tuple[pd.DataFrame, Dict[str, int]]:
+        """``map`` in this thread, or in a worker process when a pool is given, with its time recorded."""
+        started = time.perf_counter()
+        if pool:
+            frame, rejections = pool.submit(map_chunk, type(self), df, link_info).result()
+        else:
+            frame, rejections = self.map(df, link_info)
+        elapsed = time.perf_counter() - started
+
+        MAP_SECONDS.observe(elapsed, source=self.SOURCE_NAME, data_type=link_info["type"])
+        self.timings.add("normalize", elapsed)
+        return frame, rejections
+
+    def _load(self, link_info: Dict[str, str], download: Dict, frame: pd.DataFrame, rejections: Dict[str, int]) -> int:
+        """Count a chunk's rejections, then ``load`` it with the write time recorded."""
+        data_type = link_info["type"]
+        rejected = sum(rejections.values())
+        self.rejections.update(rejections)
+        for reason, count in rejections.items():
+            REJECTIONS_TOTAL.inc(count, source=self.SOURCE_NAME, data_type=data_type, reason=reason)
+        download["rejected"] = download.get("rejected", 0) + rejected
+
+        started = time.perf_counter()
+        records = self.load(data_type, frame, rejected, unit=self._unit(link_info["url"]))
+        elapsed = time.perf_counter() - started
+
+        table = self.MODELS[data_type].__tablename__
+        DB_WRITE_SECONDS.observe(elapsed, source=self.SOURCE_NAME, table=table)
+        RECORDS_WRITTEN.inc(records, source=self.SOURCE_NAME, table=table)
+        self.timings.add("load", elapsed)
+        return records
+
+    def _download_files(self, download_links: List[Dict[str, str]]) -> Iterator[Tuple[Dict, Future]]:
+        """Download files on a bounded thread pool, yielding them in completion order.
+
+        At most ``DOWNLOAD_WORKERS`` downloads are queued ahead of the
+        consumer, so finished files do not pile up while it parses and imports.
+        """
+        links = iter(download_links)
+        pending = {}
+        max_pending = max(1, config.DOWNLOAD_WORKERS)
+
+        with ThreadPoolExecutor(
+            max_workers=max_pending, thread_name_prefix=f"{self.SOURCE_NAME.lower()}-download"
+        ) as pool:
+            while True:
+                while len(pending) < max_pending:
+                    link_info = next(links, None)
+                    if link_info is None:
+                        break
+                    pending[pool.submit(self._fetch, link_info)] = link_info
+
+                if not pending:
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Semaphore limiting concurrent connections to a single host."""
+        host = urlparse(url).netloc
+        with self._host_slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(config.DOWNLOAD_PER_HOST_LIMIT)
+            return self._host_slots[host]
+
+    def _import_download(self, link_info: Dict[str, str], download: Dict) -> int:
+        """Parse and import a downloaded file."""
+        if not self._needs_import(link_info, download):
+            return 0
+
+        data_type = link_info["type"]
+        logger.info(f"Processing {data_type} file: {link_info['url']}")
+
+        # Normalize and load chunk by chunk so memory stays flat for large files
+        records = 0
+        rows = 0
+        for df in self._parse(link_info, download):
+            rows += len(df)
+            frame, rejections = self._map(df, link_info)
+            records += self._load(link_info, download, frame, rejections)
+
+        records += self._finish_import(link_info, download, rows, records)
+        return records
+
+    def _needs_import(self, link_info: Dict[str, str], download: Dict) -> bool:
+        """Count a finished download and decide whether it has anything new to import."""
+        url = link_info["url"]
+
+        if download["status"] == "not_modified":
+            logger.info(f"Not modified since last import, skipping: {url}")
+            self._count("skipped")
+            return False
+
+        self._count("fetched")
+        if download["status"] == "unchanged":
+            logger.info(f"Content unchanged since last import, skipping: {url}")
+            self._remember_download(url, download)
+            self._count("skipped")
+            return False
+
+        if link_info["type"] not in self.MODELS:
+            logger.warning(f"Unknown data type: {link_info['type']}")
+            return False
+
+        download["started_at"] = time.perf_counter()
+        return True
+
+    def _count(self, key: str):
+        """Increment a file counter; downloads are counted from fetch threads."""
+        with self._stats_lock:
+            self.file_stats[key] += 1
+        FILES_TOTAL.inc(source=self.SOURCE_NAME, outcome=key)
+
+    def _finish_import(self, link_info: Dict[str, str], download: Dict, rows: int, records: int) -> int:
+        """Record a fully loaded file so unchanged content is skipped next time.
+
+        Returns the records only counted once the file's unit closes, as the async writer reports them.
+        """
+        unit = self._units.pop(link_info["url"], None)
+        deferred = self._close_unit(unit) if unit else 0
+        if deferred:
+            RECORDS_WRITTEN.inc(deferred, source=self.SOURCE_NAME, table=self.MODELS[link_info["type"]].__tablename__)
+            records += deferred
+        logger.info(
+            f"Loaded {rows} rows ({records} new or changed records) from {os.path.basename(link_info['url'])}"
+        )
+
+        labels = {"source": self.SOURCE_NAME, "data_type": link_info["type"]}
+        elapsed = time.perf_counter() - download.get("started_at", time.perf_counter())
+        if elapsed > 0:
+            ROWS_PER_SECOND.observe(rows / elapsed, **labels)
+        ROWS_REJECTED.observe(download.get("rejected", 0), **labels)
+
+        # Only remember the content once it is safely in the database
+        self._remember_download(link_info["url"], download)
+        self._count("imported")
+        self._refresh_aggregates()
+        return deferred
+
+    def _refresh_aggregates(self):
+        """Re-materialize continuous aggregates over the time ranges written since the last refresh.
+
+        A failed refresh is logged and left to the aggregates' refresh policies.
+        """
+        ranges = self.loaded_ranges.pop_all()
+        if not config.CONTINUOUS_AGGREGATES_ENABLED:
+            return
+
+        for table, (start, end) in ranges.items():
+            try:
+                refresh_continuous_aggregates(get_engine(), table, start, end)
+            except Exception as e:
+                logger.warning(f"Could not refresh continuous aggregates for {table}: {e}")
+
+    def _import_staged(self, download_links: List[Dict[str, str]]) -> int:
+        """Import through a fetch -> parse -> normalize -> load pipeline.
+
+        Each stage runs on its own threads with a bounded queue in front of
+        it, so downloads, file reads, normalization and database writes all
+        overlap and the slowest stage throttles the rest instead of letting
+        chunks pile up in memory. ``DOWNLOAD_WORKERS`` threads fetch,
+        ``PARSE_THREADS`` read files into raw chunks, ``PARSE_WORKERS``
+        normalize them (in worker processes when more than one), and a single
+        writer loads each file's chunks in order. Per-stage metrics end up in
+        ``self.pipeline_stats``.
+        """
+        pool = worker_pool(config.PARSE_WORKERS) if config.PARSE_WORKERS > 1 else None
+        pipeline = Pipeline(
+            [
+                Stage("fetch", self._fetch_stage, workers=config.DOWNLOAD_WORKERS),
+                Stage("parse", self._parse_stage, workers=config.PARSE_THREADS, rows=self._chunk_rows),
+                Stage(
+                    "normalize",
+                    lambda item: self._normalize_stage(item, pool),
+                    workers=config.PARSE_WORKERS,
+                    rows=self._chunk_rows,
+                ),
+                Stage("load", self._load_stage(), rows=self._chunk_rows, handles_errors=True),
+            ],
+            queue_size=config.PIPELINE_QUEUE_SIZE,
+        )
+
+        total_records = 0
+        try:
+            for written in pipeline.run(download_links):
+                total_records += written["records"]
+        finally:
+            self._close_units()
+            if pool:
+                pool.shutdown()
+            pipeline.log_summary()
+            self.pipeline_stats = pipeline.snapshot()
+            for stage, stats in self.pipeline_stats.items():
+                labels = {"source": self.SOURCE_NAME, "stage": stage}
+                STAGE_UTILIZATION.set(stats["utilization"], **labels)
+                STAGE_ROWS_PER_SECOND.set(stats["rows_per_second"], **labels)
+                STAGE_MAX_QUEUE_DEPTH.set(stats["max_queue_depth"], **labels)
+        return total_records
+
+    @staticmethod
+    def _chunk_rows(item: Dict) -> int:
+        return len(item["frame"]) if "frame" in item else 0
+
+    def _fetch_stage(self, link_info: Dict[str, str]) -> Iterator[Dict]:
+        """Download one file and pass it on if it has anything new to import."""
+        download = self._fetch(link_info)
+        if self._needs_import(link_info, download):
+            yield {"link": link_info, "download": download}
+
+    def _parse_stage(self, task: Dict) -> Iterator[Dict]:
+        """Read a downloaded file into raw chunks, then a marker with the file's chunk and row counts."""
+        link_info, download = task["link"], task["download"]
+        logger.info(f"Processing {link_info['type']} file: {link_info['url']}")
+
+        index = rows = 0
+        for df in self._parse(link_info, download):
+            yield {**task, "index": index, "frame": df}
+            index += 1
+            rows += len(df)
+        yield {**task, "end": True, "chunks": index, "rows": rows}
+
+    def _normalize_stage(self, item: Dict, pool=None) -> Iterator[Dict]:
+        """Map a raw chunk onto its fact table, in a worker process when a pool is given."""
+        if "end" in item:
+            yield item
+            return
+
+        frame, rejections = self._map(item["frame"], item["link"], pool)
+        yield {**item, "frame": frame, "rejections": rejections}
+
+    def _load_stage(self):
+        """Build the single-writer load step, which keeps per-file state between items.
+
+        Chunks can arrive out of order when several normalize workers run, so
+        each file's chunks are buffered and written in their original order.
+        The file is finished once its end marker and all of its chunks are
+        in. A failure anywhere upstream or in the write fails the whole file
+        and drops the rest of its chunks.
+        """
+        files: Dict[str, Dict] = {}
+
+        def load(item) -> Iterator[Dict]:
+            if isinstance(item, StageError):
+                task = item.item
+                link_info = task.get("link", task)
+                state = files.setdefault(link_info["url"], {"failed": False})
+                if not state["failed"]:
+                    state["failed"] = True
+                    self._import_failed(link_info, item.error)
+                return
+
+            link_info, download = item["link"], item["download"]
+            state = files.setdefault(
+                link_info["url"], {"failed": False, "next": 0, "pending": {}, "records": 0, "chunks": None}
+            )
+            if state["failed"]:
+                return
+
+            if "end" in item:
+                state["chunks"], state["rows"] = item["chunks"], item["rows"]
+            else:
+                state["pending"][item["index"]] = item
+
+            while state["next"] in state["pending"]:
+                chunk = state["pending"].pop(state["next"])
+                state["next"] += 1
+                try:
+                    records = self._load(link_info, download, chunk["frame"], chunk["rejections"])
+                except Exception as e:
+                    state["failed"] = True
+                    state["pending"].clear()
+                    self._import_failed(link_info, e)
+                    return
+                state["records"] += records
+                yield {"frame": chunk["frame"], "records": records}
+
+            if state["chunks"] is not None and state["next"] == state["chunks"]:
+                del files[link_info["url"]]
+                try:
+                    deferred = self._finish_import(link_info, download, state["rows"], state["records"])
+                except Exception as e:
+                    self._import_failed(link_info, e)
+                    return
+                if deferred:
+                    yield {"records": deferred}
+
+        return load
+
+    def _remember_download(self, url: str, download: Dict):
+        """Record fetch metadata for a processed download."""
+        self.fetch_cache.record(
+            url, download["headers"], download["digest"], download["content_length"], download["filepath"]
+        )
+
+    def _record_health_check(self, result: Dict):
+        """Record health check result."""
+        unit = UnitOfWork(self.SOURCE_NAME)
+        try:
+            db = unit.session
+            health = DataSourceHealth(
+                source_name=self.SOURCE_NAME,
+                last_attempt=datetime.now(),
+                last_successful_fetch=datetime.now() if result["success"] else None,
+                status="success" if result["success"] else "failed",
+                error_message=result.get("error"),
+                records_fetched=result.get("records_fetched", 0),
+                stage_breakdown={"steps": result.get("stages", {}), "pipeline": result.get("pipeline", {})},
+            )
+            db.add(health)
+            unit.commit()
+        except Exception as e:
+            logger.error(f"Error recording health check: {e}")
+            unit.rollback()
+        finally:
+            unit.close()
+
+
+def map_chunk(source_cls, df: pd.DataFrame, link_info: Dict) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """Worker-process entry point for ``DataSource.map``.
+
+    Returns the compacted frame and its rejection counts, ready for the
+    parent's single database writer.
+    """
+    frame, rejections = source_cls.map(df, link_info)
+    logger.debug(f"Worker {os.getpid()} mapped {len(df)} {link_info['type']} rows for {source_cls.SOURCE_NAME}")
+    return FileParser.compact(frame), rejections
@@ -0,0 +1,5 @@
+"""Storage package for local collector state and downloaded files."""
+from .json_store import JsonStore
+from .raw_archive import RawArchive, data_extension, open_raw
+
+__all__ = ["JsonStore", "RawArchive", "data_extension", "open_raw"]
@@ -0,0 +1,62 @@
+"""Small persistent JSON key/value store for collector state."""
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JsonStore:
+    """Thread-safe dict persisted to a JSON file.
+
+    Every write replaces the file atomically, so a crash mid-run never
+    leaves a truncated store behind.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = self._read()
+
+    def _read(self) -> Dict[str, Any]:
+        """Load the store from disk, starting empty if it is missing or unreadable."""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable state file {self.path}: {e}")
+            return {}
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        """Return the stored value for a key."""
+        with self._lock:
+            return self._data.get(key, default)
+
+    def set(self, key: str, value: Any):
+        """Store a value and persist the whole store."""
+        with self._lock:
+            self._data[key] = value
+            self._write()
+
+    def items(self):
+        """Snapshot of all stored entries."""
+        with self._lock:
+            return list(self._data.items())
+
+    def _write(self):
+        """Atomically replace the file on disk with the current contents."""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, indent=2, sort_keys=True, default=str)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
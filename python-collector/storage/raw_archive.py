@@ -0,0 +1,124 @@
+"""Content-addressed archive of downloaded raw files, optionally compressed."""
+import hashlib
+import logging
+import os
+import tempfile
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import pyarrow as pa
+from .json_store import JsonStore
+
+logger = logging.getLogger(__name__)
+
+# File suffix per ARCHIVE_COMPRESSION codec; pyarrow writes standard gzip and zstd frames
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+# Only text files are compressed; workbooks are zip containers already (or, for .xls, read by seeking)
+COMPRESSIBLE_EXTENSIONS = (".csv",)
+
+
+def data_extension(path: str) -> str:
+    """A file's data format extension (``.csv``, ``.xlsx``...), ignoring any compression suffix."""
+    root, ext = os.path.splitext(path.lower())
+    if ext in COMPRESSION_SUFFIXES.values():
+        ext = os.path.splitext(root)[1]
+    return ext
+
+
+def is_compressed(path: str) -> bool:
+    """Whether an archived file carries a compression suffix."""
+    return os.path.splitext(path.lower())[1] in {suffix for suffix in COMPRESSION_SUFFIXES.values() if suffix}
+
+
+def open_raw(path: str) -> pa.NativeFile:
+    """Open an archived file for reading without loading it into memory.
+
+    Uncompressed files are memory-mapped, so readers page them in straight
+    from the OS cache; compressed files are decompressed as a stream.
+    """
+    if is_compressed(path):
+        return pa.input_stream(path, compression="detect")
+    return pa.memory_map(path, "r")
+
+
+class RawArchive:
+    """Downloaded files stored once per content under ``<root>/<sha[:2]>/<sha><ext>``.
+
+    Bodies are streamed to disk block by block, hashed on the way, and
+    moved into place atomically, so the same file published under several
+    names (or re-downloaded) is kept once and different files that share a
+    name never overwrite each other. ``index.json`` maps each digest to
+    where it came from, so any historical file can be re-read without the
+    network.
+    """
+
+    def __init__(self, root: str, compression: str = "none"):
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unknown archive compression: {compression}")
+        self.root = root
+        self.compression = compression
+        os.makedirs(root, exist_ok=True)
+        self.index = JsonStore(os.path.join(root, "index.json"))
+
+    def path_for(self, digest: str, ext: str, compression: str = "none") -> str:
+        """Where content with this digest is (or would be) archived."""
+        return os.path.join(self.root, digest[:2], f"{digest}{ext}{COMPRESSION_SUFFIXES[compression]}")
+
+    def store(self, blocks: Iterable[bytes], name: str, **info) -> Dict:
+        """Stream a file's blocks into the archive and return its index entry plus ``digest``.
+
+        ``name`` is the original file name, which sets the stored extension;
+        ``info`` (URL, data type, date...) is kept in the index.
+        """
+        ext = data_extension(name)
+        compression = self.compression if ext in COMPRESSIBLE_EXTENSIONS else "none"
+        digest, size, tmp_path = self._write_temp(blocks, compression)
+
+        path = self.path_for(digest, ext, compression)
+        if os.path.exists(path):
+            os.unlink(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+
+        entry = {
+            "path": path,
+            "name": name,
+            "size": size,
+            "compression": compression,
+            "stored_at": datetime.now().isoformat(),
+            **info,
+        }
+        self.index.set(digest, entry)
+        return {"digest": digest, **entry}
+
+    def _write_temp(self, blocks: Iterable[bytes], compression: str) -> Tuple[str, int, str]:
+        """Write blocks to a temporary file in the archive, returning their SHA-256, size and the file."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+        os.close(fd)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            codec = None if compression == "none" else compression
+            with pa.output_stream(tmp_path, compression=codec) as out:
+                for block in blocks:
+                    digest.update(block)
+                    size += len(block)
+                    out.write(block)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        return digest.hexdigest(), size, tmp_path
+
+    def get(self, digest: str) -> Optional[Dict]:
+        """Index entry for archived content, or None if it is unknown or its file is gone."""
+        entry = self.index.get(digest)
+        if entry and os.path.exists(entry["path"]):
+            return {"digest": digest, **entry}
+        return None
+
+    def entries(self) -> List[Dict]:
+        """Every archived file still on disk."""
+        return [
+            {"digest": digest, **entry} for digest, entry in self.index.items() if os.path.exists(entry["path"])
+        ]